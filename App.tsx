@@ -22,6 +22,15 @@ import ReplayBoard from './components/ReplayBoard';
 import ChatBox from './components/ChatBox';
 import Login from './components/Login';
 
+// Apply a delta game_update's [r, c, player] cells to a copy of the board
+const applyCells = (board: CellValue[][], cells: [number, number, CellValue][]): CellValue[][] => {
+  const next = board.map(row => row.slice());
+  for (const [r, c, player] of cells) {
+    next[r][c] = player;
+  }
+  return next;
+};
+
 const BACKEND_URL = import.meta.env.VITE_BACKEND_URL || 'http://localhost:5000';
 const SOCKET_URL = BACKEND_URL;
 
@@ -34,6 +43,9 @@ export default function App() {
 
   // Socket
   const socketRef = useRef<Socket | null>(null);
+  // Delta game_update protocol: room and sequence number of the last applied update
+  const roomIdRef = useRef<string>('');
+  const seqRef = useRef<number>(0);
 
   // Match & Game State
   const [match, setMatch] = useState<MatchConfig | null>(null);
@@ -87,6 +99,8 @@ export default function App() {
       const playerNum = data.playerNumber || 1;
 
       setPlayerNumber(playerNum);
+      roomIdRef.current = data.roomId;
+      seqRef.current = data.seq || 0;
       setMatch({
         id: data.roomId,
         type: gameType,
@@ -111,9 +125,21 @@ export default function App() {
     });
 
     socket.on('game_update', (data: any) => {
+      if (data.board === undefined) {
+        // Delta update: only the changed cells; a gap means one was missed
+        if (data.seq !== seqRef.current + 1) {
+          socket.emit('request_sync', { roomId: roomIdRef.current });
+          return;
+        }
+      }
+      if (data.seq !== undefined) {
+        seqRef.current = data.seq;
+      }
       setGameState(prev => ({
         ...prev,
-        board: data.board,
+        board: data.board !== undefined
+          ? data.board
+          : applyCells(prev.board, data.cells as [number, number, CellValue][]),
         currentPlayer: data.currentPlayer,
         winner: data.winner,
         winningLine: data.winningLine,
@@ -294,7 +320,8 @@ export default function App() {
       userId: user?.id,
       type,
       mode,
-      difficulty
+      difficulty,
+      protocol: 'delta'
     });
   };
 
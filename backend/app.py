@@ -11,6 +11,8 @@ import config
 from routes.auth import auth_bp
 from routes.user import user_bp
 from routes.leaderboard import leaderboard_bp
+from routes.ai import ai_bp
+from routes.status import status_bp
 from sockets.matchmaking import register_matchmaking_handlers
 from sockets.game import register_game_handlers
 
@@ -29,6 +31,8 @@ def create_app():
     app.register_blueprint(auth_bp)
     app.register_blueprint(user_bp)
     app.register_blueprint(leaderboard_bp)
+    app.register_blueprint(ai_bp)
+    app.register_blueprint(status_bp)
     
     # Register socket handlers
     register_matchmaking_handlers(socketio)
@@ -0,0 +1,178 @@
+"""
+AI benchmark over a fixed corpus of positions.
+Times AIPlayer.get_ai_move_with_stats on every position of
+benchmarks/positions.json (opening, midgame, crowded endgame and forced
+threat cases for Caro and Tic-Tac-Toe) for each difficulty, and reports
+latency percentiles and search nodes per second per game type and
+difficulty. The report is compared with a saved baseline; the script exits
+with status 1 when latency or node throughput regressed beyond the
+tolerance.
+
+Baselines depend on the machine: record one with --update-baseline on the
+machine that runs the comparison.
+
+Usage: python benchmark_ai.py [--repeats N] [--difficulty hard ...]
+                              [--game caro|tic-tac-toe] [--tolerance 0.25]
+                              [--baseline PATH] [--update-baseline]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+from config import GAME_CONFIG
+from game.ai import AIPlayer
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks')
+DEFAULT_POSITIONS = os.path.join(BENCHMARK_DIR, 'positions.json')
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+DIFFICULTIES = ('easy', 'medium', 'hard')
+
+# Latencies below this many milliseconds are treated as equal (timer noise)
+LATENCY_SLACK_MS = 2.0
+
+
+def load_positions(path=DEFAULT_POSITIONS):
+    """
+    Read the position corpus.
+
+    Returns:
+        List of dicts with 'name', 'game_type', 'category' and 'board'
+        (2D list; the file stores one digit string per row)
+    """
+    with open(path, encoding='utf-8') as f:
+        positions = json.load(f)
+    for position in positions:
+        position['board'] = [[int(cell) for cell in row] for row in position['board']]
+    return positions
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil
+    return ordered[int(rank) - 1]
+
+
+def run_benchmark(positions, difficulties=DIFFICULTIES, repeats=3, seed=0):
+    """
+    Time every position at every difficulty.
+
+    Each call starts without a game context, so no search results carry
+    over between positions or repeats.
+
+    Args:
+        positions: From load_positions
+        difficulties: Difficulties to time
+        repeats: Calls per position and difficulty
+        seed: Seed for the random choices of easy/medium
+
+    Returns:
+        Dict {game_type: {difficulty: metrics}}: moves, p50_ms, p95_ms,
+        p99_ms, mean_ms, nodes and nodes_per_second
+    """
+    random.seed(seed)
+    samples = {}
+    for position in positions:
+        game_type = position['game_type']
+        for difficulty in difficulties:
+            entry = samples.setdefault(game_type, {}).setdefault(difficulty, {'ms': [], 'nodes': 0})
+            for _ in range(repeats):
+                board = [row[:] for row in position['board']]
+                _, stats = AIPlayer.get_ai_move_with_stats(board, game_type, difficulty)
+                entry['ms'].append(stats.elapsed_ms)
+                entry['nodes'] += stats.nodes + stats.threat_nodes
+
+    report = {}
+    for game_type, by_difficulty in samples.items():
+        for difficulty, entry in by_difficulty.items():
+            ms = entry['ms']
+            total_ms = sum(ms)
+            report.setdefault(game_type, {})[difficulty] = {
+                'moves': len(ms),
+                'p50_ms': round(percentile(ms, 50), 3),
+                'p95_ms': round(percentile(ms, 95), 3),
+                'p99_ms': round(percentile(ms, 99), 3),
+                'mean_ms': round(total_ms / len(ms), 3),
+                'nodes': entry['nodes'],
+                'nodes_per_second': round(entry['nodes'] * 1000.0 / total_ms, 1) if total_ms else 0.0,
+            }
+    return report
+
+
+def compare(report, baseline, tolerance=0.25):
+    """
+    Find regressions against a baseline report.
+
+    A game type and difficulty regressed when its p95 latency grew, or its
+    nodes per second fell, by more than `tolerance` (a fraction). Entries
+    missing from either report are skipped.
+
+    Returns:
+        List of human-readable regression descriptions (empty if none)
+    """
+    regressions = []
+    for game_type, by_difficulty in report.items():
+        for difficulty, metrics in by_difficulty.items():
+            base = baseline.get(game_type, {}).get(difficulty)
+            if base is None:
+                continue
+            label = f'{game_type}/{difficulty}'
+            limit = base['p95_ms'] * (1 + tolerance) + LATENCY_SLACK_MS
+            if metrics['p95_ms'] > limit:
+                regressions.append(
+                    f"{label}: p95 {metrics['p95_ms']:.1f}ms > {base['p95_ms']:.1f}ms baseline"
+                )
+            if base['nodes_per_second'] and metrics['nodes_per_second'] < base['nodes_per_second'] * (1 - tolerance):
+                regressions.append(
+                    f"{label}: {metrics['nodes_per_second']:.0f} nodes/s < "
+                    f"{base['nodes_per_second']:.0f} nodes/s baseline"
+                )
+    return regressions
+
+
+def print_report(report):
+    print(f"{'game/difficulty':<24}{'moves':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'nodes/s':>12}")
+    for game_type, by_difficulty in report.items():
+        for difficulty, m in by_difficulty.items():
+            print(f"{game_type + '/' + difficulty:<24}{m['moves']:>6}{m['p50_ms']:>10.1f}"
+                  f"{m['p95_ms']:>10.1f}{m['p99_ms']:>10.1f}{m['nodes_per_second']:>12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark AI move latency on a fixed position corpus.')
+    parser.add_argument('--positions', default=DEFAULT_POSITIONS)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--difficulty', action='append', choices=DIFFICULTIES,
+                        help='Difficulty to time (repeatable; default: all)')
+    parser.add_argument('--game', choices=list(GAME_CONFIG),
+                        help='Only positions of this game type')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown as a fraction of the baseline')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Save this run as the new baseline instead of comparing')
+    args = parser.parse_args()
+
+    positions = load_positions(args.positions)
+    if args.game:
+        positions = [p for p in positions if p['game_type'] == args.game]
+    report = run_benchmark(positions, args.difficulty or DIFFICULTIES, args.repeats)
+    print_report(report)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print("Regressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("No regressions against the baseline")
+    else:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to record one")
@@ -0,0 +1,92 @@
+"""
+Build script for the Caro opening book.
+Plays the hard AI against itself from varied first moves and stores the
+hard AI's reply (as player 2) to every early position it meets. Run offline;
+the server only reads the resulting file.
+
+Usage: python build_opening_book.py [--games N] [--max-stones N]
+                                    [--budget-ms MS] [--seed N] [--output PATH]
+"""
+import argparse
+import random
+import time
+
+from config import AI_CONFIG, GAME_CONFIG
+from game.ai import AIPlayer
+from game.ai_batch import swap_colors
+from game.engine import GameEngine
+from game.opening_book import OpeningBook
+from game.search_context import SearchContext
+from game.symmetry import canonical_stones
+
+
+def build_opening_book(games, max_stones, budget_ms, seed):
+    """
+    Collect hard replies to early positions by self-play.
+
+    Games cycle through every distinct (up to symmetry) first move within
+    three cells of the centre. Player 1 then alternates between a random
+    neighbouring cell and the hard AI's move, so the book covers more than
+    one line; player 2 always plays the hard AI's move.
+
+    Returns:
+        OpeningBook
+    """
+    rows, cols = GAME_CONFIG['caro']['rows'], GAME_CONFIG['caro']['cols']
+    rng = random.Random(seed)
+    random.seed(seed)
+    AI_CONFIG['search']['hard']['time_budget_ms'] = budget_ms
+    AI_CONFIG['opening_book']['enabled'] = False  # search every position afresh
+    book = OpeningBook(rows, cols, max_stones)
+
+    openings = {}
+    for r in range(rows // 2 - 3, rows // 2 + 4):
+        for c in range(cols // 2 - 3, cols // 2 + 4):
+            openings.setdefault(canonical_stones([(r * cols + c, 1)], rows, cols)[0], (r, c))
+    openings = sorted(openings.values())
+
+    for game in range(games):
+        board = GameEngine.create_board('caro')
+        contexts = {1: SearchContext(), 2: SearchContext()}
+        r, c = openings[game % len(openings)]
+        board[r][c] = 1
+        stones = 1
+        while stones <= max_stones:
+            player = 2 if stones % 2 else 1
+            if player == 2:
+                move = book.lookup(board) or AIPlayer.get_ai_move(board, 'caro', 'hard', contexts[2])
+                book.add(board, move)
+            elif rng.random() < 0.5:
+                near = [
+                    (nr, nc)
+                    for nr in range(max(0, r - 1), min(rows, r + 2))
+                    for nc in range(max(0, c - 1), min(cols, c + 2))
+                    if board[nr][nc] == 0
+                ]
+                move = rng.choice(near)
+            else:
+                move = AIPlayer.get_ai_move(swap_colors(board), 'caro', 'hard', contexts[1])
+            r, c = move
+            board[r][c] = player
+            stones += 1
+            if GameEngine.check_winner(board, 'caro', {'r': r, 'c': c})[0]:
+                break
+        print(f"  game {game + 1}/{games}: {len(book)} positions")
+    return book
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Build the Caro opening book by self-play.')
+    parser.add_argument('--games', type=int, default=48)
+    parser.add_argument('--max-stones', type=int, default=5,
+                        help='Largest position (in stones) stored in the book')
+    parser.add_argument('--budget-ms', type=int, default=2000,
+                        help='Hard search time per move (offline, so larger than live play)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default=AI_CONFIG['opening_book']['path'])
+    args = parser.parse_args()
+
+    started = time.time()
+    book = build_opening_book(args.games, args.max_stones, args.budget_ms, args.seed)
+    book.save(args.output)
+    print(f"Wrote {len(book)} positions to {args.output} in {time.time() - started:.0f}s")
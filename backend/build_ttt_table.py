@@ -0,0 +1,24 @@
+"""
+Build script for the Tic-Tac-Toe perfect-play table.
+Run at build/deploy time; the server loads the result with a single read.
+
+Usage: python build_ttt_table.py [output path]
+"""
+import sys
+import time
+
+from config import AI_CONFIG
+from game.ttt_table import solve_ttt, POSITIONS
+
+
+def build_ttt_table(path):
+    """Solve every position and write the move table to `path`."""
+    started = time.time()
+    table = solve_ttt()
+    with open(path, 'wb') as f:
+        f.write(table)
+    print(f"Wrote {POSITIONS} positions to {path} in {time.time() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    build_ttt_table(sys.argv[1] if len(sys.argv) > 1 else AI_CONFIG['ttt_table_path'])
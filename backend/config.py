@@ -23,26 +23,124 @@ DB_CONFIG = {
     'database': os.environ.get('DB_NAME', 'tic_tac_toe_db')
 }
 
-# Game Configuration
+# Database connection pool: at most `size` open connections; a checkout
+# waits up to `checkout_timeout` seconds for a free one, and connections
+# idle for more than `idle_timeout` seconds are closed instead of reused
+DB_POOL_CONFIG = {
+    'size': int(os.environ.get('DB_POOL_SIZE', 10)),
+    'idle_timeout': float(os.environ.get('DB_POOL_IDLE_TIMEOUT', 300)),
+    'checkout_timeout': float(os.environ.get('DB_POOL_CHECKOUT_TIMEOUT', 5))
+}
+
+# Game Configuration: one entry per game type (variant). 'family' names the
+# AI that plays it; 'blocked_ends' applies the Caro blocked-five rule
 GAME_CONFIG = {
     'tic-tac-toe': {
         'rows': 3,
         'cols': 3,
-        'win_length': 3
+        'win_length': 3,
+        'family': 'tic-tac-toe'
     },
     'caro': {
         'rows': 15,
         'cols': 20,
-        'win_length': 5
+        'win_length': 5,
+        'family': 'caro'
+    },
+    # Caro where a five blocked by the opponent at both ends does not win
+    'caro-blocked': {
+        'rows': 15,
+        'cols': 20,
+        'win_length': 5,
+        'blocked_ends': True,
+        'family': 'caro'
+    },
+    'gomoku': {
+        'rows': 19,
+        'cols': 19,
+        'win_length': 5,
+        'family': 'caro'
+    }
+}
+
+# AI Configuration
+AI_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'game', 'data')
+AI_CONFIG = {
+    # Transposition table slots kept per practice game (rounded up to a power of two)
+    'transposition_table_size': int(os.environ.get('AI_TT_SIZE', 1 << 15)),
+    # Table size for one-off searches made without a game context
+    'scratch_table_size': 1 << 12,
+    # Caro iterative deepening: deepest iteration and wall-clock budget per move
+    'search': {
+        'medium': {
+            'max_depth': 1,
+            'time_budget_ms': int(os.environ.get('AI_MEDIUM_BUDGET_MS', 150))
+        },
+        'hard': {
+            'max_depth': 8,
+            'time_budget_ms': int(os.environ.get('AI_HARD_BUDGET_MS', 600))
+        }
+    },
+    # Pattern evaluation backend: 'python' (incremental, default) or 'numpy'
+    # (vectorized batch scoring, needs NumPy installed)
+    'evaluator': os.environ.get('AI_EVALUATOR', 'python'),
+    # Threat-space (VCF/VCT) search run by hard before minimax; its time comes
+    # out of the hard move budget
+    'threat_search': {
+        'node_limit': int(os.environ.get('AI_THREAT_NODES', 20000)),
+        'time_budget_ms': int(os.environ.get('AI_THREAT_BUDGET_MS', 200)),
+        'vcf_depth': 10,
+        'vct_depth': 4,
+        'memo_size': 1 << 16
+    },
+    # Search statistics: moves slower than this keep their board for inspection
+    'stats': {
+        'slow_move_ms': int(os.environ.get('AI_SLOW_MOVE_MS', 1000)),
+        'keep_slow_moves': 20
+    },
+    # Hard Caro replies to early positions (built by build_opening_book.py)
+    'opening_book': {
+        'enabled': os.environ.get('AI_OPENING_BOOK', 'true').lower() == 'true',
+        'path': os.environ.get('AI_OPENING_BOOK_PATH', os.path.join(AI_DATA_DIR, 'caro_opening_book.json'))
+    },
+    # Tic-Tac-Toe perfect-play table (built by build_ttt_table.py)
+    'ttt_table_path': os.environ.get('AI_TTT_TABLE_PATH', os.path.join(AI_DATA_DIR, 'ttt_table.bin')),
+    # Entries kept by the Tic-Tac-Toe minimax cache (used without the table)
+    'ttt_cache_size': int(os.environ.get('AI_TTT_CACHE_SIZE', 4096)),
+    # Practice Caro (medium/hard): search the bot's answers to the human's
+    # likely replies during the human's turn; only while at most
+    # `max_pending` other AI jobs are waiting
+    'ponder': {
+        'enabled': os.environ.get('AI_PONDER', 'true').lower() == 'true',
+        'replies': int(os.environ.get('AI_PONDER_REPLIES', 3)),
+        'max_pending': 1
+    },
+    # Where bot moves are computed: 'process' (worker pool), 'thread' (tpool) or 'inline'
+    'executor': {
+        'backend': os.environ.get('AI_EXECUTOR', 'process'),
+        'workers': int(os.environ.get('AI_WORKERS', 2)),
+        'max_pending': int(os.environ.get('AI_MAX_PENDING', 64))
     }
 }
 
+# Socket protocol: clients joining with protocol 'delta' get game_update
+# payloads holding only the changed cells, plus a full board every
+# `snapshot_interval` updates (and on 'request_sync')
+SOCKET_CONFIG = {
+    'snapshot_interval': int(os.environ.get('GAME_SNAPSHOT_INTERVAL', 50))
+}
+
 # Ranking Configuration
 RANKING_CONFIG = {
     'level_up_score': 100,
     'max_level': 500,
     'win_points': 25,
-    'loss_points': -10
+    'loss_points': -10,
+    # Seconds before the in-memory game_levels/tiers copies are reloaded
+    'reference_ttl': float(os.environ.get('LEVEL_TABLES_TTL', 600)),
+    # Seconds before the in-process leaderboard index is rebuilt from the
+    # users table (other server processes' updates show up then)
+    'index_ttl': float(os.environ.get('RANKING_INDEX_TTL', 300))
 }
 
 # Game Directions (for winner checking)
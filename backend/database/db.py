@@ -1,10 +1,205 @@
 """
 Database connection and query utilities.
 Handles all MySQL operations with proper error handling.
+
+Connections come from a process-wide ConnectionPool, so queries reuse
+open connections instead of paying a TCP and auth handshake each time.
 """
+import threading
+import time
+
 import mysql.connector
 from mysql.connector import Error
-from config import DB_CONFIG
+from config import DB_CONFIG, DB_POOL_CONFIG
+
+
+class PoolTimeout(Error):
+    """No pooled connection became free within the checkout timeout."""
+
+
+class ConnectionPool:
+    """
+    Bounded pool of MySQL connections.
+
+    acquire() hands out the most recently returned idle connection after a
+    ping (reconnecting it if the server dropped it), opens a new one while
+    fewer than `size` are open, and otherwise waits for a release. Waiting
+    uses a threading.Condition, which eventlet's monkey patching turns into
+    a green one: a waiting request yields to the hub instead of blocking
+    it. Connections idle for longer than `idle_timeout` seconds are closed
+    at the next checkout.
+
+    mysql.connector.pooling is not used: it raises at once when exhausted
+    and has neither idle expiry nor metrics.
+    """
+
+    def __init__(self, size, idle_timeout=300.0, checkout_timeout=5.0, connect=None):
+        """
+        Args:
+            size: Maximum open connections
+            idle_timeout: Seconds after which an idle connection is closed
+            checkout_timeout: Seconds acquire() waits for a free connection
+            connect: Callable opening a connection (default: DB_CONFIG)
+        """
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self._connect = connect or (lambda: mysql.connector.connect(**DB_CONFIG))
+        self._cond = threading.Condition()
+        self._idle = []  # (connection, time returned), most recent last
+        self._open = 0
+        # Metrics
+        self.in_use = 0
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.timeouts = 0
+        self.created = 0
+        self.discarded = 0
+
+    def acquire(self):
+        """
+        Check out a healthy connection.
+
+        Raises:
+            PoolTimeout: Every connection stayed busy for checkout_timeout
+            mysql.connector.Error: A new connection could not be opened
+        """
+        conn = self._reserve()
+        if conn is not None:
+            try:
+                conn.ping(reconnect=True, attempts=1, delay=0)
+                return conn
+            except Error:
+                self._close(conn)  # the reserved slot is reused below
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self.in_use -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self.created += 1
+        return conn
+
+    def _reserve(self):
+        """
+        Take an idle connection, or reserve a slot for a new one (None).
+        """
+        expired = []
+        try:
+            with self._cond:
+                started = None
+                while True:
+                    now = time.monotonic()
+                    while self._idle:
+                        conn, returned = self._idle.pop()
+                        if now - returned <= self.idle_timeout:
+                            self._checked_out(started, now)
+                            return conn
+                        self._open -= 1
+                        expired.append(conn)
+                    if self._open < self.size:
+                        self._open += 1
+                        self._checked_out(started, now)
+                        return None
+                    if started is None:
+                        started = now
+                        self.waits += 1
+                    remaining = started + self.checkout_timeout - now
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        self._record_wait(started, now)
+                        raise PoolTimeout(msg=f"no free connection within {self.checkout_timeout}s")
+                    self._cond.wait(remaining)
+        finally:
+            for conn in expired:
+                self._close(conn)
+
+    def _checked_out(self, started, now):
+        self.in_use += 1
+        self.checkouts += 1
+        if started is not None:
+            self._record_wait(started, now)
+
+    def _record_wait(self, started, now):
+        wait_ms = (now - started) * 1000.0
+        self.wait_ms_total += wait_ms
+        self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+
+    def release(self, conn):
+        """
+        Return a connection. An unfinished transaction is rolled back, so
+        the next user does not inherit it (or its read snapshot); a broken
+        connection is closed instead of kept.
+        """
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            healthy = True
+        except Error:
+            healthy = False
+        if not healthy:
+            self._close(conn)
+        with self._cond:
+            self.in_use -= 1
+            if healthy:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                self._open -= 1
+            self._cond.notify()
+
+    def _close(self, conn):
+        with self._cond:
+            self.discarded += 1
+        try:
+            conn.close()
+        except Error:
+            pass
+
+    def close_all(self):
+        """Close every idle connection (checked-out ones close on release)."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for conn, _ in idle:
+            self._close(conn)
+
+    def snapshot(self):
+        """Pool metrics as a JSON-serializable dict."""
+        with self._cond:
+            return {
+                'size': self.size,
+                'open': self._open,
+                'in_use': self.in_use,
+                'idle': len(self._idle),
+                'checkouts': self.checkouts,
+                'waits': self.waits,
+                'wait_ms_total': round(self.wait_ms_total, 3),
+                'wait_ms_avg': round(self.wait_ms_total / self.waits, 3) if self.waits else 0.0,
+                'wait_ms_max': round(self.wait_ms_max, 3),
+                'timeouts': self.timeouts,
+                'created': self.created,
+                'discarded': self.discarded,
+            }
+
+
+_pool = None
+
+
+def get_pool():
+    """The process-wide ConnectionPool, created on first use."""
+    global _pool
+    if _pool is None:
+        _pool = ConnectionPool(
+            DB_POOL_CONFIG['size'],
+            DB_POOL_CONFIG['idle_timeout'],
+            DB_POOL_CONFIG['checkout_timeout'],
+        )
+    return _pool
 
 
 class DatabaseConnection:
@@ -13,21 +208,20 @@ class DatabaseConnection:
     @staticmethod
     def get_connection():
         """
-        Create and return a MySQL connection.
+        Check out a MySQL connection from the pool.
         Returns None if connection fails.
         """
         try:
-            conn = mysql.connector.connect(**DB_CONFIG)
-            return conn
+            return get_pool().acquire()
         except Error as e:
             print(f"Database connection error: {e}")
             return None
     
     @staticmethod
     def close_connection(conn):
-        """Safely close a database connection."""
-        if conn and conn.is_connected():
-            conn.close()
+        """Return a connection from get_connection to the pool."""
+        if conn:
+            get_pool().release(conn)
 
 
 class DatabaseQuery:
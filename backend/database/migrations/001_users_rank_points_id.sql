@@ -0,0 +1,12 @@
+-- =============================================
+-- 001: keyset index for leaderboard windows
+-- =============================================
+-- The leaderboard orders users by rank_points DESC, id ASC. A composite
+-- index in exactly that order lets get_nearby_players read the rows just
+-- above and just below a player as two short range scans (forward and
+-- backward) instead of COUNT(*) + LIMIT ... OFFSET over the whole table.
+-- Descending index parts need MySQL 8.0+.
+
+ALTER TABLE `users`
+  ADD INDEX `idx_rank_points_id` (`rank_points` DESC, `id`),
+  DROP INDEX `idx_rank_points`;
@@ -0,0 +1,10 @@
+-- =============================================
+-- 002: game types added by configurable variants
+-- =============================================
+-- Databases created before 'caro-blocked' and 'gomoku' only accept
+-- 'tic-tac-toe' and 'caro'; since ranked games save their match row in the
+-- settlement transaction, any other variant would roll back the whole
+-- settlement.
+
+ALTER TABLE `match_history`
+  MODIFY `game_type` ENUM('tic-tac-toe', 'caro', 'caro-blocked', 'gomoku') NOT NULL;
@@ -168,7 +168,7 @@ CREATE TABLE `users` (
   -- Indexes
   INDEX `idx_xp` (`xp`),
   INDEX `idx_level` (`level`),
-  INDEX `idx_rank_points` (`rank_points`)
+  INDEX `idx_rank_points_id` (`rank_points` DESC, `id`) -- leaderboard order, see migrations/001
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
 -- =============================================
@@ -176,7 +176,7 @@ CREATE TABLE `users` (
 -- =============================================
 CREATE TABLE `match_history` (
   `id` INT AUTO_INCREMENT PRIMARY KEY,
-  `game_type` ENUM('tic-tac-toe', 'caro') NOT NULL,
+  `game_type` ENUM('tic-tac-toe', 'caro', 'caro-blocked', 'gomoku') NOT NULL,
   `mode` ENUM('practice', 'ranked') NOT NULL,
   `player1_id` INT NOT NULL,
   `player2_id` INT,
@@ -216,6 +216,19 @@ INSERT INTO `users` (`username`, `password`, `display_name`, `email`, `xp`, `lev
 ('player1', 'scrypt:32768:8:1$fakehashedpassword1', 'Player 1', 'player1@example.com', 0, 1, 0, 1),
 ('player2', 'scrypt:32768:8:1$fakehashedpassword2', 'Player 2', 'player2@example.com', 0, 1, 0, 1);
 
+-- =============================================
+-- TABLE 7: schema_migrations (see migrate_schema.py)
+-- This schema already includes every migration below
+-- =============================================
+CREATE TABLE `schema_migrations` (
+  `name` VARCHAR(255) PRIMARY KEY,
+  `applied_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+INSERT INTO `schema_migrations` (`name`) VALUES
+('001_users_rank_points_id.sql'),
+('002_match_history_game_types.sql');
+
 COMMIT;
 
 -- =============================================
@@ -228,6 +241,7 @@ COMMIT;
 -- 4. users         - User table with FKs to ranks & game_levels
 -- 5. match_history - Game records
 -- 6. user_levels_history - Level-up tracking
+-- 7. schema_migrations - Applied migrations (migrate_schema.py)
 
 -- Key improvements:
 -- ✅ Normalized schema (3NF)
@@ -4,7 +4,19 @@ Advanced AI with strategic thinking for both Tic-Tac-Toe and Caro.
 """
 import random
 import math
+import time
+from config import AI_CONFIG, DIRECTIONS
 from game.engine import GameEngine
+from game.evaluator import IncrementalEvaluator, LineScorer
+from game.numpy_evaluator import get_numpy_evaluator
+from game.opening_book import get_opening_book
+from game.rules import game_family, get_rules
+from game.search_board import SearchBoard
+from game.search_context import SearchContext, SearchTimeout
+from game.search_stats import SearchStats
+from game.transposition import EXACT, LOWER, UPPER
+from game.ttt_cache import TTTCache
+from game.ttt_table import get_ttt_table
 
 
 class AIPlayer:
@@ -20,39 +32,78 @@ class AIPlayer:
         'OPEN_2': 50,              # 2 with both ends open
         'BLOCKED_2': 10            # 2 with one end blocked
     }
+    # Search scores at least this large are wins/losses (WIN +- remaining
+    # depth), far above any pattern evaluation
+    MATE_BOUND = SCORES['WIN'] // 2
     
-    # Cache for Tic-Tac-Toe minimax results (state serialization -> score)
-    TTT_CACHE = {}
+    # Memoized per-line scorers shared by every incremental evaluator: five
+    # in a row, and the Caro rule where a five blocked at both ends is void
+    LINE_SCORER = LineScorer(SCORES)
+    BLOCKED_LINE_SCORER = LineScorer(SCORES, blocked_ends=True)
+    
+    # Bounded, symmetry-canonical cache for Tic-Tac-Toe minimax results
+    TTT_CACHE = TTTCache(AI_CONFIG['ttt_cache_size'])
+
+    # Tic-Tac-Toe cells in row-major order (one loop, so a cutoff ends the node)
+    TTT_CELLS = [(r, c) for r in range(3) for c in range(3)]
 
     @staticmethod
-    def get_ai_move(board, game_type, difficulty):
+    def get_ai_move(board, game_type, difficulty, context=None):
         """
         Main entry point to get AI move.
         
         Args:
             board: Game board state
-            game_type: 'tic-tac-toe' or 'caro'
+            game_type: Key of GAME_CONFIG; 'tic-tac-toe' or a Caro-family
+                variant ('caro', 'caro-blocked', 'gomoku')
             difficulty: 'easy', 'medium', or 'hard'
+            context: Optional SearchContext kept for the whole game, so search
+                results from earlier AI turns are reused
         
         Returns:
             Tuple (r, c) for the move
         """
-        if game_type == 'tic-tac-toe':
-            return AIPlayer._get_tictactoe_move(board, difficulty)
-        elif game_type == 'caro':
-            return AIPlayer._get_caro_move(board, difficulty)
-        return None
+        return AIPlayer.get_ai_move_with_stats(board, game_type, difficulty, context)[0]
+
+    @staticmethod
+    def get_ai_move_with_stats(board, game_type, difficulty, context=None):
+        """
+        Get AI move together with the cost of finding it.
+        
+        Args:
+            Same as get_ai_move
+        
+        Returns:
+            Tuple (move, SearchStats): nodes, cutoffs, evaluations,
+            transposition hits, threat-search nodes, reached depth and
+            elapsed time of this call
+        """
+        stats = SearchStats(game_type, difficulty)
+        started = time.perf_counter()
+        move = None
+        family = game_family(game_type)
+        if family == 'tic-tac-toe':
+            move = AIPlayer._get_tictactoe_move(board, difficulty, stats)
+        elif family == 'caro':
+            move = AIPlayer._get_caro_move(board, difficulty, context, stats, get_rules(game_type))
+        stats.elapsed_ms = (time.perf_counter() - started) * 1000.0
+        return move, stats
     
     # ========== TIC-TAC-TOE LOGIC ==========
     
     @staticmethod
-    def _get_tictactoe_move(board, difficulty):
+    def _get_tictactoe_move(board, difficulty, stats=None):
         """
         Get AI move for Tic-Tac-Toe (3x3 board).
         
         Easy: Random moves
         Medium: 30% random, 70% Minimax (occasional mistakes)
         Hard: Full Minimax with Alpha-Beta Pruning (unbeatable)
+        
+        `stats` (SearchStats), if given, counts the positions tried for
+        immediate wins/blocks as evaluations, a perfect-play table answer
+        as one node and table hit, and the minimax nodes, cutoffs and cache
+        hits otherwise.
         """
         empty = [(r, c) for r in range(3) for c in range(3) if board[r][c] == 0]
         if not empty:
@@ -63,10 +114,10 @@ class AIPlayer:
             return random.choice(empty)
         
         # Always prioritize immediate wins/blocks before deeper search
-        winning_move = AIPlayer._find_immediate_ttt_move(board, 2)
+        winning_move = AIPlayer._find_immediate_ttt_move(board, 2, stats)
         if winning_move:
             return winning_move
-        blocking_move = AIPlayer._find_immediate_ttt_move(board, 1)
+        blocking_move = AIPlayer._find_immediate_ttt_move(board, 1, stats)
         if blocking_move:
             return blocking_move
 
@@ -78,29 +129,44 @@ class AIPlayer:
             if heuristic_move:
                 return heuristic_move
 
-        # HARD: Full Minimax with Alpha-Beta Pruning
+        # HARD: Precomputed perfect play (same choice as the minimax below)
+        table = get_ttt_table()
+        if table is not None:
+            table_move = table.best_move(board)
+            if table_move is not None:
+                if stats is not None:
+                    stats.nodes += 1
+                    stats.tt_hits += 1
+                    stats.depth = len(empty)  # solved to the end of the game
+                return table_move
+
+        # Without the table: Full Minimax with Alpha-Beta Pruning
         best_score = -math.inf
         best_move = random.choice(empty)  # Fallback
         cache = AIPlayer.TTT_CACHE
         
         for r, c in empty:
             board[r][c] = 2  # AI is player 2
-            score = AIPlayer._minimax_ttt(board, 0, False, -math.inf, math.inf, cache)
+            score = AIPlayer._minimax_ttt(board, 0, False, -math.inf, math.inf, cache, stats)
             board[r][c] = 0  # Undo
             
             if score > best_score:
                 best_score = score
                 best_move = (r, c)
+        if stats is not None:
+            stats.depth = len(empty)
         
         return best_move
 
     @staticmethod
-    def _find_immediate_ttt_move(board, player):
+    def _find_immediate_ttt_move(board, player, stats=None):
         """Return a move that lets `player` win on this turn if available."""
         for r in range(3):
             for c in range(3):
                 if board[r][c] != 0:
                     continue
+                if stats is not None:
+                    stats.evaluations += 1
                 board[r][c] = player
                 if AIPlayer._check_winner_simple(board) == player:
                     board[r][c] = 0
@@ -122,12 +188,7 @@ class AIPlayer:
         return None
 
     @staticmethod
-    def _serialize_ttt(board):
-        """Convert Tic-Tac-Toe board to immutable representation for caching."""
-        return tuple(cell for row in board for cell in row)
-
-    @staticmethod
-    def _minimax_ttt(board, depth, is_maximizing, alpha, beta, cache=None):
+    def _minimax_ttt(board, depth, is_maximizing, alpha, beta, cache=None, stats=None):
         """
         Minimax algorithm with Alpha-Beta Pruning for Tic-Tac-Toe.
         
@@ -137,18 +198,27 @@ class AIPlayer:
             is_maximizing: True if maximizing player (AI), False if minimizing (human)
             alpha: Alpha value for pruning
             beta: Beta value for pruning
+            cache: Optional TTTCache
+            stats: Optional SearchStats (nodes, cutoffs, evaluations, cache hits)
         
         Returns:
             Score for the board state
         """  # noqa: D400
+        if stats is not None:
+            stats.nodes += 1
         state_key = None
+        alpha_orig, beta_orig = alpha, beta
         if cache is not None:
-            state_key = (AIPlayer._serialize_ttt(board), depth, is_maximizing)
-            cached_score = cache.get(state_key)
+            state_key = TTTCache.key(board, is_maximizing)
+            cached_score, alpha, beta = cache.probe(state_key, depth, alpha, beta)
             if cached_score is not None:
+                if stats is not None:
+                    stats.tt_hits += 1
                 return cached_score
         
         # Check terminal state
+        if stats is not None:
+            stats.evaluations += 1
         winner = AIPlayer._check_winner_simple(board)
         if winner == 2:
             return 10 - depth  # AI wins (prefer faster wins)
@@ -160,34 +230,36 @@ class AIPlayer:
         if is_maximizing:
             # AI's turn (maximize score)
             max_eval = -math.inf
-            for r in range(3):
-                for c in range(3):
-                    if board[r][c] == 0:
-                        board[r][c] = 2
-                        eval_score = AIPlayer._minimax_ttt(board, depth + 1, False, alpha, beta, cache)
-                        board[r][c] = 0
-                        max_eval = max(max_eval, eval_score)
-                        alpha = max(alpha, eval_score)
-                        if beta <= alpha:
-                            break  # Beta cutoff
+            for r, c in AIPlayer.TTT_CELLS:
+                if board[r][c] == 0:
+                    board[r][c] = 2
+                    eval_score = AIPlayer._minimax_ttt(board, depth + 1, False, alpha, beta, cache, stats)
+                    board[r][c] = 0
+                    max_eval = max(max_eval, eval_score)
+                    alpha = max(alpha, eval_score)
+                    if beta <= alpha:
+                        if stats is not None:
+                            stats.cutoffs += 1
+                        break  # Beta cutoff
             result = max_eval
         else:
             # Human's turn (minimize score)
             min_eval = math.inf
-            for r in range(3):
-                for c in range(3):
-                    if board[r][c] == 0:
-                        board[r][c] = 1
-                        eval_score = AIPlayer._minimax_ttt(board, depth + 1, True, alpha, beta, cache)
-                        board[r][c] = 0
-                        min_eval = min(min_eval, eval_score)
-                        beta = min(beta, eval_score)
-                        if beta <= alpha:
-                            break  # Alpha cutoff
+            for r, c in AIPlayer.TTT_CELLS:
+                if board[r][c] == 0:
+                    board[r][c] = 1
+                    eval_score = AIPlayer._minimax_ttt(board, depth + 1, True, alpha, beta, cache, stats)
+                    board[r][c] = 0
+                    min_eval = min(min_eval, eval_score)
+                    beta = min(beta, eval_score)
+                    if beta <= alpha:
+                        if stats is not None:
+                            stats.cutoffs += 1
+                        break  # Alpha cutoff
             result = min_eval
         
-        if cache is not None and state_key is not None:
-            cache[state_key] = result
+        if cache is not None:
+            cache.store(state_key, depth, alpha_orig, beta_orig, result)
         return result
 
     @staticmethod
@@ -219,130 +291,249 @@ class AIPlayer:
     # ========== CARO LOGIC (ADVANCED) ==========
     
     @staticmethod
-    def _get_caro_move(board, difficulty):
+    def _get_caro_move(board, difficulty, context=None, stats=None, rules=None):
         """
-        Get AI move for Caro/Gomoku (15x20 board).
+        Get AI move for Caro/Gomoku (any board size of a Caro-family variant).
         
         Easy: Random moves from neighbor positions
         Medium: Depth 1 Minimax (basic tactics)
-        Hard: Depth 2 Minimax (strategic thinking)
+        Hard: Threat-space search (VCF/VCT), then iterative deepening Minimax
+              within a time budget (strategic thinking)
+        
+        The search runs on a SearchBoard copy of `board`; the caller's grid is
+        never modified. With a SearchContext, positions are looked up in and
+        stored to its transposition table, and the SearchBoard is kept there
+        for the game: the next turn only syncs the moves played since.
+        Search counters are added to `stats` when given. Hard answers early
+        positions from the opening book when it has them. `rules` is the
+        variant's GameRules (default: 'caro').
         """
+        if rules is None:
+            rules = get_rules('caro')
+        if difficulty == 'hard' and not rules.blocked_ends:
+            # The book holds five-in-a-row replies; lookup() checks the shape
+            book = get_opening_book()
+            book_move = book.lookup(board) if book is not None else None
+            if book_move:
+                return book_move
+
+        bb = AIPlayer._take_search_board(board, context, rules)
+        try:
+            return AIPlayer._choose_caro_move(bb, difficulty, context, stats)
+        finally:
+            if context is not None:
+                context.board = bb  # an aborted search is repaired by the next sync
+
+    @staticmethod
+    def _line_scorer(rules):
+        """LineScorer matching a variant's rules (None: five in a row)."""
+        if rules is not None and rules.blocked_ends:
+            return AIPlayer.BLOCKED_LINE_SCORER
+        return AIPlayer.LINE_SCORER
+
+    @staticmethod
+    def _take_search_board(board, context, rules):
+        """SearchBoard for `board`, reusing the one kept in `context` if any."""
+        bb = context.board if context is not None else None
+        if bb is None or bb.rules is not rules or bb.rows != len(board) or bb.cols != len(board[0]):
+            return SearchBoard.from_grid(board, AIPlayer._line_scorer(rules), rules=rules)
+        context.board = None  # a concurrent search of this game builds its own
+        bb.sync(board)
+        return bb
+
+    @staticmethod
+    def _choose_caro_move(bb, difficulty, context, stats=None):
+        """Pick the AI's move on a SearchBoard (see _get_caro_move)."""
+        started = time.perf_counter()
+
         # Get possible moves (only near existing pieces)
         search_radius = 3 if difficulty == 'hard' else 2
-        possible_moves = AIPlayer._get_neighbor_moves(board, radius=search_radius)
+        possible_moves = AIPlayer._get_neighbor_moves(bb, radius=search_radius)
         if not possible_moves:
             # Empty board: play in center
-            return (len(board) // 2, len(board[0]) // 2)
+            return (bb.rows // 2, bb.cols // 2)
 
         # EASY: Random move from neighbors
         if difficulty == 'easy':
             return random.choice(possible_moves)
 
         # Look for immediate wins or urgent defensive blocks before deeper search
-        winning_move = AIPlayer._find_immediate_caro_move(board, possible_moves, 2)
+        winning_move = AIPlayer._find_immediate_caro_move(bb, possible_moves, 2)
         if winning_move:
             return winning_move
-        blocking_move = AIPlayer._find_immediate_caro_move(board, possible_moves, 1)
+        blocking_move = AIPlayer._find_immediate_caro_move(bb, possible_moves, 1)
         if blocking_move:
             return blocking_move
 
         # VCF (Victory by Continuous Fours): look for unstoppable 4-threats
-        vcf_move = AIPlayer._find_vcf_move(board, possible_moves, 2)
+        vcf_move = AIPlayer._find_vcf_move(bb, possible_moves, 2)
         if vcf_move:
             return vcf_move
 
+        if context is None:
+            context = SearchContext(tt_size=AI_CONFIG['scratch_table_size'])
+        settings = AI_CONFIG['search'].get(difficulty, AI_CONFIG['search']['medium'])
+        deadline = started + settings['time_budget_ms'] / 1000.0
+
         ordered_moves = possible_moves
         if difficulty == 'hard':
-            ordered_moves = AIPlayer._order_moves_by_urgency(board, possible_moves, 2, limit=20)
+            # Threat-space search: forced wins through chains of fours and
+            # threes, then the moves that refute the opponent's forced win
+            # (it assumes every five wins, so blocked-ends variants skip it)
+            if bb.rules is None or not bb.rules.blocked_ends:
+                threat_deadline = min(deadline, time.perf_counter() + AI_CONFIG['threat_search']['time_budget_ms'] / 1000.0)
+                threat_move = context.threats.find_win(bb, 2, threat_deadline)
+                if stats is not None:
+                    stats.threat_nodes += context.threats.nodes
+                if threat_move:
+                    return threat_move
+                defences = context.threats.find_defences(bb, 2, threat_deadline)
+                if stats is not None:
+                    stats.threat_nodes += context.threats.nodes
+                if defences:
+                    possible_moves = defences
+            ordered_moves = AIPlayer._order_moves_by_urgency(bb, possible_moves, 2, limit=20)
+
+        # MEDIUM/HARD: Iterative deepening Minimax within the difficulty's budget
+        context.tt.new_search()
+
+        root_key = bb.key ^ bb.geometry.zobrist_side
+        # Try the best move remembered for this position first
+        entry = context.tt.probe(root_key)
+        if entry and entry[3] in ordered_moves:
+            ordered_moves = [entry[3]] + [m for m in ordered_moves if m != entry[3]]
+
+        best_move = ordered_moves[0]  # Default fallback
+        context.stats = stats
+        try:
+            for depth in range(1, settings['max_depth'] + 1):
+                # Depth 1 always completes so there is a searched move to return
+                context.deadline = deadline if depth > 1 else None
+                try:
+                    move, score, ordered_moves = AIPlayer._search_caro_root(bb, ordered_moves, depth, context)
+                except SearchTimeout:
+                    break  # keep the move from the last completed depth
+                finally:
+                    context.deadline = None
+                if score <= -AIPlayer.SCORES['WIN'] and depth > 1:
+                    break  # every move loses at this depth: keep the shallower choice
+                best_move = move
+                if stats is not None:
+                    stats.depth = depth
+                context.tt.store(root_key, depth, EXACT, AIPlayer._to_tt_score(score, depth), move)
+                if score >= AIPlayer.SCORES['WIN'] or time.perf_counter() >= deadline:
+                    break  # forced result found, or no time left for another depth
+        finally:
+            context.stats = None
+        
+        return best_move
 
-        # MEDIUM/HARD: Minimax with depth limit
-        depth = 2 if difficulty == 'hard' else 1
+    @staticmethod
+    def _search_caro_root(bb, ordered_moves, depth, context):
+        """
+        Search every root move to `depth` plies.
+        
+        Args:
+            bb: Current board (SearchBoard), AI to move
+            ordered_moves: Root moves, best guess first
+            depth: Depth of this iteration
+            context: SearchContext (transposition table and deadline)
         
+        Returns:
+            Tuple (best move, best score, root moves reordered for the next
+            iteration: best move first, then by score)
+        
+        Raises:
+            SearchTimeout: the context deadline passed; `bb` is left
+            mid-search and must be discarded
+        """
         best_score = -math.inf
-        best_move = ordered_moves[0]  # Default fallback
+        best_move = ordered_moves[0]
+        scores = {}
         
         # Evaluate each possible move
         for r, c in ordered_moves:
-            board[r][c] = 2  # AI plays here
+            bb.place(r, c, 2)  # AI plays here
             
             # Immediate win check
-            if AIPlayer._check_caro_win_local(board, r, c, 2):
-                board[r][c] = 0
-                return (r, c)  # Take winning move immediately
+            if AIPlayer._check_caro_win_local(bb, r, c, 2):
+                bb.remove(r, c)
+                return (r, c), AIPlayer.SCORES['WIN'], ordered_moves  # Take winning move immediately
             
-            # Minimax evaluation
-            score = AIPlayer._minimax_caro(board, depth - 1, False, -math.inf, math.inf, (r, c))
-            board[r][c] = 0  # Undo
+            # Minimax evaluation (moves that cannot beat best_score fail low)
+            score = AIPlayer._minimax_caro(bb, depth - 1, False, best_score, math.inf, (r, c), context)
+            bb.remove(r, c)  # Undo
+            scores[(r, c)] = score
             
             if score > best_score:
                 best_score = score
                 best_move = (r, c)
         
-        return best_move
+        # Principal variation first; the rest by (possibly bounded) score
+        reordered = sorted(ordered_moves, key=lambda move: scores[move], reverse=True)
+        reordered.remove(best_move)
+        reordered.insert(0, best_move)
+        return best_move, best_score, reordered
 
     @staticmethod
-    def _find_immediate_caro_move(board, moves, player):
+    def _find_immediate_caro_move(bb, moves, player):
         """Return move that lets `player` win immediately, if any."""
         for r, c in moves:
-            if board[r][c] != 0:
+            if bb.get(r, c) != 0:
                 continue
-            board[r][c] = player
-            if AIPlayer._check_caro_win_local(board, r, c, player):
-                board[r][c] = 0
+            bb.place(r, c, player)
+            won = AIPlayer._check_caro_win_local(bb, r, c, player)
+            bb.remove(r, c)
+            if won:
                 return (r, c)
-            board[r][c] = 0
         return None
 
     @staticmethod
-    def _find_vcf_move(board, moves, player):
+    def _find_vcf_move(bb, moves, player):
         """Find move that creates an open four (continuous threat)."""
         for r, c in moves:
-            if board[r][c] != 0:
+            if bb.get(r, c) != 0:
                 continue
-            board[r][c] = player
-            if AIPlayer._creates_open_four(board, r, c, player):
-                board[r][c] = 0
+            bb.place(r, c, player)
+            found = AIPlayer._creates_open_four(bb, r, c, player)
+            bb.remove(r, c)
+            if found:
                 return (r, c)
-            board[r][c] = 0
         return None
 
     @staticmethod
-    def _creates_open_four(board, r, c, player):
+    def _creates_open_four(bb, r, c, player):
         """Check if placing at (r,c) creates an open four threat."""
-        rows, cols = len(board), len(board[0])
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
-        for dr, dc in directions:
-            count = 1
-            open_ends = 0
-
-            # forward
-            nr, nc = r + dr, c + dc
-            while 0 <= nr < rows and 0 <= nc < cols and board[nr][nc] == player:
-                count += 1
-                nr += dr
-                nc += dc
-            if 0 <= nr < rows and 0 <= nc < cols and board[nr][nc] == 0:
-                open_ends += 1
-
-            # backward
-            nr, nc = r - dr, c - dc
-            while 0 <= nr < rows and 0 <= nc < cols and board[nr][nc] == player:
-                count += 1
-                nr -= dr
-                nc -= dc
-            if 0 <= nr < rows and 0 <= nc < cols and board[nr][nc] == 0:
-                open_ends += 1
-
-            if count == 4 and open_ends == 2:
+        empty = bb.empty
+        stride = bb.stride
+        for dr, dc in DIRECTIONS:
+            forward = AIPlayer._count_direction(bb, r, c, dr, dc, player)
+            backward = AIPlayer._count_direction(bb, r, c, -dr, -dc, player)
+            if forward + backward != 3:
+                continue
+
+            # Both cells just past the run must be empty (off-board bits are never set)
+            step = dr * stride + dc
+            idx = r * stride + c
+            ahead = idx + (forward + 1) * step
+            behind = idx - (backward + 1) * step
+            if ahead >= 0 and behind >= 0 and (empty >> ahead) & 1 and (empty >> behind) & 1:
                 return True
         return False
 
     @staticmethod
-    def _order_moves_by_urgency(board, moves, player, limit=None):
-        """Sort moves by local pattern potential and optionally trim."""
+    def _order_moves_by_urgency(bb, moves, player, limit=None):
+        """
+        Sort moves by local pattern potential and optionally trim.
+        
+        A cell is worth its potential for `player` plus its potential for the
+        opponent (blocking value), so trimming never drops the only defence.
+        """
+        opponent = 3 - player
         scored = []
         for move in moves:
-            score = AIPlayer._local_pattern_score(board, move[0], move[1], player)
+            score = (AIPlayer._local_pattern_score(bb, move[0], move[1], player)
+                     + AIPlayer._local_pattern_score(bb, move[0], move[1], opponent))
             scored.append((score, move))
         scored.sort(key=lambda item: item[0], reverse=True)
         ordered = [move for _, move in scored]
@@ -351,270 +542,296 @@ class AIPlayer:
         return ordered
 
     @staticmethod
-    def _local_pattern_score(board, r, c, player):
+    def _local_pattern_score(bb, r, c, player):
         """Heuristic that rewards moves extending lines or creating forks."""
-        if board[r][c] != 0:
+        if bb.get(r, c) != 0:
             return 0
-        board[r][c] = player
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
+        # The empty cell does not block its own runs, so no need to place the stone
         max_run = 0
         total = 0
-        for dr, dc in directions:
-            forward = AIPlayer._count_direction(board, r, c, dr, dc, player)
-            backward = AIPlayer._count_direction(board, r, c, -dr, -dc, player)
+        for dr, dc in DIRECTIONS:
+            forward = AIPlayer._count_direction(bb, r, c, dr, dc, player)
+            backward = AIPlayer._count_direction(bb, r, c, -dr, -dc, player)
             run = 1 + forward + backward
             max_run = max(max_run, run)
             total += run
-        board[r][c] = 0
         # Weight longest run heavily but keep some awareness of additional lines
         return max_run * 100 + total
 
     @staticmethod
-    def _count_direction(board, r, c, dr, dc, player):
+    def _count_direction(bb, r, c, dr, dc, player):
         """Count consecutive stones for `player` starting from (r,c) exclusive."""
-        rows, cols = len(board), len(board[0])
-        count = 0
-        nr, nc = r + dr, c + dc
-        while 0 <= nr < rows and 0 <= nc < cols and board[nr][nc] == player:
-            count += 1
-            nr += dr
-            nc += dc
-        return count
+        return bb.count_direction(r, c, dr, dc, player)
 
     @staticmethod
-    def _order_moves(board, moves, player):
+    def _order_moves(bb, moves, player):
         """Order moves by heuristic board score to improve alpha-beta pruning."""
         scored_moves = []
-        for r, c in moves:
-            board[r][c] = player
-            score = AIPlayer._evaluate_board(board)
-            board[r][c] = 0
-            scored_moves.append((score, (r, c)))
+        evaluator = getattr(bb, 'evaluator', None)
+        numpy_evaluator = get_numpy_evaluator(bb.geometry, AIPlayer._line_scorer(bb.rules))
+        if numpy_evaluator is not None and moves:
+            # Score every candidate in one vectorized call
+            scored_moves = list(zip(numpy_evaluator.score_moves(bb, moves, player), moves))
+        elif evaluator is not None:
+            # Only the score is needed: update the evaluator, not the whole board
+            stride = bb.stride
+            for r, c in moves:
+                idx = r * stride + c
+                evaluator.place(idx, player)
+                scored_moves.append((evaluator.score(), (r, c)))
+                evaluator.remove(idx, player)
+        else:
+            for r, c in moves:
+                bb.place(r, c, player)
+                score = AIPlayer._evaluate_board(bb)
+                bb.remove(r, c)
+                scored_moves.append((score, (r, c)))
         scored_moves.sort(key=lambda x: x[0], reverse=True)
         return [move for _, move in scored_moves]
 
     @staticmethod
-    def _minimax_caro(board, depth, is_maximizing, alpha, beta, last_move):
+    def _minimax_caro(bb, depth, is_maximizing, alpha, beta, last_move, context=None):
         """
         Minimax algorithm with Alpha-Beta Pruning for Caro.
         
         Args:
-            board: Current board state
+            bb: Current board state (BitBoard)
             depth: Remaining depth to search
             is_maximizing: True if AI's turn, False if human's turn
             alpha: Alpha value for pruning
             beta: Beta value for pruning
             last_move: Last move position (r, c)
+            context: Optional SearchContext; its transposition table is
+                consulted and filled, and its deadline is enforced
         
         Returns:
             Score for the board state
+        
+        Raises:
+            SearchTimeout: the context deadline passed or it was stopped
         """
+        stats = context.stats if context is not None else None
+        if stats is not None:
+            stats.nodes += 1
+
         last_r, last_c = last_move
         player_check = 2 if not is_maximizing else 1  # Who just played
         
-        # Check if last move resulted in a win
-        if AIPlayer._check_caro_win_local(board, last_r, last_c, player_check):
-            return 10000000 if player_check == 2 else -10000000
+        # Check if last move resulted in a win (prefer faster wins, slower losses)
+        if AIPlayer._check_caro_win_local(bb, last_r, last_c, player_check):
+            return 10000000 + depth if player_check == 2 else -10000000 - depth
         
         # Depth limit reached: evaluate board
         if depth == 0:
-            return AIPlayer._evaluate_board(board)
+            if stats is not None:
+                stats.evaluations += 1
+            return AIPlayer._evaluate_board(bb)
+
+        tt = None
+        if context is not None:
+            if context.stopped or (context.deadline is not None and time.perf_counter() > context.deadline):
+                raise SearchTimeout()
+            tt = context.tt
+
+        # Transposition lookup: reuse results of the same position reached
+        # through another move order (or during an earlier AI turn)
+        key = bb.key ^ bb.geometry.zobrist_side if is_maximizing else bb.key
+        hash_move = None
+        if tt is not None:
+            entry = tt.probe(key)
+            if entry is not None:
+                if stats is not None:
+                    stats.tt_hits += 1
+                entry_depth, flag, value, hash_move = entry
+                value = AIPlayer._from_tt_score(value, depth)
+                if entry_depth >= depth:
+                    if flag == EXACT:
+                        return value
+                    if flag == LOWER:
+                        alpha = max(alpha, value)
+                    else:
+                        beta = min(beta, value)
+                    if beta <= alpha:
+                        return value
+        alpha_orig, beta_orig = alpha, beta
 
         # Get possible moves (narrower search at deeper levels)
         radius = 2 if depth > 1 else 1
-        possible_moves = AIPlayer._get_neighbor_moves(board, radius=radius)
+        possible_moves = AIPlayer._get_neighbor_moves(bb, radius=radius)
         
         if not possible_moves:
-            return AIPlayer._evaluate_board(board)
+            return AIPlayer._evaluate_board(bb)
         
         if len(possible_moves) > 18:
             focus_player = 2 if is_maximizing else 1
-            possible_moves = AIPlayer._order_moves_by_urgency(board, possible_moves, focus_player, limit=18)
+            possible_moves = AIPlayer._order_moves_by_urgency(bb, possible_moves, focus_player, limit=18)
 
-        possible_moves = AIPlayer._order_moves(board, possible_moves, 2 if is_maximizing else 1)
+        possible_moves = AIPlayer._order_moves(bb, possible_moves, 2 if is_maximizing else 1)
+        if stats is not None:
+            stats.evaluations += len(possible_moves)
+        if hash_move in possible_moves:
+            possible_moves.remove(hash_move)
+            possible_moves.insert(0, hash_move)
         
+        best_move = None
         if is_maximizing:
             # AI's turn (maximize)
             max_eval = -math.inf
             for r, c in possible_moves:
-                board[r][c] = 2
-                eval_score = AIPlayer._minimax_caro(board, depth - 1, False, alpha, beta, (r, c))
-                board[r][c] = 0
-                max_eval = max(max_eval, eval_score)
+                bb.place(r, c, 2)
+                eval_score = AIPlayer._minimax_caro(bb, depth - 1, False, alpha, beta, (r, c), context)
+                bb.remove(r, c)
+                if eval_score > max_eval:
+                    max_eval = eval_score
+                    best_move = (r, c)
                 alpha = max(alpha, eval_score)
                 if beta <= alpha:
+                    if stats is not None:
+                        stats.cutoffs += 1
                     break  # Beta cutoff
-            return max_eval
+            result = max_eval
         else:
             # Human's turn (minimize)
             min_eval = math.inf
             for r, c in possible_moves:
-                board[r][c] = 1
-                eval_score = AIPlayer._minimax_caro(board, depth - 1, True, alpha, beta, (r, c))
-                board[r][c] = 0
-                min_eval = min(min_eval, eval_score)
+                bb.place(r, c, 1)
+                eval_score = AIPlayer._minimax_caro(bb, depth - 1, True, alpha, beta, (r, c), context)
+                bb.remove(r, c)
+                if eval_score < min_eval:
+                    min_eval = eval_score
+                    best_move = (r, c)
                 beta = min(beta, eval_score)
                 if beta <= alpha:
+                    if stats is not None:
+                        stats.cutoffs += 1
                     break  # Alpha cutoff
-            return min_eval
+            result = min_eval
+
+        if tt is not None:
+            if result <= alpha_orig:
+                flag = UPPER
+            elif result >= beta_orig:
+                flag = LOWER
+            else:
+                flag = EXACT
+            tt.store(key, depth, flag, AIPlayer._to_tt_score(result, depth), best_move)
+        return result
+
+    @staticmethod
+    def _to_tt_score(score, depth):
+        """
+        Score as stored in the transposition table. Win/loss scores carry
+        the remaining depth at which the five was made; stored relative to
+        this node (remaining `depth`), they keep the right distance when the
+        position is reached again at another depth.
+        """
+        if score >= AIPlayer.MATE_BOUND:
+            return score - depth
+        if score <= -AIPlayer.MATE_BOUND:
+            return score + depth
+        return score
 
     @staticmethod
-    def _get_neighbor_moves(board, radius=1):
+    def _from_tt_score(value, depth):
+        """Inverse of _to_tt_score for a node with remaining `depth`."""
+        if value >= AIPlayer.MATE_BOUND:
+            return value + depth
+        if value <= -AIPlayer.MATE_BOUND:
+            return value - depth
+        return value
+
+    @staticmethod
+    def _get_neighbor_moves(bb, radius=1):
         """
         Get valid moves only around existing pieces (localized search).
         
         This optimization reduces search space from 300 cells to ~20-50 cells.
+        A SearchBoard reads them off its incrementally maintained frontier;
+        a plain BitBoard dilates the occupied bitboard.
         
         Args:
-            board: Game board
-            radius: Search radius around pieces (1 or 2)
+            bb: Game board (BitBoard or SearchBoard)
+            radius: Search radius around pieces (1 to 3)
         
         Returns:
-            List of (r, c) tuples for valid moves
+            List of (r, c) tuples for valid moves, in row-major order
         """
-        rows, cols = len(board), len(board[0])
-        moves = set()
-        has_piece = False
-        
-        # Find all empty cells near existing pieces
-        for r in range(rows):
-            for c in range(cols):
-                if board[r][c] != 0:
-                    has_piece = True
-                    # Check cells in radius around this piece
-                    for i in range(-radius, radius + 1):
-                        for j in range(-radius, radius + 1):
-                            nr, nc = r + i, c + j
-                            if 0 <= nr < rows and 0 <= nc < cols and board[nr][nc] == 0:
-                                moves.add((nr, nc))
-        
-        if not has_piece:
-            return []  # Empty board
-        
-        return sorted(moves)
+        if isinstance(bb, SearchBoard):
+            return bb.candidates(radius)
+        return bb.cell_list(bb.neighbor_mask(radius))
 
     @staticmethod
-    def _check_caro_win_local(board, r, c, player):
+    def _check_caro_win_local(bb, r, c, player):
         """
         Fast win check only around the last move position.
         
         Args:
-            board: Game board
+            bb: Game board (BitBoard)
             r, c: Position of last move
             player: Player number (1 or 2)
         
         Returns:
-            True if player has 5 in a row, False otherwise
+            True if the stone wins under the board's rules (five in a row,
+            not blocked at both ends in blocked-ends variants)
         """
-        rows, cols = len(board), len(board[0])
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
-        
-        for dr, dc in directions:
-            count = 1
-            
-            # Check forward direction
-            for k in range(1, 5):
-                nr, nc = r + dr * k, c + dc * k
-                if 0 <= nr < rows and 0 <= nc < cols and board[nr][nc] == player:
-                    count += 1
-                else:
-                    break
-            
-            # Check backward direction
-            for k in range(1, 5):
-                nr, nc = r - dr * k, c - dc * k
-                if 0 <= nr < rows and 0 <= nc < cols and board[nr][nc] == player:
-                    count += 1
-                else:
-                    break
-            
-            # Check if we have 5 in a row
-            if count >= 5:
-                return True
-        
-        return False
+        return bb.wins_at(r, c, player)
 
     @staticmethod
-    def _evaluate_board(board):
+    def _evaluate_board(bb):
         """
         Heuristic board evaluation function.
         
-        Evaluates the board state based on piece patterns.
+        Evaluates the board state based on piece patterns. A SearchBoard
+        answers from its incremental evaluator; any other board is scanned
+        (vectorized when the NumPy evaluator is configured).
         
         Returns:
             Score (positive favors AI, negative favors human)
         """
-        ai_score = AIPlayer._evaluate_role(board, 2)
-        human_score = AIPlayer._evaluate_role(board, 1)
+        evaluator = getattr(bb, 'evaluator', None)
+        if evaluator is not None:
+            return evaluator.score()
+
+        numpy_evaluator = get_numpy_evaluator(bb.geometry, AIPlayer._line_scorer(bb.rules))
+        if numpy_evaluator is not None:
+            human_score, ai_score = numpy_evaluator.role_scores(bb)
+        else:
+            ai_score = AIPlayer._evaluate_role(bb, 2)
+            human_score = AIPlayer._evaluate_role(bb, 1)
         
         # AI score minus weighted human score (weight 1.2 for defensive bias)
         return ai_score - (human_score * 2.0)
 
     @staticmethod
-    def _evaluate_role(board, player_val):
+    def _evaluate_role(bb, player_val):
         """
         Calculate score for a player based on piece patterns.
         
+        Counts every 5-cell window in the four directions with bitwise
+        operations (see BitBoard.window_counts). The result is identical to
+        running `_evaluate_line` over every row, column and diagonal.
+        Window counts cannot tell a five blocked by the opponent from one
+        against the edge, so blocked-ends boards are scored line by line.
+        
         Args:
-            board: Game board
+            bb: Game board (BitBoard)
             player_val: Player number (1 or 2)
         
         Returns:
             Total score for the player
         """
-        score = 0
-        rows, cols = len(board), len(board[0])
-        
-        # Evaluate horizontal lines
-        for r in range(rows):
-            score += AIPlayer._evaluate_line(board[r], player_val)
-        
-        # Evaluate vertical lines
-        for c in range(cols):
-            col_arr = [board[r][c] for r in range(rows)]
-            score += AIPlayer._evaluate_line(col_arr, player_val)
-        
-        # Evaluate diagonal lines (top-left to bottom-right)
-        for start_row in range(rows - 4):
-            diag = []
-            r, c = start_row, 0
-            while r < rows and c < cols:
-                diag.append(board[r][c])
-                r += 1
-                c += 1
-            score += AIPlayer._evaluate_line(diag, player_val)
-        for start_col in range(1, cols - 4):
-            diag = []
-            r, c = 0, start_col
-            while r < rows and c < cols:
-                diag.append(board[r][c])
-                r += 1
-                c += 1
-            score += AIPlayer._evaluate_line(diag, player_val)
-        
-        # Evaluate anti-diagonal lines (top-right to bottom-left)
-        for start_col in range(4, cols):
-            diag = []
-            r, c = 0, start_col
-            while r < rows and c >= 0:
-                diag.append(board[r][c])
-                r += 1
-                c -= 1
-            score += AIPlayer._evaluate_line(diag, player_val)
-        for start_row in range(1, rows - 4):
-            diag = []
-            r, c = start_row, cols - 1
-            while r < rows and c >= 0:
-                diag.append(board[r][c])
-                r += 1
-                c -= 1
-            score += AIPlayer._evaluate_line(diag, player_val)
-        
-        return score
+        if bb.rules is not None and bb.rules.blocked_ends:
+            return IncrementalEvaluator(bb, AIPlayer.BLOCKED_LINE_SCORER).totals[player_val]
+        return AIPlayer.LINE_SCORER.score_counts(bb.window_counts(player_val, 5))
 
     @staticmethod
     def _evaluate_line(line, player_val):
-        """Evaluate all 5-cell windows within a given line."""
+        """
+        Evaluate all 5-cell windows within a given line.
+        
+        Reference cell-by-cell scorer; `_evaluate_role` gives the same total
+        over a whole board.
+        """
         if len(line) < 5:
             return 0
         score = 0
@@ -631,52 +848,16 @@ class AIPlayer:
         """
         Evaluate a 5-cell window and return score.
         
+        One lookup in the precomputed pattern table (see
+        evaluator.build_window_table) instead of counting and branching.
+        
         Args:
             window: List of 5 cell values
+            before: Cell value before the window (None past the edge)
+            after: Cell value after the window (None past the edge)
             player_val: Player to evaluate (1 or 2)
         
         Returns:
             Score for this window
         """
-        score = 0
-        opp_val = 1 if player_val == 2 else 2
-        
-        player_count = window.count(player_val)
-        opp_count = window.count(opp_val)
-        
-        # Mixed windows are neutral
-        if player_count > 0 and opp_count > 0:
-            return 0
-        
-        if player_count == 0:
-            return 0
-        
-        # Determine how many ends are open (empty)
-        open_ends = 0
-        if before == 0:
-            open_ends += 1
-        if after == 0:
-            open_ends += 1
-        
-        # Assign score based on pattern
-        if player_count == 5:
-            score += AIPlayer.SCORES['WIN']
-        elif player_count == 4:
-            if open_ends == 2:
-                score += AIPlayer.SCORES['OPEN_4']
-            elif open_ends == 1:
-                score += AIPlayer.SCORES['BLOCKED_4']
-        elif player_count == 3:
-            if open_ends == 2:
-                score += AIPlayer.SCORES['OPEN_3']
-            elif open_ends == 1:
-                score += AIPlayer.SCORES['BLOCKED_3']
-        elif player_count == 2:
-            if open_ends == 2:
-                score += AIPlayer.SCORES['OPEN_2']
-            elif open_ends == 1:
-                score += AIPlayer.SCORES['BLOCKED_2']
-        elif player_count == 1 and open_ends == 2:
-            score += 5  # Encourage extending isolated stones
-        
-        return score
+        return AIPlayer.LINE_SCORER.window_score(before, window, after, player_val)
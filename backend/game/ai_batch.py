@@ -0,0 +1,190 @@
+"""
+Batch AI moves and headless self-play.
+
+solve_batch() answers many (board, game_type, difficulty) requests at once,
+spread over a pool of worker processes; play_games() plays whole games
+between two difficulty levels with GameEngine and reports win rates and
+move throughput. Neither needs the socket server, so strength regression
+checks and offline tools (build_opening_book.py, self_play.py) use them
+directly.
+
+Workers use the 'spawn' start method: the launching script must guard its
+entry point with `if __name__ == '__main__'`. The pool is not meant for the
+eventlet-patched server process; live games go through game.ai_executor.
+"""
+import multiprocessing
+import os
+import random
+import time
+
+from config import GAME_CONFIG
+from game.ai import AIPlayer
+from game.ai_executor import decode_board, encode_board
+from game.engine import GameEngine
+from game.rules import game_family
+from game.search_context import SearchContext
+
+
+def swap_colors(board):
+    """Board seen from player 1, so the AI (always player 2) can play for it."""
+    return [[(3 - cell) if cell else 0 for cell in row] for row in board]
+
+
+def _pool(workers):
+    # Imported here: loading the process pool machinery into the
+    # eventlet-patched server would disturb the AI executor's pipes
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def _default_workers(jobs, workers):
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, jobs))
+
+
+def _solve_one(request):
+    game_type, difficulty, player, rows, cols, cells = request
+    board = decode_board(cells, rows, cols)
+    if player == 1:
+        board = swap_colors(board)
+    return AIPlayer.get_ai_move_with_stats(board, game_type, difficulty)
+
+
+def solve_batch(requests, workers=None):
+    """
+    Compute AI moves for many independent positions.
+
+    Args:
+        requests: Iterable of (board, game_type, difficulty) or
+            (board, game_type, difficulty, player) tuples; player defaults
+            to 2, the side the AI plays in live games
+        workers: Worker processes (default: one per core); 1 solves in this
+            process
+
+    Returns:
+        List of (move, SearchStats) tuples aligned with `requests`
+    """
+    jobs = []
+    for request in requests:
+        board, game_type, difficulty = request[:3]
+        player = request[3] if len(request) > 3 else 2
+        jobs.append((game_type, difficulty, player, len(board), len(board[0]), encode_board(board)))
+    if not jobs:
+        return []
+
+    workers = _default_workers(len(jobs), workers)
+    if workers == 1:
+        return [_solve_one(job) for job in jobs]
+    with _pool(workers) as pool:
+        return list(pool.map(_solve_one, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+
+def play_game(game_type, first, second, seed=None):
+    """
+    Play one full game between two AI difficulty levels.
+
+    Args:
+        game_type: A GAME_CONFIG key
+        first: Difficulty playing as player 1 (moves first)
+        second: Difficulty playing as player 2
+        seed: Seed for the random choices of easy/medium
+
+    Returns:
+        Dict with 'winner' (1, 2 or 'draw'), 'moves', and 'think_ms'
+        (AI time per player)
+    """
+    if seed is not None:
+        random.seed(seed)
+    board = GameEngine.create_board(game_type)
+    difficulties = {1: first, 2: second}
+    contexts = {1: SearchContext(), 2: SearchContext()} if game_family(game_type) == 'caro' else {1: None, 2: None}
+    think_ms = {1: 0.0, 2: 0.0}
+    player = 1
+    moves = 0
+    winner = 0
+    while not winner:
+        view = board if player == 2 else swap_colors(board)
+        move, stats = AIPlayer.get_ai_move_with_stats(view, game_type, difficulties[player], contexts[player])
+        think_ms[player] += stats.elapsed_ms
+        if move is None or not GameEngine.apply_move(board, move[0], move[1], player):
+            # The AI had no legal move: only possible on a full board
+            winner = 'draw'
+            break
+        moves += 1
+        winner = GameEngine.check_winner(board, game_type, {'r': move[0], 'c': move[1]}, moves)[0]
+        player = 3 - player
+    return {'winner': winner, 'moves': moves, 'think_ms': think_ms}
+
+
+def _play_one(args):
+    return play_game(*args)
+
+
+def play_games(games, game_type, difficulty_a, difficulty_b, workers=None, seed=0):
+    """
+    Play a match between two difficulty levels, alternating who moves first.
+
+    Args:
+        games: Number of games
+        game_type: A GAME_CONFIG key
+        difficulty_a, difficulty_b: The two sides ('easy', 'medium', 'hard')
+        workers: Worker processes (default: one per core); 1 plays in this
+            process
+        seed: Base seed; game i uses seed + i
+
+    Returns:
+        Dict with per-side wins and win rates, draws, total moves, moves per
+        second (wall clock) and average AI time per move of each side
+    """
+    if game_type not in GAME_CONFIG:
+        raise ValueError(f"Unknown game type: {game_type}")
+    # Side A moves first in even games, side B in odd ones
+    jobs = [
+        (game_type, difficulty_a, difficulty_b, seed + i) if i % 2 == 0
+        else (game_type, difficulty_b, difficulty_a, seed + i)
+        for i in range(games)
+    ]
+
+    started = time.perf_counter()
+    workers = _default_workers(len(jobs), workers)
+    if workers <= 1:
+        results = [_play_one(job) for job in jobs]
+    else:
+        with _pool(workers) as pool:
+            results = list(pool.map(_play_one, jobs))
+    elapsed = time.perf_counter() - started
+
+    wins = {'a': 0, 'b': 0}
+    think_ms = {'a': 0.0, 'b': 0.0}
+    side_moves = {'a': 0, 'b': 0}
+    draws = 0
+    for i, result in enumerate(results):
+        # Player number -> side for this game
+        sides = {1: 'a', 2: 'b'} if i % 2 == 0 else {1: 'b', 2: 'a'}
+        if result['winner'] == 'draw':
+            draws += 1
+        else:
+            wins[sides[result['winner']]] += 1
+        for player, side in sides.items():
+            think_ms[side] += result['think_ms'][player]
+            # Player 1 makes the odd-numbered moves
+            side_moves[side] += (result['moves'] + (player == 1)) // 2
+
+    total_moves = sum(result['moves'] for result in results)
+    return {
+        'game_type': game_type,
+        'games': games,
+        'difficulty_a': difficulty_a,
+        'difficulty_b': difficulty_b,
+        'wins_a': wins['a'],
+        'wins_b': wins['b'],
+        'draws': draws,
+        'win_rate_a': wins['a'] / games if games else 0.0,
+        'win_rate_b': wins['b'] / games if games else 0.0,
+        'moves': total_moves,
+        'elapsed_s': elapsed,
+        'moves_per_second': total_moves / elapsed if elapsed else 0.0,
+        'avg_move_ms_a': think_ms['a'] / side_moves['a'] if side_moves['a'] else 0.0,
+        'avg_move_ms_b': think_ms['b'] / side_moves['b'] if side_moves['b'] else 0.0,
+    }
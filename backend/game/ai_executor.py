@@ -0,0 +1,453 @@
+"""
+AI executors: run bot move searches off the eventlet hub.
+
+The Caro search is CPU-bound; called directly from a socket handler it
+blocks the single eventlet hub and freezes every room on the worker. An
+executor runs it elsewhere and only blocks the calling green thread:
+
+- 'inline':  in the calling green thread (tests, debugging)
+- 'thread':  in an eventlet tpool native thread (shares the GIL)
+- 'process': in a pool of spawned worker processes (true parallelism)
+
+Boards reach worker processes through a BoardSlab: a shared-memory block
+with one fixed-size slot per worker, holding the position as one byte per
+cell. The parent writes the board into the worker's slot and sends only a
+small header; the worker reads the cells in place and answers with the
+move. Each worker keeps a small LRU of per-room SearchContexts so search
+caches survive across the bot's turns when a room lands on the same
+worker again. Ponder jobs
+(game.ponder) run on a fork of the room's context and are tracked apart
+from the room's real move, so neither cancels the other. Each slot also
+has a stop byte: cancelling a job (undo, timeout, game over, or a ponder
+guess that missed) sets it, and the worker's search gives up at its next
+node instead of holding the worker for a position nobody will play.
+
+Workers use the 'spawn' start method, so (as usual for multiprocessing) the
+launching script must guard its entry point with `if __name__ == '__main__'`;
+app.py and gunicorn already do.
+"""
+import multiprocessing
+from collections import OrderedDict
+from multiprocessing import shared_memory
+
+from config import AI_CONFIG, GAME_CONFIG
+from game.ai import AIPlayer
+from game.rules import game_family
+from game.search_context import SearchContext
+from game.search_stats import AI_STATS
+
+
+class AIExecutorBusy(Exception):
+    """Raised when the executor already holds its maximum of pending jobs."""
+
+
+class _Job:
+    """Cancellation token for one submitted move computation."""
+
+    __slots__ = ('cancelled', 'ponder', 'slot')
+
+    def __init__(self, ponder=False):
+        self.cancelled = False
+        self.ponder = ponder
+        self.slot = None  # BoardSlab slot of the worker running it
+
+
+def encode_board(board):
+    """Pack a 2D list board into bytes (one byte per cell, row-major)."""
+    return bytes(cell for row in board for cell in row)
+
+
+def decode_board(data, rows, cols):
+    """Unpack bytes produced by encode_board into a 2D list board."""
+    return [list(data[r * cols:(r + 1) * cols]) for r in range(rows)]
+
+
+class BoardSlab:
+    """
+    Boards in shared memory: `slots` slots of `slot_size` bytes, each holding
+    one board as encode_board lays it out, followed by one stop byte per slot.
+
+    The creating process owns the block and unlinks it in unlink(); other
+    processes attach to it by name.
+    """
+
+    def __init__(self, slots, slot_size, name=None):
+        self.slots = slots
+        self.slot_size = slot_size
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=slots * (slot_size + 1))
+        else:
+            # Spawned workers share the owner's resource tracker, so the
+            # block stays registered once and is freed by the owner
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+
+    def fits(self, board):
+        """True if the board fits in one slot."""
+        return len(board) * len(board[0]) <= self.slot_size
+
+    def write(self, slot, board):
+        """Store a 2D list board in a slot."""
+        buf = self.shm.buf
+        offset = slot * self.slot_size
+        for row in board:
+            end = offset + len(row)
+            buf[offset:end] = bytes(row)
+            offset = end
+
+    def read(self, slot, rows, cols):
+        """2D list board stored in a slot."""
+        offset = slot * self.slot_size
+        data = self.shm.buf[offset:offset + rows * cols]
+        try:
+            return decode_board(data, rows, cols)
+        finally:
+            data.release()
+
+    def set_stop(self, slot, stopped):
+        """Set or clear the stop byte of a slot."""
+        self.shm.buf[self.slots * self.slot_size + slot] = 1 if stopped else 0
+
+    def stop_requested(self, slot):
+        """True if the stop byte of a slot is set."""
+        return self.shm.buf[self.slots * self.slot_size + slot] != 0
+
+    def close(self):
+        """Detach from the block."""
+        self.shm.close()
+
+    def unlink(self):
+        """Detach and free the block (owner only)."""
+        self.shm.close()
+        self.shm.unlink()
+
+
+def board_slot_size():
+    """Bytes needed for the largest configured board."""
+    return max(config['rows'] * config['cols'] for config in GAME_CONFIG.values())
+
+
+class AIExecutor:
+    """Base executor: bounded pending jobs and per-room cancellation."""
+
+    # Searches run in this process, so they use the room's SearchContext
+    # (worker processes keep their own)
+    in_process = True
+
+    def __init__(self, max_pending=64):
+        self.max_pending = max_pending
+        self._pending = 0
+        self._active = {}
+
+    def compute(self, room_id, board, game_type, difficulty, context=None, ponder=False):
+        """
+        Compute the bot's move for a room, blocking only the calling green thread.
+
+        Args:
+            room_id: Room the move is for (cancellation key)
+            board: 2D list board, bot is player 2
+            game_type: 'tic-tac-toe' or 'caro'
+            difficulty: 'easy', 'medium', or 'hard'
+            context: SearchContext of the room (used by in-process backends)
+            ponder: Speculative search while the human thinks: it is not
+                cancelled by (and does not cancel) the room's real move,
+                and its statistics are not recorded
+
+        Returns:
+            Tuple (r, c), or None if the job was cancelled meanwhile
+
+        Raises:
+            AIExecutorBusy: too many jobs are already pending
+        """
+        if self._pending >= self.max_pending:
+            raise AIExecutorBusy(f'{self._pending} AI jobs pending')
+
+        job = _Job(ponder)
+        key = ('ponder', room_id) if ponder else room_id
+        previous = self._active.get(key)
+        if previous is not None:
+            self._cancel_job(previous)  # a newer request supersedes it
+        self._active[key] = job
+        self._pending += 1
+        try:
+            move, stats = self._run(job, room_id, board, game_type, difficulty, context)
+        finally:
+            self._pending -= 1
+            if self._active.get(key) is job:
+                del self._active[key]
+        if stats is not None and not ponder:
+            AI_STATS.record(stats, board)
+        return None if job.cancelled else move
+
+    def cancel(self, room_id, ponder=False):
+        """
+        Discard the result of any move being computed for `room_id`.
+
+        Args:
+            room_id: Room of the job
+            ponder: Cancel the room's ponder job instead of its real move
+        """
+        job = self._active.pop(('ponder', room_id) if ponder else room_id, None)
+        if job is not None:
+            self._cancel_job(job)
+
+    def _cancel_job(self, job):
+        """Mark a job cancelled (and stop its search where the backend can)."""
+        job.cancelled = True
+
+    @property
+    def pending(self):
+        """Number of jobs waiting or running."""
+        return self._pending
+
+    def shutdown(self):
+        """Release executor resources."""
+
+    def _run(self, job, room_id, board, game_type, difficulty, context):
+        """Compute the move; returns (move, SearchStats or None)."""
+        raise NotImplementedError
+
+
+class InlineAIExecutor(AIExecutor):
+    """Runs the search directly in the calling green thread."""
+
+    def _run(self, job, room_id, board, game_type, difficulty, context):
+        return AIPlayer.get_ai_move_with_stats(board, game_type, difficulty, context)
+
+
+class ThreadAIExecutor(AIExecutor):
+    """Runs the search in an eventlet tpool native thread."""
+
+    def _run(self, job, room_id, board, game_type, difficulty, context):
+        from eventlet import tpool
+        # Copy so the hub can keep serving the room while the thread reads it
+        snapshot = [row[:] for row in board]
+        return tpool.execute(AIPlayer.get_ai_move_with_stats, snapshot, game_type, difficulty, context)
+
+
+# ----- Worker process side -----
+
+class _SlotStoppedContext(SearchContext):
+    """
+    Room context inside a worker: `stopped` reads the worker's stop byte,
+    which the parent sets when the job is cancelled, so real and ponder
+    searches both give up early. Forks (ponder jobs) share the table and
+    threat memo, as SearchContext.fork does.
+    """
+
+    def __init__(self, slab, slot, parent=None):
+        self._slab = slab
+        self._slot = slot
+        super().__init__(tt=parent.tt if parent is not None else None)
+        if parent is not None:
+            self.threats.memo = parent.threats.memo
+
+    @property
+    def stopped(self):
+        return self._slab.stop_requested(self._slot)
+
+    @stopped.setter
+    def stopped(self, value):
+        # Only the parent clears the byte, when it hands out the next job
+        if value:
+            self._slab.set_stop(self._slot, True)
+
+    def fork(self):
+        return _SlotStoppedContext(self._slab, self._slot, parent=self)
+
+
+_worker_contexts = OrderedDict()
+
+
+def _worker_context(room_id, max_rooms, slab=None, slot=0):
+    """
+    Per-room SearchContext inside a worker process (LRU), stopped through
+    the worker's slot of `slab` when there is one.
+    """
+    context = _worker_contexts.get(room_id)
+    if context is None:
+        context = _SlotStoppedContext(slab, slot) if slab is not None else SearchContext()
+        _worker_contexts[room_id] = context
+        if len(_worker_contexts) > max_rooms:
+            _worker_contexts.popitem(last=False)
+    else:
+        _worker_contexts.move_to_end(room_id)
+    return context
+
+
+def worker_loop(conn, max_rooms, slab_name=None, slab_slots=0, slot_size=0, slot=0):
+    """
+    Entry point of an AI worker process.
+
+    Receives (room_id, game_type, difficulty, rows, cols, cells, ponder)
+    tuples and answers each with (move, SearchStats), or (None, None) on
+    error. `cells` is None when the board was written to the worker's slot
+    of the shared BoardSlab. Exits on EOF or None.
+    """
+    slab = BoardSlab(slab_slots, slot_size, slab_name) if slab_name else None
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        room_id, game_type, difficulty, rows, cols, cells, ponder = message
+        if cells is None:
+            board = slab.read(slot, rows, cols)
+        else:
+            board = decode_board(cells, rows, cols)
+        context = None
+        if game_family(game_type) == 'caro':
+            context = _worker_context(room_id, max_rooms, slab, slot)
+            if ponder:
+                context = context.fork()
+        try:
+            result = AIPlayer.get_ai_move_with_stats(board, game_type, difficulty, context)
+        except Exception as e:
+            print(f"AI worker error: {e}")
+            result = (None, None)
+        conn.send(result)
+    if slab is not None:
+        slab.close()
+
+
+class ProcessPoolAIExecutor(AIExecutor):
+    """
+    Runs the search in spawned worker processes.
+
+    Each worker owns one pipe and one BoardSlab slot. A job waits (green)
+    for an idle worker, writes the board into its slot, sends the header
+    and waits (green) for the reply, so the hub keeps serving other rooms
+    the whole time.
+    """
+
+    in_process = False
+
+    def __init__(self, workers=2, max_pending=64, max_rooms_per_worker=128):
+        super().__init__(max_pending)
+        from eventlet.queue import LightQueue
+        self.workers = workers
+        self.max_rooms_per_worker = max_rooms_per_worker
+        self._mp = multiprocessing.get_context('spawn')
+        self._idle = LightQueue()
+        self._processes = {}
+        self._slots = {}
+        self._slab = None
+        self._started = False
+
+    def _spawn_worker(self, slot):
+        parent_conn, child_conn = self._mp.Pipe()
+        slab = self._slab
+        process = self._mp.Process(
+            target=worker_loop,
+            args=(child_conn, self.max_rooms_per_worker, slab.name, slab.slots, slab.slot_size, slot),
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        self._processes[parent_conn] = process
+        self._slots[parent_conn] = slot
+        self._idle.put(parent_conn)
+
+    def _ensure_started(self):
+        # Workers start lazily so importing the app never forks processes
+        if not self._started:
+            self._started = True
+            self._slab = BoardSlab(self.workers, board_slot_size())
+            for slot in range(self.workers):
+                self._spawn_worker(slot)
+
+    def _run(self, job, room_id, board, game_type, difficulty, context):
+        self._ensure_started()
+        conn = self._idle.get()
+        if job.cancelled:
+            self._idle.put(conn)
+            return None, None
+        slot = self._slots[conn]
+        cells = None
+        if self._slab.fits(board):
+            self._slab.write(slot, board)
+        else:
+            cells = encode_board(board)
+        self._slab.set_stop(slot, False)
+        job.slot = slot
+        message = (room_id, game_type, difficulty, len(board), len(board[0]), cells, job.ponder)
+        try:
+            conn.send(message)
+            result = conn.recv()
+        except (EOFError, OSError) as e:
+            print(f"AI worker lost: {e}")
+            self._retire(conn)
+            self._spawn_worker(slot)
+            return None, None
+        finally:
+            job.slot = None
+        self._idle.put(conn)
+        return result
+
+    def _cancel_job(self, job):
+        super()._cancel_job(job)
+        if job.slot is not None and self._slab is not None:
+            self._slab.set_stop(job.slot, True)
+
+    def _retire(self, conn):
+        """Stop a worker; returns the slab slot it used."""
+        process = self._processes.pop(conn, None)
+        slot = self._slots.pop(conn, None)
+        conn.close()
+        if process is not None and process.is_alive():
+            process.terminate()
+        return slot
+
+    def shutdown(self):
+        """Stop every worker process."""
+        while not self._idle.empty():
+            conn = self._idle.get()
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            self._retire(conn)
+        for conn in list(self._processes):
+            self._retire(conn)
+        if self._slab is not None:
+            self._slab.unlink()
+            self._slab = None
+        self._started = False
+
+
+_BACKENDS = {
+    'inline': InlineAIExecutor,
+    'thread': ThreadAIExecutor,
+    'process': ProcessPoolAIExecutor,
+}
+
+_executor = None
+
+
+def create_ai_executor(settings=None):
+    """Build an executor from AI_CONFIG['executor']-style settings."""
+    settings = dict(settings or AI_CONFIG['executor'])
+    backend = settings.pop('backend', 'process')
+    executor_class = _BACKENDS.get(backend)
+    if executor_class is None:
+        raise ValueError(f"Unknown AI executor backend: {backend}")
+    if executor_class is not ProcessPoolAIExecutor:
+        settings.pop('workers', None)
+    return executor_class(**settings)
+
+
+def get_ai_executor():
+    """Return the process-wide AI executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = create_ai_executor()
+    return _executor
+
+
+def set_ai_executor(executor):
+    """Replace the process-wide AI executor (e.g. in tests); returns the old one."""
+    global _executor
+    previous, _executor = _executor, executor
+    return previous
@@ -0,0 +1,411 @@
+"""
+Bitboard board representation: one Python integer per player.
+
+Cell (r, c) maps to bit r * stride + c where stride = cols + 1. The extra
+padding column is never set, so runs along a row or a diagonal cannot wrap
+from one row into the next when the bitboards are shifted.
+"""
+import random
+from config import DIRECTIONS
+
+# Lines shorter than one scoring window never contribute a pattern
+LINE_MIN_LENGTH = 5
+
+# Fixed seed so every process derives the same Zobrist keys for a shape
+ZOBRIST_SEED = 0x5EED_CA20
+
+
+class BoardGeometry:
+    """Precomputed shifts and masks for one board shape (built once, cached)."""
+
+    _cache = {}
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.stride = cols + 1
+        self.size = rows * self.stride
+        # coords[bit index] -> (r, c), so decoding a mask needs no divmod
+        self.coords = [divmod(idx, self.stride) for idx in range(self.size)]
+
+        # Zobrist keys: zobrist[player][bit index], plus a side-to-move key
+        rng = random.Random(ZOBRIST_SEED ^ (rows << 16 | cols))
+        self.zobrist = [
+            None,
+            [rng.getrandbits(64) for _ in range(self.size)],
+            [rng.getrandbits(64) for _ in range(self.size)],
+        ]
+        self.zobrist_side = rng.getrandbits(64)
+
+        row_mask = (1 << cols) - 1
+        full = 0
+        for r in range(rows):
+            full |= row_mask << (r * self.stride)
+        self.full_mask = full
+
+        # Bit shift for one step along each of the four DIRECTIONS
+        self.shifts = [dr * self.stride + dc for dr, dc in DIRECTIONS]
+
+        # col_masks[j]: cells whose column stays on the board after moving j columns
+        self.col_masks = {}
+        for j in range(-cols + 1, cols):
+            lo, hi = max(0, -j), min(cols, cols - j)
+            mask = 0
+            if lo < hi:
+                segment = ((1 << (hi - lo)) - 1) << lo
+                for r in range(rows):
+                    mask |= segment << (r * self.stride)
+            self.col_masks[j] = mask
+
+        # Every line of at least LINE_MIN_LENGTH cells along each direction, as
+        # tuples of bit indexes, and for each cell its (line_id, position) pairs
+        self.lines = []
+        self.cell_lines = [() for _ in range(self.size)]
+        for dr, dc in DIRECTIONS:
+            for r in range(rows):
+                for c in range(cols):
+                    if 0 <= r - dr < rows and 0 <= c - dc < cols:
+                        continue  # not the first cell of its line
+                    cells = []
+                    nr, nc = r, c
+                    while 0 <= nr < rows and 0 <= nc < cols:
+                        cells.append(nr * self.stride + nc)
+                        nr += dr
+                        nc += dc
+                    if len(cells) < LINE_MIN_LENGTH:
+                        continue
+                    line_id = len(self.lines)
+                    self.lines.append(tuple(cells))
+                    for pos, idx in enumerate(cells):
+                        self.cell_lines[idx] += ((line_id, pos),)
+
+        self._neighborhoods = {}
+
+    def neighborhoods(self, radius):
+        """
+        Per-cell neighbourhood masks for one radius (built once, cached).
+
+        Returns:
+            List indexed by bit index: mask of the on-board cells within
+            Chebyshev distance `radius` of that cell, the cell itself excluded
+        """
+        masks = self._neighborhoods.get(radius)
+        if masks is None:
+            masks = [0] * self.size
+            for r in range(self.rows):
+                for c in range(self.cols):
+                    mask = 0
+                    for nr in range(max(0, r - radius), min(self.rows, r + radius + 1)):
+                        for nc in range(max(0, c - radius), min(self.cols, c + radius + 1)):
+                            mask |= 1 << (nr * self.stride + nc)
+                    idx = r * self.stride + c
+                    masks[idx] = mask & ~(1 << idx)
+            self._neighborhoods[radius] = masks
+        return masks
+
+    @classmethod
+    def get(cls, rows, cols):
+        """Return the shared geometry for a rows x cols board."""
+        key = (rows, cols)
+        geometry = cls._cache.get(key)
+        if geometry is None:
+            geometry = cls(rows, cols)
+            cls._cache[key] = geometry
+        return geometry
+
+
+class BitBoard:
+    """Compact board holding one integer bitboard per player."""
+
+    __slots__ = ('rows', 'cols', 'stride', 'geometry', 'bits', 'stones', 'key', 'rules')
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.geometry = BoardGeometry.get(rows, cols)
+        self.stride = self.geometry.stride
+        self.bits = [0, 0, 0]  # indexed by player number, slot 0 unused
+        self.stones = 0
+        self.key = 0  # Zobrist hash, updated on every place/remove
+        # GameRules of the variant (game.rules), or None for five in a row
+        self.rules = None
+
+    @classmethod
+    def from_grid(cls, grid, rules=None):
+        """Build a bitboard from a 2D list board (0 empty, 1/2 players)."""
+        board = cls(len(grid), len(grid[0]))
+        board.rules = rules
+        stride = board.stride
+        bits = board.bits
+        zobrist = board.geometry.zobrist
+        for r, row in enumerate(grid):
+            base = r * stride
+            for c, cell in enumerate(row):
+                if cell:
+                    bits[cell] |= 1 << (base + c)
+                    board.key ^= zobrist[cell][base + c]
+                    board.stones += 1
+        return board
+
+    def sync(self, grid):
+        """
+        Place and remove stones until this board matches a 2D list board.
+
+        Goes through place/remove, so subclasses keeping incremental state
+        stay consistent; cheap when the boards differ by a few moves.
+        """
+        stride = self.stride
+        target = [0, 0, 0]
+        for r, row in enumerate(grid):
+            base = r * stride
+            for c, cell in enumerate(row):
+                if cell:
+                    target[cell] |= 1 << (base + c)
+        for player in (1, 2):
+            for r, c in self.cell_list(self.bits[player] & ~target[player]):
+                self.remove(r, c)
+        for player in (1, 2):
+            for r, c in self.cell_list(target[player] & ~self.bits[player]):
+                self.place(r, c, player)
+
+    def to_grid(self):
+        """Expand back into a 2D list board."""
+        grid = [[0] * self.cols for _ in range(self.rows)]
+        for player in (1, 2):
+            for r, c in self.cells(self.bits[player]):
+                grid[r][c] = player
+        return grid
+
+    def copy(self):
+        """Return an independent copy of this board."""
+        clone = BitBoard(self.rows, self.cols)
+        clone.bits = list(self.bits)
+        clone.stones = self.stones
+        clone.key = self.key
+        clone.rules = self.rules
+        return clone
+
+    # ----- Cell access -----
+
+    def index(self, r, c):
+        """Bit index of cell (r, c)."""
+        return r * self.stride + c
+
+    def in_bounds(self, r, c):
+        """True if (r, c) lies on the board."""
+        return 0 <= r < self.rows and 0 <= c < self.cols
+
+    def get(self, r, c):
+        """Return 0, 1 or 2 for the cell at (r, c)."""
+        bit = 1 << (r * self.stride + c)
+        if self.bits[1] & bit:
+            return 1
+        if self.bits[2] & bit:
+            return 2
+        return 0
+
+    def place(self, r, c, player):
+        """Put `player`'s stone on an empty cell."""
+        idx = r * self.stride + c
+        self.bits[player] |= 1 << idx
+        self.key ^= self.geometry.zobrist[player][idx]
+        self.stones += 1
+
+    def remove(self, r, c):
+        """Clear the cell at (r, c)."""
+        idx = r * self.stride + c
+        bit = 1 << idx
+        for player in (1, 2):
+            if self.bits[player] & bit:
+                self.bits[player] &= ~bit
+                self.key ^= self.geometry.zobrist[player][idx]
+                self.stones -= 1
+                return
+
+    @property
+    def occupied(self):
+        """Bitboard of every stone on the board."""
+        return self.bits[1] | self.bits[2]
+
+    @property
+    def empty(self):
+        """Bitboard of every empty on-board cell."""
+        return self.geometry.full_mask & ~(self.bits[1] | self.bits[2])
+
+    def is_full(self):
+        """True when no empty cell is left."""
+        return self.stones == self.rows * self.cols
+
+    def cells(self, mask):
+        """Yield (r, c) for every set bit of `mask`, in row-major order."""
+        coords = self.geometry.coords
+        while mask:
+            low = mask & -mask
+            yield coords[low.bit_length() - 1]
+            mask ^= low
+
+    def cell_list(self, mask):
+        """List of (r, c) for every set bit of `mask`, in row-major order."""
+        coords = self.geometry.coords
+        cells = []
+        while mask:
+            low = mask & -mask
+            cells.append(coords[low.bit_length() - 1])
+            mask ^= low
+        return cells
+
+    # ----- Lines and runs -----
+
+    def count_direction(self, r, c, dr, dc, player):
+        """Count consecutive `player` stones from (r, c) exclusive along (dr, dc)."""
+        bits = self.bits[player]
+        step = dr * self.stride + dc
+        i = r * self.stride + c + step
+        count = 0
+        while i >= 0 and (bits >> i) & 1:
+            count += 1
+            i += step
+        return count
+
+    def winning_line(self, r, c, player, win_length=5):
+        """
+        Return the run through (r, c) of at least `win_length` stones.
+
+        Returns:
+            List of (r, c) tuples, or None if no such run exists
+        """
+        for dr, dc in DIRECTIONS:
+            forward = min(self.count_direction(r, c, dr, dc, player), win_length - 1)
+            backward = min(self.count_direction(r, c, -dr, -dc, player), win_length - 1)
+            if 1 + forward + backward >= win_length:
+                line = [(r, c)]
+                line.extend((r + dr * k, c + dc * k) for k in range(1, forward + 1))
+                line.extend((r - dr * k, c - dc * k) for k in range(1, backward + 1))
+                return line
+        return None
+
+    def is_win_at(self, r, c, player, win_length=5):
+        """True if the stone at (r, c) is part of a run of `win_length`."""
+        for dr, dc in DIRECTIONS:
+            count = 1 + self.count_direction(r, c, dr, dc, player)
+            if count >= win_length:
+                return True
+            count += self.count_direction(r, c, -dr, -dc, player)
+            if count >= win_length:
+                return True
+        return False
+
+    def wins_at(self, r, c, player):
+        """True if the stone at (r, c) wins under this board's rules."""
+        if self.rules is None:
+            return self.is_win_at(r, c, player, 5)
+        return self.rules.is_win_at(self, r, c, player)
+
+    def has_run(self, player, length=5):
+        """True if `player` has `length` stones in a row anywhere."""
+        bits = self.bits[player]
+        for d in self.geometry.shifts:
+            run = bits
+            for _ in range(length - 1):
+                run &= run >> d
+                if not run:
+                    break
+            else:
+                return True
+        return False
+
+    def neighbor_mask(self, radius):
+        """Empty cells within Chebyshev distance `radius` of any stone."""
+        occupied = self.bits[1] | self.bits[2]
+        if not occupied:
+            return 0
+        geometry = self.geometry
+        horizontal = occupied
+        for j in range(1, radius + 1):
+            horizontal |= (occupied & geometry.col_masks[j]) << j
+            horizontal |= (occupied & geometry.col_masks[-j]) >> j
+        grown = horizontal
+        for i in range(1, radius + 1):
+            grown |= horizontal << (i * self.stride)
+            grown |= horizontal >> (i * self.stride)
+        return grown & geometry.full_mask & ~occupied
+
+    def window_counts(self, player, length=5):
+        """
+        Count `length`-cell windows that hold only `player`'s stones.
+
+        Args:
+            player: Player number (1 or 2)
+            length: Window length
+
+        Returns:
+            counts[stones][open_ends] as a list of lists (see count_windows)
+        """
+        geometry = self.geometry
+        return count_windows(
+            self.bits[player], self.bits[3 - player],
+            geometry.full_mask, geometry.shifts, length
+        )
+
+
+def count_windows(own, opponent, full_mask, shifts, length=5):
+    """
+    Classify every window along `shifts` that holds only `own` stones.
+
+    A window is `length` cells starting at some bit i and stepping by d for
+    each shift d. Windows that leave `full_mask` or contain an opponent stone
+    are skipped; the rest are counted by number of stones and by how many of
+    the two cells just outside the window are empty. Works for a whole board
+    (the four direction shifts) or for a single line packed into bits 0..n-1
+    (shifts == (1,)).
+
+    Args:
+        own: Bitboard of the scored player's stones
+        opponent: Bitboard of the other player's stones
+        full_mask: Bitboard of every on-board cell
+        shifts: Bit distance of one step along each direction
+        length: Window length
+
+    Returns:
+        counts[stones][open_ends] as a list of lists
+    """
+    free = full_mask & ~opponent
+    empty = free & ~own
+    nbits = length.bit_length()
+    counts = [[0, 0, 0] for _ in range(length + 1)]
+
+    for d in shifts:
+        # Window starts whose cells are all on the board and free of the opponent
+        windows = free
+        for k in range(1, length):
+            windows &= free >> (k * d)
+        if not windows:
+            continue
+
+        # Bit-sliced per-start stone counter
+        counter = [0] * nbits
+        for k in range(length):
+            carry = (own >> (k * d)) & windows
+            for j in range(nbits):
+                if not carry:
+                    break
+                counter[j], carry = counter[j] ^ carry, counter[j] & carry
+
+        before = empty << d
+        after = empty >> (length * d)
+        both_open = before & after
+        one_open = before ^ after
+
+        for stones in range(1, length + 1):
+            mask = windows
+            for j in range(nbits):
+                mask &= counter[j] if (stones >> j) & 1 else ~counter[j]
+            if not mask:
+                continue
+            two = (mask & both_open).bit_count()
+            one = (mask & one_open).bit_count()
+            row = counts[stones]
+            row[2] += two
+            row[1] += one
+            row[0] += mask.bit_count() - one - two
+    return counts
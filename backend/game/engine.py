@@ -1,7 +1,9 @@
 """
 Game engine: Board creation, winner checking, game state management.
 """
-from config import GAME_CONFIG, DIRECTIONS
+from config import GAME_CONFIG
+from game.bitboard import BitBoard
+from game.rules import get_rules
 
 
 class GameEngine:
@@ -13,7 +15,7 @@ class GameEngine:
         Create an empty game board.
         
         Args:
-            game_type: 'tic-tac-toe' or 'caro'
+            game_type: Key of GAME_CONFIG ('tic-tac-toe', 'caro', ...)
         
         Returns:
             2D list representing the game board
@@ -25,16 +27,41 @@ class GameEngine:
         rows = config['rows']
         cols = config['cols']
         return [[0 for _ in range(cols)] for _ in range(rows)]
+
+    @staticmethod
+    def create_bitboard(game_type):
+        """
+        Create an empty compact board (one integer bitboard per player).
+        
+        Every GameEngine method accepts either representation.
+        
+        Args:
+            game_type: Key of GAME_CONFIG ('tic-tac-toe', 'caro', ...)
+        
+        Returns:
+            BitBoard carrying the variant's rules, or None for an unknown
+            game type
+        """
+        rules = get_rules(game_type)
+        if rules is None:
+            return None
+        return rules.create_bitboard()
     
     @staticmethod
-    def check_winner(board, game_type, last_move):
+    def check_winner(board, game_type, last_move, move_count=None):
         """
         Check if there's a winner after the last move.
         
+        The variant's win length and blocked-ends rule come from GAME_CONFIG.
+        Only the cells along the four lines through the last move are read.
+        
         Args:
             board: Current game board
-            game_type: 'tic-tac-toe' or 'caro'
+            game_type: Key of GAME_CONFIG ('tic-tac-toe', 'caro', ...)
             last_move: Dict with 'r' and 'c' keys for last move position
+            move_count: Stones on the board including the last move, if the
+                caller keeps a per-game counter; the draw check is then O(1)
+                instead of a scan of the whole board
         
         Returns:
             Tuple (winner, winning_line) where:
@@ -45,42 +72,16 @@ class GameEngine:
             return 0, None
         
         r, c = last_move['r'], last_move['c']
-        player = board[r][c]
-        
+        player = board.get(r, c) if isinstance(board, BitBoard) else board[r][c]
         if player == 0:
             return 0, None
         
-        rows = len(board)
-        cols = len(board[0])
-        win_len = GAME_CONFIG[game_type]['win_length']
-        
-        # Check all four directions
-        for dr, dc in DIRECTIONS:
-            line = [(r, c)]
-            
-            # Check forward
-            for i in range(1, win_len):
-                nr, nc = r + dr * i, c + dc * i
-                if 0 <= nr < rows and 0 <= nc < cols and board[nr][nc] == player:
-                    line.append((nr, nc))
-                else:
-                    break
-            
-            # Check backward
-            for i in range(1, win_len):
-                nr, nc = r - dr * i, c - dc * i
-                if 0 <= nr < rows and 0 <= nc < cols and board[nr][nc] == player:
-                    line.append((nr, nc))
-                else:
-                    break
-            
-            # Check if we have a winning line
-            if len(line) >= win_len:
-                return player, line
+        rules = get_rules(game_type)
+        line = rules.winning_line(board, r, c, player)
+        if line:
+            return player, line
         
-        # Check for draw (board full)
-        is_full = all(board[row][col] != 0 for row in range(rows) for col in range(cols))
-        if is_full:
+        if rules.is_draw(board, move_count):
             return 'draw', None
         
         return 0, None
@@ -98,6 +99,9 @@ class GameEngine:
         Returns:
             True if move is valid, False otherwise
         """
+        if isinstance(board, BitBoard):
+            return board.in_bounds(r, c) and board.get(r, c) == 0
+
         rows = len(board)
         cols = len(board[0])
         
@@ -123,6 +127,10 @@ class GameEngine:
         if not GameEngine.is_valid_move(board, r, c):
             return False
         
+        if isinstance(board, BitBoard):
+            board.place(r, c, player)
+            return True
+
         board[r][c] = player
         return True
 
@@ -139,6 +147,12 @@ class GameEngine:
         Returns:
             True if successful, False if invalid coordinates
         """
+        if isinstance(board, BitBoard):
+            if not board.in_bounds(r, c):
+                return False
+            board.remove(r, c)
+            return True
+
         rows = len(board)
         cols = len(board[0])
         
@@ -0,0 +1,212 @@
+"""
+Incremental pattern-score evaluator for the Caro search.
+
+The board score is the sum of independent per-line scores, so the evaluator
+keeps one score per row, column and diagonal and only rescores the four
+lines that cross a cell when a stone is placed or removed.
+"""
+from itertools import product
+
+# Cell code for the positions just past either end of a line
+OFF_BOARD = 3
+
+
+def encode_window(before, window, after):
+    """
+    Pack a window and its two end cells into a lookup-table index.
+
+    Args:
+        before: Cell value before the window, or None past the board edge
+        window: Cell values (0 empty, 1/2 players)
+        after: Cell value after the window, or None past the board edge
+
+    Returns:
+        Integer with two bits per cell, `before` most significant
+    """
+    code = OFF_BOARD if before is None else before
+    for cell in window:
+        code = (code << 2) | cell
+    return (code << 2) | (OFF_BOARD if after is None else after)
+
+
+def build_window_table(scores, window=5, blocked_ends=False):
+    """
+    Score every (before, window, after) state for both players.
+
+    A window scores for a player when it holds only that player's stones,
+    by stone count and by how many of the two end cells are empty, exactly
+    as AIPlayer._evaluate_window always has. With `blocked_ends` (Caro
+    rule), a full window between two opponent stones is not a win and
+    scores nothing.
+
+    Returns:
+        Tuple (player 1 scores, player 2 scores), lists indexed by
+        encode_window
+    """
+    by_pattern = {(window, ends): scores['WIN'] for ends in range(3)}
+    by_pattern.update({
+        (4, 2): scores['OPEN_4'], (4, 1): scores['BLOCKED_4'],
+        (3, 2): scores['OPEN_3'], (3, 1): scores['BLOCKED_3'],
+        (2, 2): scores['OPEN_2'], (2, 1): scores['BLOCKED_2'],
+        (1, 2): 5,  # Encourage extending isolated stones
+    })
+    size = 1 << (2 * (window + 2))
+    tables = (None, [0] * size, [0] * size)
+    end_values = (0, 1, 2, None)
+    for before, after in product(end_values, end_values):
+        open_ends = (before == 0) + (after == 0)
+        for cells in product((0, 1, 2), repeat=window):
+            code = encode_window(before, cells, after)
+            for player in (1, 2):
+                if (3 - player) in cells:
+                    continue  # mixed or opponent-only windows are neutral
+                stones = cells.count(player)
+                if stones == window and blocked_ends and before == after == 3 - player:
+                    continue
+                if stones:
+                    tables[player][code] = by_pattern.get((stones, open_ends), 0)
+    return tables[1], tables[2]
+
+
+class LineScorer:
+    """
+    Score the 5-cell windows of a single line, memoized by line contents.
+
+    Each window is one lookup in a table built at construction time (see
+    build_window_table); whole lines are then cached.
+    """
+
+    def __init__(self, scores, window=5, max_entries=1 << 18, blocked_ends=False):
+        self.scores = scores
+        self.window = window
+        self.max_entries = max_entries
+        self.blocked_ends = blocked_ends
+        self.tables = build_window_table(scores, window, blocked_ends)
+        self._cache = {}
+
+    def window_score(self, before, window, after, player):
+        """Score one window for `player` (see AIPlayer._evaluate_window)."""
+        return self.tables[player - 1][encode_window(before, window, after)]
+
+    def score_counts(self, counts):
+        """
+        Turn window counts into a pattern score.
+
+        Args:
+            counts: counts[stones][open_ends] as returned by count_windows
+
+        Returns:
+            Score using the same table as AIPlayer._evaluate_window
+        """
+        scores = self.scores
+        return (
+            sum(counts[5]) * scores['WIN']
+            + counts[4][2] * scores['OPEN_4'] + counts[4][1] * scores['BLOCKED_4']
+            + counts[3][2] * scores['OPEN_3'] + counts[3][1] * scores['BLOCKED_3']
+            + counts[2][2] * scores['OPEN_2'] + counts[2][1] * scores['BLOCKED_2']
+            + counts[1][2] * 5  # Encourage extending isolated stones
+        )
+
+    def score(self, p1_bits, p2_bits, length):
+        """
+        Score one line for both players.
+
+        Args:
+            p1_bits: Player 1 stones, bit i = i-th cell of the line
+            p2_bits: Player 2 stones, same layout
+            length: Number of cells in the line
+
+        Returns:
+            Tuple (player 1 score, player 2 score)
+        """
+        key = ((p1_bits << 32 | p2_bits) << 8) | length
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Slide a (before, window, after) code along the line, one lookup per window
+        table1, table2 = self.tables
+        span = self.window + 2
+        code_mask = (1 << (2 * span)) - 1
+        code = OFF_BOARD
+        s1 = s2 = 0
+        for i in range(length + 1):
+            if i == length:
+                cell = OFF_BOARD
+            elif (p1_bits >> i) & 1:
+                cell = 1
+            elif (p2_bits >> i) & 1:
+                cell = 2
+            else:
+                cell = 0
+            code = ((code << 2) | cell) & code_mask
+            if i >= span - 2:
+                s1 += table1[code]
+                s2 += table2[code]
+        result = (s1, s2)
+        if len(self._cache) >= self.max_entries:
+            self._cache.clear()
+        self._cache[key] = result
+        return result
+
+
+class IncrementalEvaluator:
+    """
+    Per-line pattern scores for a BitBoard, kept up to date move by move.
+
+    The caller reports every stone placed or removed; only the (at most four)
+    lines through that cell are rescored.
+    """
+
+    __slots__ = ('scorer', 'lengths', 'cell_lines', 'line_bits', 'line_scores', 'totals')
+
+    def __init__(self, bb, scorer):
+        geometry = bb.geometry
+        self.scorer = scorer
+        self.lengths = [len(cells) for cells in geometry.lines]
+        self.cell_lines = geometry.cell_lines
+        count = len(self.lengths)
+        self.line_bits = [None, [0] * count, [0] * count]
+        self.line_scores = [None, [0] * count, [0] * count]
+        self.totals = [0, 0, 0]
+
+        for player in (1, 2):
+            bits = self.line_bits[player]
+            for r, c in bb.cells(bb.bits[player]):
+                for line_id, pos in self.cell_lines[bb.index(r, c)]:
+                    bits[line_id] |= 1 << pos
+        for line_id in range(count):
+            self._rescore(line_id)
+
+    def _rescore(self, line_id):
+        s1, s2 = self.scorer.score(
+            self.line_bits[1][line_id], self.line_bits[2][line_id], self.lengths[line_id]
+        )
+        scores1, scores2 = self.line_scores[1], self.line_scores[2]
+        totals = self.totals
+        totals[1] += s1 - scores1[line_id]
+        totals[2] += s2 - scores2[line_id]
+        scores1[line_id] = s1
+        scores2[line_id] = s2
+
+    def place(self, idx, player):
+        """Record a stone of `player` at bit index `idx`."""
+        bits = self.line_bits[player]
+        for line_id, pos in self.cell_lines[idx]:
+            bits[line_id] |= 1 << pos
+            self._rescore(line_id)
+
+    def remove(self, idx, player):
+        """Record that `player`'s stone at bit index `idx` was taken back."""
+        bits = self.line_bits[player]
+        for line_id, pos in self.cell_lines[idx]:
+            bits[line_id] &= ~(1 << pos)
+            self._rescore(line_id)
+
+    def role_score(self, player):
+        """Total pattern score for `player`."""
+        return self.totals[player]
+
+    def score(self):
+        """Board score from the AI's side (player 2), as AIPlayer._evaluate_board."""
+        return self.totals[2] - (self.totals[1] * 2.0)
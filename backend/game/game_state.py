@@ -0,0 +1,104 @@
+"""
+State of one live game room.
+
+A GameState replaces the per-room dict the socket handlers used to keep.
+The board is the variant's BitBoard (two integers instead of a list of
+row lists), and the move history is an array of packed 16-bit moves
+instead of a list of dicts. Both are turned into the JSON shapes the
+client and the match history expect only at the socket edge, by grid(),
+last_move() and history_json().
+
+Every game_update a room sends bumps `seq`; `last_update` keeps the
+fields of the latest one so a full snapshot can be rebuilt for a client
+that lost track (see sockets.game).
+"""
+from array import array
+
+from game.engine import GameEngine
+
+
+class GameState:
+    """One room's game: board, turn, players and the bot's search state."""
+
+    __slots__ = ('game_type', 'mode', 'board', 'turn', 'winner', 'players', 'sids',
+                 'protocols', 'history', 'seq', 'last_update', 'difficulty',
+                 'ai_context', 'ai_ponder')
+
+    def __init__(self, game_type, mode, players, sids, protocols=('full', 'full'),
+                 difficulty=None, ai_context=None, ai_ponder=None):
+        """
+        Args:
+            game_type: Key of GAME_CONFIG
+            mode: 'ranked' or 'practice'
+            players: (player 1 user id, player 2 user id or 'AI')
+            sids: (player 1 socket id, player 2 socket id or 'ai')
+            protocols: game_update protocol of each player, 'full' or 'delta'
+            difficulty: Bot difficulty (practice only)
+            ai_context: SearchContext kept for the game's bot turns, or None
+            ai_ponder: Ponderer of the room, or None
+        """
+        self.game_type = game_type
+        self.mode = mode
+        self.board = GameEngine.create_bitboard(game_type)
+        self.turn = 1
+        self.winner = 0
+        # Indexed by player number, slot 0 unused
+        self.players = (None,) + tuple(players)
+        self.sids = (None,) + tuple(sids)
+        self.protocols = (None,) + tuple(protocols)
+        # One entry per recorded move: cell index * 2 + (player - 1)
+        self.history = array('H')
+        self.seq = 0
+        self.last_update = {'currentPlayer': 1, 'winner': 0, 'winningLine': None, 'lastMove': None}
+        self.difficulty = difficulty
+        self.ai_context = ai_context
+        self.ai_ponder = ai_ponder
+
+    def player_of(self, sid):
+        """Player number (1 or 2) of a socket id, or None."""
+        for player in (1, 2):
+            if self.sids[player] == sid:
+                return player
+        return None
+
+    # ----- Move history -----
+
+    def record_move(self, r, c, player):
+        """Append a move to the history."""
+        self.history.append((r * self.board.cols + c) * 2 + player - 1)
+
+    def pop_move(self):
+        """
+        Remove the last recorded move from the history.
+
+        Returns:
+            Tuple (r, c, player), or None if the history is empty
+        """
+        if not self.history:
+            return None
+        return self._unpack(self.history.pop())
+
+    def _unpack(self, packed):
+        r, c = divmod(packed >> 1, self.board.cols)
+        return r, c, (packed & 1) + 1
+
+    # ----- Serialization (socket edge) -----
+
+    def grid(self):
+        """The board as a 2D list, as sent to clients and given to the AI."""
+        return self.board.to_grid()
+
+    def last_move(self):
+        """Last recorded move as {'r', 'c', 'player'}, or None."""
+        if not self.history:
+            return None
+        r, c, player = self._unpack(self.history[-1])
+        return {'r': r, 'c': c, 'player': player}
+
+    def history_json(self):
+        """The history as a list of {'r', 'c', 'player'} dicts."""
+        moves = []
+        for packed in self.history:
+            r, c, player = self._unpack(packed)
+            moves.append({'r': r, 'c': c, 'player': player})
+        return moves
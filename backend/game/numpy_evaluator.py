@@ -0,0 +1,159 @@
+"""
+Optional NumPy backend for Caro pattern evaluation.
+
+Boards are int8 arrays laid out like the BitBoard (bit index r * stride + c)
+with one extra sentinel cell holding OFF_BOARD, so every window of every
+direction, together with its two end cells, is a row of a precomputed index
+array. Gathering those cells, packing them into encode_window codes and
+looking the codes up in the LineScorer tables scores all windows at once,
+for one board or for a batch of candidate boards.
+
+NumPy is not a hard dependency: when it is missing, or when
+AI_CONFIG['evaluator'] is not 'numpy', get_numpy_evaluator() returns None
+and the AI keeps its pure-Python evaluator.
+"""
+from config import AI_CONFIG
+from game.evaluator import OFF_BOARD
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+
+class NumpyEvaluator:
+    """Vectorized window scoring for one board shape."""
+
+    def __init__(self, geometry, scorer):
+        self.geometry = geometry
+        self.scorer = scorer
+        self.sentinel = geometry.size  # index of the OFF_BOARD cell
+        span = scorer.window + 2
+
+        # (before, window..., after) cell indexes of every window on the board
+        windows = []
+        for cells in geometry.lines:
+            padded = (self.sentinel,) + cells + (self.sentinel,)
+            for start in range(len(padded) - span + 1):
+                windows.append(padded[start:start + span])
+        self.windows = np.array(windows, dtype=np.intp)
+        # Bit shift of each position inside the code (before most significant)
+        self.code_shifts = np.array([2 * (span - 1 - k) for k in range(span)], dtype=np.int32)
+        self.tables = np.array(scorer.tables, dtype=np.int64)
+
+        # For every cell, the windows whose code it is part of and its shift
+        # there, padded with a dummy window (code 0 scores 0) to equal length
+        touching = [[] for _ in range(self.sentinel)]
+        for w, cells in enumerate(windows):
+            for k, idx in enumerate(cells):
+                if idx != self.sentinel:
+                    touching[idx].append((w, 2 * (span - 1 - k)))
+        width = max(len(entries) for entries in touching)
+        dummy = len(windows)
+        self.cell_windows = np.full((self.sentinel, width), dummy, dtype=np.intp)
+        # Window cells with the dummy window appended (all empty: code 0)
+        self.windows_padded = np.vstack([self.windows, np.full((1, span), self.sentinel + 1, dtype=np.intp)])
+        self.cell_shifts = np.zeros((self.sentinel, width), dtype=np.int32)
+        for idx, entries in enumerate(touching):
+            for j, (w, shift) in enumerate(entries):
+                self.cell_windows[idx, j] = w
+                self.cell_shifts[idx, j] = shift
+
+    def to_array(self, bb):
+        """int8 cells of a BitBoard (plus the sentinel), indexed by bit index."""
+        cells = np.zeros(self.sentinel + 2, dtype=np.int8)  # last: always empty
+        for player in (1, 2):
+            bits = bb.bits[player]
+            if bits:
+                raw = np.frombuffer(bits.to_bytes((self.sentinel + 7) // 8, 'little'), dtype=np.uint8)
+                mask = np.unpackbits(raw, bitorder='little')[:self.sentinel].astype(bool)
+                cells[:self.sentinel][mask] = player
+        cells[self.sentinel] = OFF_BOARD
+        return cells
+
+    def window_codes(self, boards):
+        """
+        encode_window code of every window of a batch of boards.
+
+        Args:
+            boards: int8 array of shape (n, size + 1) from to_array
+
+        Returns:
+            int32 array of shape (n, windows)
+        """
+        gathered = boards[:, self.windows].astype(np.int32)
+        return (gathered << self.code_shifts).sum(axis=2, dtype=np.int32)
+
+    def score_arrays(self, boards):
+        """
+        Score a batch of boards.
+
+        Args:
+            boards: int8 array of shape (n, size + 1) from to_array
+
+        Returns:
+            int64 array of shape (2, n): player 1 and player 2 totals
+        """
+        return self.tables[:, self.window_codes(boards)].sum(axis=2)
+
+    def role_scores(self, bb):
+        """Tuple (player 1 score, player 2 score) of a single board."""
+        totals = self.score_arrays(self.to_array(bb)[None, :])
+        return int(totals[0, 0]), int(totals[1, 0])
+
+    def score_moves(self, bb, moves, player):
+        """
+        Board score (as AIPlayer._evaluate_board) after each candidate move.
+
+        Args:
+            bb: BitBoard (left unchanged)
+            moves: List of (r, c) empty cells
+            player: Player placing the stone
+
+        Returns:
+            List of scores, aligned with `moves`
+        """
+        stride = bb.stride
+        cells = self.to_array(bb)
+        evaluator = getattr(bb, 'evaluator', None)
+        if evaluator is not None:
+            # Incremental totals are already known: only windows through the
+            # candidates need their codes
+            base = np.array([evaluator.role_score(1), evaluator.role_score(2)], dtype=np.int64)
+            codes = np.zeros(len(self.windows) + 1, dtype=np.int32)
+        else:
+            codes = self.window_codes(cells[None, :])[0]
+            base = self.tables[:, codes].sum(axis=1)
+            codes = np.append(codes, 0)  # the dummy window
+
+        # Only the windows through the new stone change: an empty cell (0)
+        # becomes `player`, which adds player << shift to their codes
+        targets = np.array([r * stride + c for r, c in moves], dtype=np.intp)
+        touched = self.cell_windows[targets]
+        if evaluator is not None:
+            window_cells = self.windows_padded[touched]
+            before = (cells[window_cells].astype(np.int32) << self.code_shifts).sum(axis=2, dtype=np.int32)
+        else:
+            before = codes[touched]
+        after = before + (player << self.cell_shifts[targets])
+        delta = (self.tables[:, after] - self.tables[:, before]).sum(axis=2)
+        totals = base[:, None] + delta
+        return (totals[1] - totals[0] * 2.0).tolist()
+
+
+_evaluators = {}
+
+
+def get_numpy_evaluator(geometry, scorer):
+    """
+    Shared NumpyEvaluator for a board shape, or None when NumPy evaluation
+    is disabled by configuration or NumPy is not installed.
+    """
+    if AI_CONFIG['evaluator'] != 'numpy' or np is None:
+        return None
+    key = (geometry.rows, geometry.cols, id(scorer))
+    evaluator = _evaluators.get(key)
+    if evaluator is None:
+        evaluator = NumpyEvaluator(geometry, scorer)
+        _evaluators[key] = evaluator
+    return evaluator
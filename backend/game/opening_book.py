@@ -0,0 +1,106 @@
+"""
+Opening book for Caro: replies of the hard AI to early positions.
+
+Positions are stored up to board symmetry (see game.symmetry), so one entry
+answers every rotation and reflection of it. The book file is JSON produced
+offline by build_opening_book.py from self-play of the hard AI; the server
+only reads it.
+"""
+import json
+import os
+
+from config import AI_CONFIG
+from game.symmetry import canonical_stones, from_canonical, to_canonical
+
+
+class OpeningBook:
+    """Canonical position -> reply, for positions of at most `max_stones` stones."""
+
+    def __init__(self, rows, cols, max_stones, positions=None):
+        self.rows = rows
+        self.cols = cols
+        self.max_stones = max_stones
+        self.positions = positions if positions is not None else {}
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _key(self, board):
+        """Canonical key and transform of a 2D list board (None if too many stones)."""
+        cols = self.cols
+        stones = [
+            (r * cols + c, cell)
+            for r, row in enumerate(board) for c, cell in enumerate(row) if cell
+        ]
+        if len(stones) > self.max_stones:
+            return None, 0
+        canonical, transform = canonical_stones(stones, self.rows, cols)
+        return ','.join(f'{player}:{cell}' for cell, player in canonical), transform
+
+    def lookup(self, board):
+        """
+        Book reply for a position.
+
+        Args:
+            board: 2D list board of the book's shape
+
+        Returns:
+            Tuple (r, c) or None if the position is not in the book
+        """
+        if len(board) != self.rows or len(board[0]) != self.cols:
+            return None
+        key, transform = self._key(board)
+        if key is None or key not in self.positions:
+            return None
+        cell = from_canonical(self.positions[key], transform, self.rows, self.cols)
+        r, c = divmod(cell, self.cols)
+        return (r, c) if board[r][c] == 0 else None
+
+    def add(self, board, move):
+        """
+        Store the reply to a position (kept if the position is already known).
+
+        Returns:
+            True if a new entry was added
+        """
+        key, transform = self._key(board)
+        if key is None or key in self.positions:
+            return False
+        r, c = move
+        self.positions[key] = to_canonical(r * self.cols + c, transform, self.rows, self.cols)
+        return True
+
+    def save(self, path):
+        """Write the book as JSON."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'rows': self.rows,
+                'cols': self.cols,
+                'max_stones': self.max_stones,
+                'positions': self.positions,
+            }, f, separators=(',', ':'), sort_keys=True)
+
+    @classmethod
+    def load(cls, path):
+        """Read a book written by save()."""
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['rows'], data['cols'], data['max_stones'], data['positions'])
+
+
+_book = None
+_book_loaded = False
+
+
+def get_opening_book():
+    """Return the configured opening book, loading it on first use (None if absent)."""
+    global _book, _book_loaded
+    if not _book_loaded:
+        _book_loaded = True
+        path = AI_CONFIG['opening_book']['path']
+        if AI_CONFIG['opening_book']['enabled'] and os.path.exists(path):
+            try:
+                _book = OpeningBook.load(path)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Opening book not loaded: {e}")
+    return _book
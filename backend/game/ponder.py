@@ -0,0 +1,123 @@
+"""
+Pondering: the bot searches during the human's turn.
+
+After the bot has replied in a practice Caro game, the room's Ponderer
+guesses the human's most likely replies and computes the bot's answer to
+each, one after another, on the AI executor. The searches run on a fork of
+the room's SearchContext, so whatever they find also lands in the game's
+transposition table. When the human's move arrives, take() returns the
+pondered answer if that exact position was searched, and otherwise stops
+the speculative work; the real search still profits from its table
+entries. With the process executor the searches run in a worker on a fork
+of the worker's own context for the room, and stopping sets the worker's
+stop byte.
+"""
+from config import AI_CONFIG
+from game.ai import AIPlayer
+from game.ai_executor import AIExecutorBusy, encode_board
+from game.bitboard import BitBoard
+from game.engine import GameEngine
+from game.rules import game_family
+
+
+class Ponderer:
+    """Speculative bot answers for one practice room."""
+
+    def __init__(self, context, replies=3, max_pending=1):
+        self.context = context
+        self.replies = replies
+        self.max_pending = max_pending
+        self.results = {}  # encode_board(position after the human's reply) -> bot move
+        self.generation = 0
+        self.search_context = None
+        self.executor = None
+        self.room_id = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def predict_replies(board, count):
+        """
+        The human's most likely replies, most urgent first.
+
+        Args:
+            board: 2D list board, human (player 1) to move
+            count: Number of replies wanted
+
+        Returns:
+            List of (r, c)
+        """
+        bb = BitBoard.from_grid(board)
+        moves = AIPlayer._get_neighbor_moves(bb, radius=2)
+        return AIPlayer._order_moves_by_urgency(bb, moves, 1, limit=count)
+
+    def run(self, executor, room_id, board, game_type, difficulty):
+        """
+        Ponder a position until done or stopped; blocks the calling green
+        thread like AIExecutor.compute.
+
+        Args:
+            executor: AIExecutor running the searches
+            room_id: Room of the game
+            board: Position after the bot's move (copied, not modified)
+            game_type, difficulty: As for AIPlayer.get_ai_move
+        """
+        self.stop()
+        self.executor, self.room_id = executor, room_id
+        generation = self.generation
+        board = [row[:] for row in board]
+        for r, c in self.predict_replies(board, self.replies):
+            # At most `max_pending` other jobs may be waiting
+            if self.generation != generation or executor.pending > self.max_pending:
+                return
+            board[r][c] = 1
+            try:
+                if GameEngine.check_winner(board, game_type, {'r': r, 'c': c})[0]:
+                    continue  # the game would be over: nothing to answer
+                self.search_context = self.context.fork() if self.context is not None else None
+                try:
+                    move = executor.compute(room_id, board, game_type, difficulty,
+                                            self.search_context, ponder=True)
+                except AIExecutorBusy:
+                    return
+                if self.generation != generation or move is None:
+                    return
+                self.results[encode_board(board)] = move
+            finally:
+                board[r][c] = 0
+
+    def take(self, board):
+        """
+        Pondered bot move for the current position, if any; stops pondering.
+
+        Args:
+            board: 2D list board after the human's move
+
+        Returns:
+            Tuple (r, c) or None
+        """
+        move = self.results.get(encode_board(board))
+        self.stop()
+        if move is not None and GameEngine.is_valid_move(board, move[0], move[1]):
+            self.hits += 1
+            return move
+        self.misses += 1
+        return None
+
+    def stop(self):
+        """Cancel the search in progress and forget earlier results."""
+        self.generation += 1
+        self.results = {}
+        if self.executor is not None:
+            self.executor.cancel(self.room_id, ponder=True)
+        if self.search_context is not None:
+            self.search_context.stop()
+            self.search_context = None
+
+
+def create_ponderer(game_type, difficulty, context):
+    """Ponderer for a new practice game, or None when it would not help."""
+    settings = AI_CONFIG['ponder']
+    if not settings['enabled'] or game_family(game_type) != 'caro' or difficulty not in ('medium', 'hard'):
+        return None
+    return Ponderer(context, settings['replies'], settings['max_pending'])
@@ -0,0 +1,166 @@
+"""
+Game variants: board shape, win length and winning rule per game type.
+
+Every entry of GAME_CONFIG becomes one GameRules, built on first use and
+shared. A GameRules holds the BoardGeometry of its shape (the precomputed
+shifts, masks and line indexes, themselves shared by every variant of that
+shape), so the engine and the AI pick the matching kernels by game type.
+
+Rules of the Caro family:
+- a run of at least `win_length` stones wins;
+- with `blocked_ends`, a run whose two end cells both hold opponent stones
+  does not win (the board edge does not block).
+"""
+from config import DIRECTIONS, GAME_CONFIG
+from game.bitboard import BitBoard, BoardGeometry
+
+# Window length the Caro AI's pattern tables and threat search are built for
+CARO_AI_WIN_LENGTH = 5
+
+
+class GameRules:
+    """Shape and winning rule of one game type."""
+
+    __slots__ = ('game_type', 'family', 'rows', 'cols', 'cells', 'win_length', 'blocked_ends',
+                 'geometry', 'rays')
+
+    def __init__(self, game_type, config):
+        self.game_type = game_type
+        self.family = config.get('family', game_type)
+        self.rows = config['rows']
+        self.cols = config['cols']
+        self.cells = self.rows * self.cols
+        self.win_length = config['win_length']
+        self.blocked_ends = config.get('blocked_ends', False)
+        if self.family == 'caro' and self.win_length != CARO_AI_WIN_LENGTH:
+            raise ValueError(f"{game_type}: Caro-family variants need win_length {CARO_AI_WIN_LENGTH}")
+        self.geometry = BoardGeometry.get(self.rows, self.cols)
+        self.rays = self._build_rays(self.rows, self.cols)
+
+    @staticmethod
+    def _build_rays(rows, cols):
+        """
+        Per-cell line tables: rays[r * cols + c] holds, for each of the four
+        DIRECTIONS, the cells from (r, c) to the board edge going forward and
+        going backward (nearest first, (r, c) itself excluded).
+        """
+        def ray(r, c, dr, dc):
+            cells = []
+            r, c = r + dr, c + dc
+            while 0 <= r < rows and 0 <= c < cols:
+                cells.append((r, c))
+                r, c = r + dr, c + dc
+            return tuple(cells)
+
+        return [
+            tuple((ray(r, c, dr, dc), ray(r, c, -dr, -dc)) for dr, dc in DIRECTIONS)
+            for r in range(rows) for c in range(cols)
+        ]
+
+    def create_bitboard(self):
+        """Empty BitBoard of this variant."""
+        board = BitBoard(self.rows, self.cols)
+        board.rules = self
+        return board
+
+    def is_win_at(self, bb, r, c, player):
+        """True if the stone at (r, c) of a BitBoard wins under these rules."""
+        win_length = self.win_length
+        if not self.blocked_ends:
+            return bb.is_win_at(r, c, player, win_length)
+        opponent_bits = bb.bits[3 - player]
+        stride = bb.stride
+        idx = r * stride + c
+        for dr, dc in DIRECTIONS:
+            forward = bb.count_direction(r, c, dr, dc, player)
+            backward = bb.count_direction(r, c, -dr, -dc, player)
+            if 1 + forward + backward < win_length:
+                continue
+            # Off-board neighbours are padding bits or out of range: never set
+            step = dr * stride + dc
+            ahead = idx + (forward + 1) * step
+            behind = idx - (backward + 1) * step
+            if ahead < 0 or behind < 0 or not ((opponent_bits >> ahead) & 1 and (opponent_bits >> behind) & 1):
+                return True
+        return False
+
+    def winning_line(self, board, r, c, player):
+        """
+        Winning run through (r, c), for a BitBoard or a 2D list board.
+
+        Walks the cell's precomputed rays, so only the cells next to the
+        move along the four directions are read.
+
+        Returns:
+            List of (r, c) tuples, or None if the stone does not win
+        """
+        if isinstance(board, BitBoard):
+            if not self.is_win_at(board, r, c, player):
+                return None
+            get = board.get
+        else:
+            def get(nr, nc):
+                return board[nr][nc]
+
+        win_length = self.win_length
+        opponent = 3 - player
+        for forward, backward in self.rays[r * self.cols + c]:
+            ahead = 0
+            for nr, nc in forward:
+                if get(nr, nc) != player:
+                    break
+                ahead += 1
+            behind = 0
+            for nr, nc in backward:
+                if get(nr, nc) != player:
+                    break
+                behind += 1
+            if 1 + ahead + behind < win_length:
+                continue
+            # Cells just past each end of the run; the board edge never blocks
+            if (self.blocked_ends
+                    and ahead < len(forward) and get(*forward[ahead]) == opponent
+                    and behind < len(backward) and get(*backward[behind]) == opponent):
+                continue
+            # At most win_length - 1 stones on each side, as the engine always reported
+            line = [(r, c)]
+            line.extend(forward[:min(ahead, win_length - 1)])
+            line.extend(backward[:min(behind, win_length - 1)])
+            return line
+        return None
+
+    def is_draw(self, board, move_count=None):
+        """
+        True when the board is full.
+
+        Args:
+            board: BitBoard or 2D list board
+            move_count: Stones on the board, if the caller keeps count; the
+                check is then O(1) instead of a scan of every cell
+        """
+        if move_count is not None:
+            return move_count >= self.cells
+        if isinstance(board, BitBoard):
+            return board.is_full()
+        return all(cell != 0 for row in board for cell in row)
+
+
+_rules = {}
+
+
+def get_rules(game_type):
+    """GameRules of a configured game type (None if unknown)."""
+    rules = _rules.get(game_type)
+    if rules is None:
+        config = GAME_CONFIG.get(game_type)
+        if config is None:
+            return None
+        rules = GameRules(game_type, config)
+        _rules[game_type] = rules
+    return rules
+
+
+def game_family(game_type):
+    """'tic-tac-toe' or 'caro' (the AI that plays the variant), or None."""
+    config = GAME_CONFIG.get(game_type)
+    return config.get('family', game_type) if config else None
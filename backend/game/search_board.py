@@ -0,0 +1,61 @@
+"""
+Search board: a BitBoard that keeps the AI's incremental state in sync.
+
+Every place/remove made by the search also updates the incremental pattern
+evaluator and the candidate-move frontier, so neither leaf scores nor move
+generation need a full board scan.
+"""
+from game.bitboard import BitBoard
+from game.evaluator import IncrementalEvaluator
+from game.frontier import CandidateFrontier
+
+
+class SearchBoard(BitBoard):
+    """BitBoard used by the Caro search, with an attached evaluator and frontier."""
+
+    __slots__ = ('evaluator', 'frontier')
+
+    @classmethod
+    def from_grid(cls, grid, scorer, radii=(1, 2), rules=None):
+        """
+        Build a search board from a 2D list board.
+
+        Args:
+            grid: 2D list board (0 empty, 1/2 players)
+            scorer: LineScorer used by the evaluator
+            radii: Neighbourhood radii the frontier maintains
+            rules: GameRules of the variant (None: five in a row)
+        """
+        board = super().from_grid(grid, rules)
+        board.evaluator = IncrementalEvaluator(board, scorer)
+        board.frontier = CandidateFrontier.from_board(board, radii)
+        return board
+
+    def place(self, r, c, player):
+        """Put `player`'s stone on an empty cell and update the evaluator and frontier."""
+        BitBoard.place(self, r, c, player)
+        idx = r * self.stride + c
+        self.evaluator.place(idx, player)
+        self.frontier.place(idx)
+
+    def remove(self, r, c):
+        """Clear the cell at (r, c) and update the evaluator and frontier."""
+        player = self.get(r, c)
+        if player:
+            BitBoard.remove(self, r, c)
+            idx = r * self.stride + c
+            self.evaluator.remove(idx, player)
+            self.frontier.remove(idx)
+
+    def candidates(self, radius):
+        """
+        Empty cells within `radius` of any stone, in row-major order.
+
+        Read from the frontier when it tracks `radius`, otherwise computed by
+        dilating the occupied bitboard.
+        """
+        if radius in self.frontier.radii:
+            mask = self.frontier.mask(radius) & ~(self.bits[1] | self.bits[2])
+        else:
+            mask = self.neighbor_mask(radius)
+        return self.cell_list(mask)
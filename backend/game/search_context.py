@@ -0,0 +1,41 @@
+"""
+Per-game AI search state reused across the AI's turns.
+"""
+from config import AI_CONFIG
+from game.threat_search import ThreatSearch
+from game.transposition import TranspositionTable
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the move's time budget is used up."""
+
+
+class SearchContext:
+    """Search caches for one game (one instance per practice room)."""
+
+    def __init__(self, tt_size=None, tt=None):
+        self.tt = tt if tt is not None else TranspositionTable(tt_size or AI_CONFIG['transposition_table_size'])
+        self.threats = ThreatSearch(**AI_CONFIG['threat_search'])
+        # perf_counter() deadline of the iteration in progress, or None
+        self.deadline = None
+        # SearchStats of the move being computed, or None
+        self.stats = None
+        # SearchBoard of the previous AI turn, synced to the next position
+        # instead of rebuilt; None while a search holds it
+        self.board = None
+        # Set by stop(): the search in progress gives up at its next node
+        self.stopped = False
+
+    def fork(self):
+        """
+        Context for a second search of the same game running alongside
+        (pondering): it shares the transposition table and the threat
+        memo, and has its own board, deadline and stop flag.
+        """
+        forked = SearchContext(tt=self.tt)
+        forked.threats.memo = self.threats.memo
+        return forked
+
+    def stop(self):
+        """Abort the search using this context (its result is meaningless)."""
+        self.stopped = True
@@ -0,0 +1,111 @@
+"""
+AI search instrumentation: per-move statistics and per-difficulty counters.
+
+Every AIPlayer.get_ai_move_with_stats call fills one SearchStats. The AI
+executor records it in the process-wide registry (AI_STATS), which sums the
+counters per game type and difficulty for the /api/ai/stats endpoint, keeps
+the boards of the slowest recent moves, and calls any registered hooks.
+"""
+import time
+from collections import deque
+
+from config import AI_CONFIG
+
+
+class SearchStats:
+    """Cost of one AI move decision."""
+
+    __slots__ = ('game_type', 'difficulty', 'nodes', 'cutoffs', 'evaluations',
+                 'tt_hits', 'threat_nodes', 'depth', 'elapsed_ms')
+
+    # Counters summed by the registry
+    COUNTERS = ('nodes', 'cutoffs', 'evaluations', 'tt_hits', 'threat_nodes')
+
+    def __init__(self, game_type, difficulty):
+        self.game_type = game_type
+        self.difficulty = difficulty
+        self.nodes = 0          # minimax nodes visited
+        self.cutoffs = 0        # alpha-beta cutoffs
+        self.evaluations = 0    # board evaluations (leaves and move ordering)
+        self.tt_hits = 0        # transposition table hits
+        self.threat_nodes = 0   # threat-space search nodes
+        self.depth = 0          # deepest completed iteration
+        self.elapsed_ms = 0.0
+
+    def as_dict(self):
+        """Plain dict of every field (for logging or JSON)."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class SearchStatsRegistry:
+    """Per game type and difficulty aggregation of SearchStats."""
+
+    def __init__(self, slow_move_ms=1000, keep_slow_moves=20):
+        self.slow_move_ms = slow_move_ms
+        self.totals = {}
+        self.slow_moves = deque(maxlen=keep_slow_moves)
+        self.hooks = []
+
+    def add_hook(self, hook):
+        """Call `hook(stats, board)` for every recorded move."""
+        self.hooks.append(hook)
+
+    def record(self, stats, board=None):
+        """
+        Add one move's statistics to the counters.
+
+        Args:
+            stats: SearchStats of the move
+            board: Board the move was computed for; kept when the move was slow
+        """
+        key = (stats.game_type, stats.difficulty)
+        totals = self.totals.get(key)
+        if totals is None:
+            totals = dict.fromkeys(SearchStats.COUNTERS, 0)
+            totals.update(moves=0, depth_sum=0, elapsed_ms_sum=0.0, elapsed_ms_max=0.0)
+            self.totals[key] = totals
+
+        totals['moves'] += 1
+        for name in SearchStats.COUNTERS:
+            totals[name] += getattr(stats, name)
+        totals['depth_sum'] += stats.depth
+        totals['elapsed_ms_sum'] += stats.elapsed_ms
+        totals['elapsed_ms_max'] = max(totals['elapsed_ms_max'], stats.elapsed_ms)
+
+        if board is not None and self.slow_move_ms is not None and stats.elapsed_ms >= self.slow_move_ms:
+            self.slow_moves.append({
+                'at': time.time(),
+                'stats': stats.as_dict(),
+                'board': [''.join(str(cell) for cell in row) for row in board],
+            })
+
+        for hook in self.hooks:
+            try:
+                hook(stats, board)
+            except Exception as e:
+                print(f"AI stats hook error: {e}")
+
+    def snapshot(self):
+        """
+        Current counters.
+
+        Returns:
+            Dict {game_type: {difficulty: counters}} plus 'slow_moves'
+        """
+        result = {}
+        for (game_type, difficulty), totals in self.totals.items():
+            entry = dict(totals)
+            moves = totals['moves']
+            entry['depth_avg'] = totals['depth_sum'] / moves if moves else 0
+            entry['elapsed_ms_avg'] = totals['elapsed_ms_sum'] / moves if moves else 0
+            result.setdefault(game_type, {})[difficulty] = entry
+        result['slow_moves'] = list(self.slow_moves)
+        return result
+
+    def reset(self):
+        """Zero every counter."""
+        self.totals.clear()
+        self.slow_moves.clear()
+
+
+AI_STATS = SearchStatsRegistry(**AI_CONFIG['stats'])
@@ -0,0 +1,107 @@
+"""
+Board symmetries: canonical forms of positions up to rotation and reflection.
+
+Cells are flat indexes r * cols + c. A square board has the 8 symmetries of
+the square, a rectangular one only 4 (identity, both flips, half turn).
+"""
+
+
+_transform_cache = {}
+
+
+def board_transforms(rows, cols):
+    """
+    Cell permutations of the board's symmetry group (built once, cached).
+
+    Returns:
+        List of (forward, inverse) tuples: forward[i] is where cell i goes,
+        inverse undoes it; index 0 is the identity
+    """
+    key = (rows, cols)
+    transforms = _transform_cache.get(key)
+    if transforms is not None:
+        return transforms
+
+    maps = [
+        lambda r, c: (r, c),
+        lambda r, c: (rows - 1 - r, c),
+        lambda r, c: (r, cols - 1 - c),
+        lambda r, c: (rows - 1 - r, cols - 1 - c),
+    ]
+    if rows == cols:
+        maps += [
+            lambda r, c: (c, r),
+            lambda r, c: (cols - 1 - c, rows - 1 - r),
+            lambda r, c: (c, rows - 1 - r),
+            lambda r, c: (cols - 1 - c, r),
+        ]
+
+    transforms = []
+    for mapping in maps:
+        forward = [0] * (rows * cols)
+        for r in range(rows):
+            for c in range(cols):
+                nr, nc = mapping(r, c)
+                forward[r * cols + c] = nr * cols + nc
+        inverse = [0] * len(forward)
+        for i, j in enumerate(forward):
+            inverse[j] = i
+        transforms.append((tuple(forward), tuple(inverse)))
+    _transform_cache[key] = transforms
+    return transforms
+
+
+def canonical_cells(cells, rows, cols):
+    """
+    Canonical form of a dense position.
+
+    Args:
+        cells: Flat sequence of cell values, row-major
+        rows, cols: Board shape
+
+    Returns:
+        Tuple (canonical cell tuple, transform index); the canonical tuple
+        holds cells[i] at position forward[i] of that transform
+    """
+    best = None
+    best_index = 0
+    size = len(cells)
+    for index, (forward, _) in enumerate(board_transforms(rows, cols)):
+        mapped = [0] * size
+        for i, value in enumerate(cells):
+            mapped[forward[i]] = value
+        mapped = tuple(mapped)
+        if best is None or mapped < best:
+            best, best_index = mapped, index
+    return best, best_index
+
+
+def canonical_stones(stones, rows, cols):
+    """
+    Canonical form of a sparse position.
+
+    Args:
+        stones: Iterable of (cell index, player)
+        rows, cols: Board shape
+
+    Returns:
+        Tuple (sorted tuple of (cell, player) pairs, transform index)
+    """
+    stones = list(stones)
+    best = None
+    best_index = 0
+    for index, (forward, _) in enumerate(board_transforms(rows, cols)):
+        mapped = tuple(sorted((forward[i], player) for i, player in stones))
+        if best is None or mapped < best:
+            best, best_index = mapped, index
+    return best, best_index
+
+
+def to_canonical(cell, transform, rows, cols):
+    """Map a cell of the original board into canonical coordinates."""
+    return board_transforms(rows, cols)[transform][0][cell]
+
+
+def from_canonical(cell, transform, rows, cols):
+    """Map a cell in canonical coordinates back onto the original board."""
+    return board_transforms(rows, cols)[transform][1][cell]
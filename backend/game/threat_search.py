@@ -0,0 +1,332 @@
+"""
+Threat-space search for Caro: forced wins through chains of fours and threes.
+
+Forcing moves leave the defender only a handful of replies, so following them
+reaches far deeper than full-width alpha-beta for the same work:
+
+- VCF (victory by continuous fours): every attacking move makes a four, the
+  defender's only reply is to block its completion cell.
+- VCT (victory by continuous threats): attacking moves may also make a three
+  (a four-to-be with both ends open); the defender may then block any cell of
+  the threat or answer with a four of their own.
+
+Threats are found with bitwise window masks over the BitBoard, like the
+pattern counter in game.bitboard. The defender's replies to a three are the
+cells of the threatening windows plus their own fours; quieter counter-play
+is not considered, so a VCT result is a strong heuristic rather than a proof.
+"""
+import time
+
+from game.bitboard import LINE_MIN_LENGTH, BitBoard
+
+
+class ThreatSearchLimit(Exception):
+    """Raised inside the search when the node or time limit is reached."""
+
+
+def _window_counter(own, free, d, length):
+    """
+    Windows of `length` cells along shift `d` lying inside `free`, with a
+    bit-sliced count of the `own` stones in each (see count_windows).
+
+    Returns:
+        Tuple (start bits of the windows, counter planes)
+    """
+    windows = free
+    for k in range(1, length):
+        windows &= free >> (k * d)
+    nbits = length.bit_length()
+    counter = [0] * nbits
+    if not windows:
+        return 0, counter
+    for k in range(length):
+        carry = (own >> (k * d)) & windows
+        j = 0
+        while carry:
+            counter[j], carry = counter[j] ^ carry, counter[j] & carry
+            j += 1
+    return windows, counter
+
+
+def _select(windows, counter, stones):
+    """Start bits of the windows whose count equals `stones`."""
+    for j, plane in enumerate(counter):
+        windows &= plane if (stones >> j) & 1 else ~plane
+    return windows
+
+
+def _spread(starts, d, length):
+    """Every cell covered by the windows starting at `starts`."""
+    cells = 0
+    for k in range(length):
+        cells |= starts << (k * d)
+    return cells
+
+
+def window_cell_sets(own, free, shifts, counts, length=LINE_MIN_LENGTH):
+    """
+    Empty cells of every window holding exactly `stones` own stones, for each
+    `stones` in `counts` (one counting pass serves them all).
+
+    With stones=4 these are the cells that complete five; with stones=3 the
+    cells that make a four.
+
+    Returns:
+        Tuple of cell masks, in the order of `counts`
+    """
+    empty = free & ~own
+    cells = [0] * len(counts)
+    for d in shifts:
+        windows, counter = _window_counter(own, free, d, length)
+        if not windows:
+            continue
+        for i, stones in enumerate(counts):
+            starts = _select(windows, counter, stones)
+            if starts:
+                cells[i] |= _spread(starts, d, length)
+    return tuple(mask & empty for mask in cells)
+
+
+def window_cells(own, free, shifts, stones, length=LINE_MIN_LENGTH):
+    """Empty cells of every window holding exactly `stones` own stones."""
+    return window_cell_sets(own, free, shifts, (stones,), length)[0]
+
+
+def straight_four_cells(own, free, shifts):
+    """
+    Cells that would make a straight four (_XXXX_), and the cells that defend.
+
+    Returns:
+        Tuple (making cells, defending cells); the defending cells are every
+        empty cell of the six-cell windows involved (both ends and the gap)
+    """
+    empty = free & ~own
+    making = 0
+    defending = 0
+    for d in shifts:
+        # Four-cell middles with three stones, both outer cells empty
+        windows, counter = _window_counter(own, free, d, 4)
+        starts = _select(windows, counter, 3) & (empty << d) & (empty >> (4 * d))
+        if starts:
+            gaps = _spread(starts, d, 4) & empty
+            making |= gaps
+            defending |= gaps | (starts >> d) | (starts << (4 * d))
+    return making, defending
+
+
+class ThreatSearch:
+    """
+    VCF/VCT solver with node and time limits and its own memo table.
+
+    The memo maps (position key, attacker, depth, vct) to the winning move or
+    False; it is keyed by the BitBoard Zobrist hash, so one instance can be
+    kept for a whole game.
+    """
+
+    def __init__(self, node_limit=20000, time_budget_ms=150, vcf_depth=10,
+                 vct_depth=4, memo_size=1 << 16):
+        self.node_limit = node_limit
+        self.time_budget_ms = time_budget_ms
+        self.vcf_depth = vcf_depth
+        self.vct_depth = vct_depth
+        self.memo_size = memo_size
+        self.memo = {}
+        self.nodes = 0
+        self.deadline = None
+
+    # ----- Public API -----
+
+    def find_win(self, bb, player, deadline=None):
+        """
+        Find a forced win for `player`, who is to move.
+
+        Args:
+            bb: BitBoard (left unchanged)
+            player: Attacking player (1 or 2)
+            deadline: Optional perf_counter() time the search must stop by
+
+        Returns:
+            (r, c) starting a VCF or VCT, or None (none found within limits)
+        """
+        bb = BitBoard.copy(bb)  # plain board: no incremental state to update
+        self._start(deadline)
+        try:
+            move = self._attack(bb, player, self.vcf_depth, False)
+            if move is None and self.vct_depth:
+                move = self._attack(bb, player, self.vct_depth, True)
+        except ThreatSearchLimit:
+            return None
+        return bb.geometry.coords[move] if move is not None else None
+
+    def find_defences(self, bb, player, deadline=None):
+        """
+        Find the moves that refute the opponent's forced win.
+
+        Args:
+            bb: BitBoard (left unchanged), `player` to move
+            player: Defending player (1 or 2)
+            deadline: Optional perf_counter() time the search must stop by
+
+        Returns:
+            None if the opponent has no forced win (or limits were hit before
+            one was found), otherwise the list of (r, c) moves after which the
+            opponent has none; empty if every defence fails
+        """
+        bb = BitBoard.copy(bb)
+        opponent = 3 - player
+        defences = []
+        self._start(deadline)
+        try:
+            threat = self._attack(bb, opponent, self.vcf_depth, False)
+            vct = False
+            if threat is None and self.vct_depth:
+                threat = self._attack(bb, opponent, self.vct_depth, True)
+                vct = True
+            if threat is None:
+                return None
+            depth = self.vct_depth if vct else self.vcf_depth
+
+            for idx in self._defence_candidates(bb, player):
+                r, c = bb.geometry.coords[idx]
+                bb.place(r, c, player)
+                try:
+                    refuted = (bb.is_win_at(r, c, player)
+                               or self._attack(bb, opponent, depth, vct) is None)
+                finally:
+                    bb.remove(r, c)
+                if refuted:
+                    defences.append((r, c))
+        except ThreatSearchLimit:
+            # Defences found so far are verified; otherwise nothing is known
+            return defences or None
+        return defences
+
+    def clear(self):
+        """Drop every memoized result."""
+        self.memo.clear()
+
+    # ----- Search -----
+
+    def _start(self, deadline):
+        self.nodes = 0
+        budget = time.perf_counter() + self.time_budget_ms / 1000.0
+        self.deadline = budget if deadline is None else min(deadline, budget)
+
+    def _tick(self):
+        self.nodes += 1
+        if self.nodes >= self.node_limit:
+            raise ThreatSearchLimit()
+        if not self.nodes & 63 and time.perf_counter() > self.deadline:
+            raise ThreatSearchLimit()
+
+    def _attack(self, bb, attacker, depth, vct):
+        """
+        Attacker to move: return the bit index of a forcing move that wins
+        within `depth` attacking moves, or None.
+        """
+        self._tick()
+        geometry = bb.geometry
+        shifts = geometry.shifts
+        defender = 3 - attacker
+        own, opp = bb.bits[attacker], bb.bits[defender]
+        full = geometry.full_mask
+
+        free = full & ~opp
+        if vct:
+            fives, fours, threes = window_cell_sets(own, free, shifts, (4, 3, 2))
+        else:
+            fives, fours = window_cell_sets(own, free, shifts, (4, 3))
+            threes = 0
+        if fives:
+            return (fives & -fives).bit_length() - 1
+        if depth <= 0:
+            return None
+        # The defender's open completion cells must be blocked first
+        blocks = window_cells(opp, full & ~own, shifts, 4)
+        if blocks & (blocks - 1):
+            return None  # two cells to block: lost
+
+        key = (bb.key, attacker, depth, vct)
+        if key in self.memo:
+            result = self.memo[key]
+            return result if result is not False else None
+
+        # Moves next to two stones are a superset of the threes; _wins_with checks them
+        threes &= ~fours
+        if blocks:
+            fours &= blocks
+            threes &= blocks
+
+        result = None
+        for candidates in (fours, threes):
+            while candidates and result is None:
+                low = candidates & -candidates
+                candidates ^= low
+                idx = low.bit_length() - 1
+                if self._wins_with(bb, attacker, idx, depth, vct):
+                    result = idx
+
+        if len(self.memo) >= self.memo_size:
+            self.memo.clear()
+        self.memo[key] = result if result is not None else False
+        return result
+
+    def _wins_with(self, bb, attacker, idx, depth, vct):
+        """Play `idx` for the attacker and check every defence loses."""
+        geometry = bb.geometry
+        shifts = geometry.shifts
+        defender = 3 - attacker
+        r, c = geometry.coords[idx]
+        bb.place(r, c, attacker)
+        try:
+            own, opp = bb.bits[attacker], bb.bits[defender]
+            free = geometry.full_mask & ~opp
+            completions = window_cells(own, free, shifts, 4)
+            if completions & (completions - 1):
+                return True  # two ways to five: cannot be stopped
+            if completions:
+                # A four: the only defence is the completion cell
+                replies = completions
+            elif vct:
+                making, defending = straight_four_cells(own, free, shifts)
+                if not making:
+                    return False  # not a threat
+                # Block the three, or counter with a four
+                replies = defending | window_cells(opp, geometry.full_mask & ~own, shifts, 3)
+            else:
+                return False
+
+            while replies:
+                low = replies & -replies
+                replies ^= low
+                rr, rc = geometry.coords[low.bit_length() - 1]
+                bb.place(rr, rc, defender)
+                try:
+                    if bb.is_win_at(rr, rc, defender):
+                        return False
+                    if self._attack(bb, attacker, depth - 1, vct) is None:
+                        return False
+                finally:
+                    bb.remove(rr, rc)
+            return True
+        finally:
+            bb.remove(r, c)
+
+    def _defence_candidates(self, bb, player):
+        """Cells that can matter against the opponent's threats, as bit indexes."""
+        geometry = bb.geometry
+        shifts = geometry.shifts
+        opponent = 3 - player
+        own, opp = bb.bits[player], bb.bits[opponent]
+        full = geometry.full_mask
+        opp_free = full & ~own
+        fives, fours, twos = window_cell_sets(opp, opp_free, shifts, (4, 3, 2))
+        cells = (fives | fours | twos
+                 | straight_four_cells(opp, opp_free, shifts)[1]
+                 | window_cells(own, full & ~opp, shifts, 3))
+        result = []
+        while cells:
+            low = cells & -cells
+            cells ^= low
+            result.append(low.bit_length() - 1)
+        return result
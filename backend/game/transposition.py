@@ -0,0 +1,75 @@
+"""
+Transposition table for the Caro minimax search.
+
+Positions are keyed by the BitBoard's Zobrist hash (xor the side-to-move key
+when the AI is to play). The table is a fixed number of slots indexed by the
+low bits of the key, so its memory use never grows.
+"""
+
+# Bound types stored with each entry
+EXACT = 0
+LOWER = 1  # search failed high: value is a lower bound
+UPPER = 2  # search failed low: value is an upper bound
+
+
+class TranspositionTable:
+    """
+    Fixed-size table of search results with depth-preferred replacement.
+
+    A slot is overwritten when the new result searched at least as deep, or
+    when the stored entry was written during an earlier search (generation),
+    so results from the previous AI turn are reused but do not pin slots.
+    """
+
+    def __init__(self, size=1 << 15):
+        # Round up to a power of two so the slot is just `key & mask`
+        capacity = 1
+        while capacity < size:
+            capacity <<= 1
+        self.mask = capacity - 1
+        self.slots = [None] * capacity
+        self.generation = 0
+        self.hits = 0
+        self.stores = 0
+
+    def new_search(self):
+        """Start a new root search; older entries become replaceable."""
+        self.generation += 1
+
+    def probe(self, key):
+        """
+        Look up a position.
+
+        Returns:
+            Tuple (depth, flag, value, best_move) or None
+        """
+        entry = self.slots[key & self.mask]
+        if entry is None or entry[0] != key:
+            return None
+        self.hits += 1
+        return entry[1:5]
+
+    def store(self, key, depth, flag, value, best_move):
+        """
+        Save a search result.
+
+        Args:
+            key: Zobrist key of the position
+            depth: Remaining depth the value was searched to
+            flag: EXACT, LOWER or UPPER
+            value: Score found
+            best_move: (r, c) of the best move, or None
+        """
+        index = key & self.mask
+        entry = self.slots[index]
+        if entry is not None and entry[0] != key and entry[5] == self.generation and entry[1] > depth:
+            return  # keep the deeper result from this search
+        if best_move is None and entry is not None and entry[0] == key:
+            best_move = entry[4]
+        self.slots[index] = (key, depth, flag, value, best_move, self.generation)
+        self.stores += 1
+
+    def clear(self):
+        """Drop every entry."""
+        self.slots = [None] * (self.mask + 1)
+        self.generation = 0
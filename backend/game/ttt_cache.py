@@ -0,0 +1,110 @@
+"""
+Bounded cache for the Tic-Tac-Toe minimax search.
+
+Positions are stored by their canonical form under the 8 symmetries of the
+3x3 board (see game.symmetry), so equivalent positions share one entry.
+Scores are kept relative to the position (a win in k plies is 10 - k no
+matter how deep the position sat in the tree), together with whether the
+score is exact or only a bound from an alpha-beta cutoff. The least
+recently used entry is evicted once the cache is full.
+"""
+from collections import OrderedDict
+
+from game.symmetry import canonical_cells
+from game.transposition import EXACT, LOWER, UPPER
+
+
+class TTTCache:
+    """LRU map of canonical position -> (flag, node-relative score)."""
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def key(board, is_maximizing):
+        """Canonical key of a 3x3 board and side to move."""
+        cells = tuple(cell for row in board for cell in row)
+        return canonical_cells(cells, 3, 3)[0], is_maximizing
+
+    @staticmethod
+    def _to_node(score, depth):
+        # Scores are 10 - depth (win) / depth - 10 (loss) at the root: move
+        # the mate distance so it counts from this node
+        if score > 0:
+            return score + depth
+        if score < 0:
+            return score - depth
+        return score
+
+    @staticmethod
+    def _to_root(score, depth):
+        if score > 0:
+            return score - depth
+        if score < 0:
+            return score + depth
+        return score
+
+    def probe(self, key, depth, alpha, beta):
+        """
+        Look up a position searched with window (alpha, beta).
+
+        Args:
+            key: From TTTCache.key
+            depth: Plies from the root of the current search
+
+        Returns:
+            Tuple (score, alpha, beta): score is the usable value or None,
+            alpha/beta are the window narrowed by any stored bound
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, alpha, beta
+        self.entries.move_to_end(key)
+        self.hits += 1
+        flag, score = entry
+        score = self._to_root(score, depth)
+        if flag == EXACT:
+            return score, alpha, beta
+        if flag == LOWER:
+            alpha = max(alpha, score)
+        else:
+            beta = min(beta, score)
+        if alpha >= beta:
+            return score, alpha, beta
+        return None, alpha, beta
+
+    def store(self, key, depth, alpha, beta, score):
+        """
+        Save a search result.
+
+        Args:
+            key: From TTTCache.key
+            depth: Plies from the root of the current search
+            alpha, beta: Window the position was searched with
+            score: Value the search returned
+        """
+        if score <= alpha:
+            flag = UPPER
+        elif score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+        elif len(entries) >= self.capacity:
+            entries.popitem(last=False)
+        entries[key] = (flag, self._to_node(score, depth))
+
+    def clear(self):
+        """Drop every entry."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,128 @@
+"""
+Precomputed perfect play for Tic-Tac-Toe.
+
+Every 3x3 position (3^9 codes, cell value times 3^index, row-major) maps to
+the hard AI's move as player 2, one byte per position: the cell index 0-8,
+or NO_MOVE when the game is over. build_ttt_table.py writes the table at
+build time; the server loads it with a single read instead of filling a
+minimax cache in every process.
+"""
+import os
+
+from config import AI_CONFIG
+
+POSITIONS = 3 ** 9
+NO_MOVE = 255
+
+_LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),
+    (0, 4, 8), (2, 4, 6),
+)
+
+
+def encode_board(board):
+    """Base-3 code of a 3x3 board (cell (r, c) is digit r * 3 + c)."""
+    code = 0
+    for cell in reversed([cell for row in board for cell in row]):
+        code = code * 3 + cell
+    return code
+
+
+def _winner(cells):
+    for a, b, c in _LINES:
+        if cells[a] and cells[a] == cells[b] == cells[c]:
+            return cells[a]
+    return 0
+
+
+def solve_ttt():
+    """
+    Solve every position exactly.
+
+    Scores follow AIPlayer._minimax_ttt: 10 - plies for an AI win, plies - 10
+    for a loss, 0 for a draw; the AI plays the first best cell in row-major
+    order, as the hard search does.
+
+    Returns:
+        bytes of length POSITIONS
+    """
+    memo = {}
+
+    def value(cells, to_move):
+        key = (cells, to_move)
+        if key in memo:
+            return memo[key]
+        winner = _winner(cells)
+        if winner:
+            result = 10 if winner == 2 else -10
+        elif 0 not in cells:
+            result = 0
+        else:
+            scores = []
+            for i in range(9):
+                if cells[i] == 0:
+                    child = cells[:i] + (to_move,) + cells[i + 1:]
+                    score = value(child, 3 - to_move)
+                    # One ply further from the root: wins and losses shrink by 1
+                    scores.append(score - 1 if score > 0 else score + 1 if score < 0 else 0)
+            result = max(scores) if to_move == 2 else min(scores)
+        memo[key] = result
+        return result
+
+    table = bytearray([NO_MOVE]) * POSITIONS
+    for code in range(POSITIONS):
+        cells = []
+        rest = code
+        for _ in range(9):
+            rest, digit = divmod(rest, 3)
+            cells.append(digit)
+        cells = tuple(cells)
+        if _winner(cells) or 0 not in cells:
+            continue
+        best_score = None
+        for i in range(9):
+            if cells[i] == 0:
+                score = value(cells[:i] + (2,) + cells[i + 1:], 1)
+                if best_score is None or score > best_score:
+                    best_score = score
+                    table[code] = i
+    return bytes(table)
+
+
+class TTTTable:
+    """Lookup of the AI's move for any Tic-Tac-Toe position."""
+
+    def __init__(self, data):
+        if len(data) != POSITIONS:
+            raise ValueError(f'Tic-Tac-Toe table must be {POSITIONS} bytes, got {len(data)}')
+        self.data = data
+
+    def best_move(self, board):
+        """Return (r, c) for the AI, or None when the game is over."""
+        move = self.data[encode_board(board)]
+        return None if move == NO_MOVE else divmod(move, 3)
+
+    @classmethod
+    def load(cls, path):
+        """Read a table written by build_ttt_table.py."""
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+
+_table = None
+_table_loaded = False
+
+
+def get_ttt_table():
+    """Return the precomputed table, loading it on first use (None if absent)."""
+    global _table, _table_loaded
+    if not _table_loaded:
+        _table_loaded = True
+        path = AI_CONFIG['ttt_table_path']
+        if os.path.exists(path):
+            try:
+                _table = TTTTable.load(path)
+            except (OSError, ValueError) as e:
+                print(f"Tic-Tac-Toe table not loaded: {e}")
+    return _table
@@ -0,0 +1,72 @@
+"""
+Schema migration script: applies database/migrations/*.sql in order.
+Each file runs once; applied files are recorded in the schema_migrations
+table, so the script is safe to run again after every update.
+"""
+import mysql.connector
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), 'database', 'migrations')
+
+
+def pending_migrations(applied):
+    """Migration file names not yet applied, in order."""
+    names = sorted(name for name in os.listdir(MIGRATIONS_DIR) if name.endswith('.sql'))
+    return [name for name in names if name not in applied]
+
+
+def split_statements(sql):
+    """Statements of a migration file (comment lines dropped)."""
+    lines = [line for line in sql.splitlines() if not line.strip().startswith('--')]
+    return [statement.strip() for statement in '\n'.join(lines).split(';') if statement.strip()]
+
+
+def migrate_schema():
+    """Apply every pending migration."""
+
+    # Connect to database
+    conn = mysql.connector.connect(
+        host=os.getenv('DB_HOST', '127.0.0.1'),
+        user=os.getenv('DB_USER', 'root'),
+        password=os.getenv('DB_PASSWORD', ''),
+        database=os.getenv('DB_NAME', 'tic_tac_toe_db')
+    )
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            name VARCHAR(255) PRIMARY KEY,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("SELECT name FROM schema_migrations")
+    applied = {row[0] for row in cursor.fetchall()}
+
+    pending = pending_migrations(applied)
+    print(f"Found {len(pending)} pending migration(s)...")
+
+    for name in pending:
+        with open(os.path.join(MIGRATIONS_DIR, name), encoding='utf-8') as f:
+            statements = split_statements(f.read())
+        # DDL commits implicitly in MySQL: a failure stops here, leaving
+        # this migration unrecorded so it can be fixed and re-run
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.execute("INSERT INTO schema_migrations (name) VALUES (%s)", (name,))
+        conn.commit()
+        print(f"  [{name}] Applied!")
+
+    cursor.close()
+    conn.close()
+
+    print("\n✅ Schema is up to date!")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Schema Migration Script")
+    print("=" * 60)
+    migrate_schema()
@@ -0,0 +1,20 @@
+"""
+AI routes: Bot search statistics.
+"""
+from flask import Blueprint, jsonify
+from game.search_stats import AI_STATS
+
+ai_bp = Blueprint('ai', __name__, url_prefix='/api')
+
+
+@ai_bp.route('/ai/stats', methods=['GET'])
+def get_ai_stats():
+    """
+    Get AI search counters of this server process.
+    
+    Returns:
+        Per game type and difficulty: moves, nodes, cutoffs, evaluations,
+        transposition hits, threat-search nodes, depth and time totals, plus
+        the boards of recent slow moves
+    """
+    return jsonify(AI_STATS.snapshot()), 200
@@ -0,0 +1,20 @@
+"""
+Status routes: Database connection pool metrics.
+"""
+from flask import Blueprint, jsonify
+from database.db import get_pool
+
+status_bp = Blueprint('status', __name__, url_prefix='/api')
+
+
+@status_bp.route('/db/pool', methods=['GET'])
+def get_db_pool_stats():
+    """
+    Get the database connection pool metrics of this server process.
+    
+    Returns:
+        Pool size, open/in-use/idle connections, checkouts, waits with
+        total/average/max wait time, checkout timeouts, and connections
+        created and discarded
+    """
+    return jsonify(get_pool().snapshot()), 200
@@ -0,0 +1,34 @@
+"""
+Headless self-play between AI difficulty levels.
+Plays full games with GameEngine (no socket server) across worker
+processes and prints win rates and move throughput, e.g. to check that a
+search change did not weaken the hard AI.
+
+Usage: python self_play.py [--game caro|tic-tac-toe|gomoku|...] [--games N]
+                           [--a hard] [--b medium] [--workers N] [--seed N]
+"""
+import argparse
+
+from config import GAME_CONFIG
+from game.ai_batch import play_games
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Play AI difficulty levels against each other.')
+    parser.add_argument('--game', default='caro', choices=list(GAME_CONFIG))
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--a', default='hard', choices=['easy', 'medium', 'hard'])
+    parser.add_argument('--b', default='medium', choices=['easy', 'medium', 'hard'])
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: one per core)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    report = play_games(args.games, args.game, args.a, args.b, args.workers, args.seed)
+    print(f"{report['games']} {report['game_type']} games, {args.a} (A) vs {args.b} (B)")
+    print(f"  A wins: {report['wins_a']} ({report['win_rate_a']:.0%})")
+    print(f"  B wins: {report['wins_b']} ({report['win_rate_b']:.0%})")
+    print(f"  draws:  {report['draws']}")
+    print(f"  {report['moves']} moves in {report['elapsed_s']:.1f}s "
+          f"({report['moves_per_second']:.1f} moves/s)")
+    print(f"  avg AI time per move: A {report['avg_move_ms_a']:.1f}ms, B {report['avg_move_ms_b']:.1f}ms")
@@ -1,16 +1,67 @@
 """
 Leaderboard service: Ranking queries and leaderboard generation.
+
+Positions come from the in-process ranking index (services.ranking_index);
+only the rows shown are read from the users table, by primary key. The
+plain SQL queries remain as the fallback while the index cannot be built.
 """
 from database.db import DatabaseQuery
+from services.level_tables import LEVEL_TABLES
+from services.ranking_index import RANKING_INDEX
+
+LEADERBOARD_COLUMNS = """
+    u.id, 
+    u.display_name, 
+    u.xp,
+    u.level,
+    u.level as user_level, -- Alias for frontend
+    u.rank_points, 
+    u.rank_points as rank_score, -- Alias for frontend
+    r.name as rank_name,
+    r.color as rank_color
+"""
+
+NEARBY_COLUMNS = """
+    u.id, u.display_name, u.rank_points, u.level,
+    u.rank_points as rank_score, -- Alias for frontend
+    u.level as user_level -- Alias for frontend
+"""
 
 
 class LeaderboardService:
     """Handles leaderboard queries and ranking information."""
     
+    @staticmethod
+    def _users_in_order(user_ids, columns):
+        """
+        Rows of the given users in leaderboard order, with tier info.
+        
+        Args:
+            user_ids: User IDs, as returned by the ranking index
+            columns: SELECT list over users u (and ranks r)
+        """
+        if not user_ids:
+            return []
+        placeholders = ', '.join(['%s'] * len(user_ids))
+        query = f"""
+            SELECT {columns}
+            FROM users u
+            LEFT JOIN ranks r ON u.rank_id = r.id
+            WHERE u.id IN ({placeholders})
+        """
+        rows = DatabaseQuery.execute_query(query, tuple(user_ids), fetch_all=True) or []
+        # Current database values decide the order (another server process
+        # may have moved a user since this index was built)
+        rows.sort(key=lambda row: (-row['rank_points'], row['id']))
+        for row in rows:
+            LEVEL_TABLES.add_tier(row)
+        return rows
+    
     @staticmethod
     def get_leaderboard(limit=10):
         """
-        Get top players by rank score with tier information.
+        Get top players by rank score with tier information (tiers from the
+        in-memory table, not a join).
         
         Args:
             limit: Number of top players to return
@@ -18,26 +69,21 @@ class LeaderboardService:
         Returns:
             List of user records sorted by rank score with tier info
         """
-        query = """
-            SELECT 
-                u.id, 
-                u.display_name, 
-                u.xp,
-                u.level,
-                u.level as user_level, -- Alias for frontend
-                u.rank_points, 
-                u.rank_points as rank_score, -- Alias for frontend
-                r.name as rank_name,
-                r.color as rank_color,
-                t.name as tier_name,
-                t.color as tier_color
+        index = RANKING_INDEX.ready()
+        if index is not None:
+            return LeaderboardService._users_in_order(index.top(limit), LEADERBOARD_COLUMNS)
+        
+        query = f"""
+            SELECT {LEADERBOARD_COLUMNS}
             FROM users u
             LEFT JOIN ranks r ON u.rank_id = r.id
-            LEFT JOIN tiers t ON u.level BETWEEN t.min_level AND t.max_level
             ORDER BY u.rank_points DESC
             LIMIT %s
         """
-        return DatabaseQuery.execute_query(query, (limit,), fetch_all=True) or []
+        rows = DatabaseQuery.execute_query(query, (limit,), fetch_all=True) or []
+        for row in rows:
+            LEVEL_TABLES.add_tier(row)
+        return rows
     
     @staticmethod
     def get_user_rank(user_id):
@@ -50,6 +96,10 @@ class LeaderboardService:
         Returns:
             Rank position (1-based) or None if user not found
         """
+        index = RANKING_INDEX.ready()
+        if index is not None:
+            return index.rank_of(user_id)
+        
         query = """
             SELECT COUNT(*) + 1 as rank
             FROM users
@@ -79,6 +129,14 @@ class LeaderboardService:
         """
         Get players ranked near the given user.
         
+        The window starts `range_size` places above the user's rank (the
+        first of any players tied with the user) and holds up to
+        2 * range_size + 1 players, shifted down when the user is near the
+        top. Without the ranking index it is read by keyset on
+        (rank_points, id) from idx_rank_points_id: the players just above
+        the user's points, then those from the user's points down, so
+        neither query counts or skips the rows above the user.
+        
         Args:
             user_id: User's ID
             range_size: Number of players above and below to return
@@ -86,24 +144,44 @@ class LeaderboardService:
         Returns:
             List of nearby user records
         """
-        user_rank = LeaderboardService.get_user_rank(user_id)
-        if not user_rank:
+        window = range_size * 2 + 1
+        index = RANKING_INDEX.ready()
+        if index is not None:
+            user_rank = index.rank_of(user_id)
+            if not user_rank:
+                return []
+            offset = max(0, user_rank - range_size - 1)
+            return LeaderboardService._users_in_order(index.window(offset, window), NEARBY_COLUMNS)
+        
+        user = DatabaseQuery.execute_query(
+            "SELECT rank_points FROM users WHERE id = %s", (user_id,), fetch_one=True
+        )
+        if not user:
             return []
+        points = user['rank_points']
         
-        offset = max(0, user_rank - range_size - 1)
-        query = """
-            SELECT 
-                u.id, u.display_name, u.rank_points, u.level,
-                u.rank_points as rank_score, -- Alias for frontend
-                u.level as user_level, -- Alias for frontend
-                t.name as tier_name, t.color as tier_color
+        above_query = f"""
+            SELECT {NEARBY_COLUMNS}
             FROM users u
-            LEFT JOIN tiers t ON u.level BETWEEN t.min_level AND t.max_level
-            ORDER BY u.rank_points DESC
-            LIMIT %s OFFSET %s
+            WHERE u.rank_points > %s
+            ORDER BY u.rank_points ASC, u.id DESC
+            LIMIT %s
         """
-        return DatabaseQuery.execute_query(
-            query,
-            (range_size * 2 + 1, offset),
-            fetch_all=True
+        above = DatabaseQuery.execute_query(above_query, (points, range_size), fetch_all=True) or []
+        above.reverse()
+        
+        below_query = f"""
+            SELECT {NEARBY_COLUMNS}
+            FROM users u
+            WHERE u.rank_points <= %s
+            ORDER BY u.rank_points DESC, u.id ASC
+            LIMIT %s
+        """
+        below = DatabaseQuery.execute_query(
+            below_query, (points, window - len(above)), fetch_all=True
         ) or []
+        
+        rows = above + below
+        for row in rows:
+            LEVEL_TABLES.add_tier(row)
+        return rows
@@ -0,0 +1,128 @@
+"""
+In-memory copies of the game_levels and tiers reference tables.
+
+Both tables are static (at most a few hundred rows), so they are read once
+and answered from memory: the level for an XP value by bisecting the sorted
+required scores, and the tier of a level by direct index. The copies are
+reloaded after RANKING_CONFIG['reference_ttl'] seconds, or on the next
+lookup after invalidate() (call it after editing either table).
+"""
+import time
+from bisect import bisect_right
+
+from config import RANKING_CONFIG
+from database.db import DatabaseQuery
+
+# Tier reported for a level no tier covers, as RankService always has
+DEFAULT_TIER = {'name': 'Tân Thủ', 'color': '#9E9E9E', 'description': 'Người mới'}
+
+
+class LevelTables:
+    """Sorted level thresholds and a level -> tier index, with TTL refresh."""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.version = 0
+        self._loaded_version = None
+        self._loaded_at = 0.0
+        # Ascending required scores, and best_levels[i]: the highest level
+        # among the first i + 1 of them (MAX(level) WHERE required_score <= x)
+        self._scores = []
+        self._best_levels = []
+        self._tiers = []  # indexed by level; tier dict or None
+
+    def invalidate(self):
+        """Bump the version: the next lookup reloads both tables."""
+        self.version += 1
+
+    def _fresh(self):
+        if self._loaded_version != self.version or time.monotonic() - self._loaded_at > self.ttl:
+            self._load()
+
+    def _load(self):
+        levels = DatabaseQuery.execute_query(
+            "SELECT level, required_score FROM game_levels", fetch_all=True
+        )
+        tiers = DatabaseQuery.execute_query(
+            "SELECT name, color, description, min_level, max_level FROM tiers ORDER BY id", fetch_all=True
+        )
+        if levels is None or tiers is None:
+            return  # database unavailable: keep the previous copy, retry next lookup
+        self.load(levels, tiers)
+
+    def load(self, levels, tiers):
+        """
+        Replace the tables.
+
+        Args:
+            levels: game_levels rows (dicts with level, required_score)
+            tiers: tiers rows (dicts with name, color, description,
+                min_level, max_level); the first tier covering a level wins
+        """
+        scores, best_levels = [], []
+        best = 0
+        for row in sorted(levels, key=lambda row: row['required_score']):
+            best = max(best, row['level'])
+            scores.append(row['required_score'])
+            best_levels.append(best)
+
+        top = max([row['max_level'] for row in tiers] + [best, 0])
+        by_level = [None] * (top + 1)
+        for row in tiers:
+            tier = {'name': row['name'], 'color': row['color'], 'description': row['description']}
+            for level in range(max(0, row['min_level']), row['max_level'] + 1):
+                if by_level[level] is None:
+                    by_level[level] = tier
+
+        self._scores, self._best_levels, self._tiers = scores, best_levels, by_level
+        self._loaded_version = self.version
+        self._loaded_at = time.monotonic()
+
+    def ready(self):
+        """
+        Load the tables if stale; True once a copy is loaded. A failed reload
+        keeps the previous copy, so False means nothing was ever loaded.
+        """
+        self._fresh()
+        return bool(self._scores)
+
+    def level_for_xp(self, xp, refresh=True):
+        """
+        Highest level whose required score is at most `xp` (1 if none).
+
+        Args:
+            xp: XP value
+            refresh: Reload the tables first if stale; pass False after
+                ready() to never touch the database (e.g. holding row locks)
+        """
+        if refresh:
+            self._fresh()
+        i = bisect_right(self._scores, xp)
+        return self._best_levels[i - 1] if i else 1
+
+    def tier_for_level(self, level):
+        """Tier dict (name, color, description) of a level, or None."""
+        self._fresh()
+        if level is None or not 0 <= level < len(self._tiers):
+            return None
+        return self._tiers[level]
+
+    def add_tier(self, row, description=False):
+        """
+        Set a user row's tier_name and tier_color (and tier_description)
+        from its 'level', as the former LEFT JOIN on tiers did.
+
+        Returns:
+            The row (None stays None)
+        """
+        if row is None:
+            return None
+        tier = self.tier_for_level(row.get('level')) or {}
+        row['tier_name'] = tier.get('name')
+        row['tier_color'] = tier.get('color')
+        if description:
+            row['tier_description'] = tier.get('description')
+        return row
+
+
+LEVEL_TABLES = LevelTables(RANKING_CONFIG['reference_ttl'])
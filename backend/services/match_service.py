@@ -7,16 +7,34 @@ from database.db import DatabaseQuery
 class MatchService:
     """Handles match history and game result recording."""
     
+    INSERT_MATCH = """
+        INSERT INTO match_history (player1_id, player2_id, winner_id, game_type, mode, result, moves)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """
+    
+    @staticmethod
+    def match_row(player1_id, player2_id, winner_id, game_type, mode, result, moves=None):
+        """
+        Parameters of INSERT_MATCH for a completed match (arguments as for
+        save_match).
+        """
+        import json
+        moves_json = json.dumps(moves) if moves else None
+        return (player1_id, player2_id, winner_id, game_type, mode, result, moves_json)
+    
     @staticmethod
     def save_match(player1_id, player2_id, winner_id, game_type, mode, result, moves=None):
         """
         Save a completed match to history.
         
+        Ranked games are saved by RankService.settle_match, in the same
+        transaction as the rank updates.
+        
         Args:
             player1_id: ID of player 1
             player2_id: ID of player 2
             winner_id: ID of winner (None for draw)
-            game_type: 'tic-tac-toe' or 'caro'
+            game_type: Key of GAME_CONFIG ('tic-tac-toe', 'caro', ...)
             mode: 'ranked' or 'practice'
             result: 'win', 'loss', or 'draw' (Kết quả trận đấu)
             moves: List of move dicts (optional)
@@ -24,16 +42,8 @@ class MatchService:
         Returns:
             Match ID if successful, None otherwise
         """
-        import json
-        moves_json = json.dumps(moves) if moves else None
-        
-        # --- CÂU QUERY ĐÃ SỬA: Thêm cột result ---
-        query = """
-            INSERT INTO match_history (player1_id, player2_id, winner_id, game_type, mode, result, moves)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """
-        # Thêm biến result vào danh sách tham số
-        return DatabaseQuery.execute_update(query, (player1_id, player2_id, winner_id, game_type, mode, result, moves_json))
+        row = MatchService.match_row(player1_id, player2_id, winner_id, game_type, mode, result, moves)
+        return DatabaseQuery.execute_update(MatchService.INSERT_MATCH, row)
     
     @staticmethod
     def get_user_match_history(user_id, limit=20):
@@ -1,9 +1,12 @@
 """
 Ranking service: User level calculation, rank updates, level history logging.
-Database-driven implementation using game_levels and tiers tables.
+Levels and tiers come from in-memory copies of the game_levels and tiers
+tables (services.level_tables).
 """
 from database.db import DatabaseQuery, DatabaseConnection
 from mysql.connector import Error
+from services.level_tables import DEFAULT_TIER, LEVEL_TABLES
+from services.ranking_index import RANKING_INDEX
 
 
 class RankService:
@@ -12,7 +15,7 @@ class RankService:
     @staticmethod
     def get_level_from_score(xp):
         """
-        Query database to find level corresponding to XP.
+        Find the level corresponding to XP.
         Logic: Find highest level where required_score <= current XP.
         
         Args:
@@ -25,22 +28,12 @@ class RankService:
         if xp < 0:
             return 1
         
-        query = """
-            SELECT level 
-            FROM game_levels 
-            WHERE required_score <= %s 
-            ORDER BY level DESC 
-            LIMIT 1
-        """
-        result = DatabaseQuery.execute_query(query, (xp,), fetch_one=True)
-        
-        # Return level if found, else default to 1
-        return result['level'] if result else 1
+        return LEVEL_TABLES.level_for_xp(xp)
 
     @staticmethod
     def get_tier_info(level):
         """
-        Query database to get tier information based on level.
+        Get tier information based on level.
         
         Args:
             level: User's level
@@ -48,19 +41,8 @@ class RankService:
         Returns:
             Dict with tier name, color, and description
         """
-        query = """
-            SELECT name, color, description 
-            FROM tiers 
-            WHERE %s BETWEEN min_level AND max_level 
-            LIMIT 1
-        """
-        result = DatabaseQuery.execute_query(query, (level,), fetch_one=True)
-        
         # Fallback if tier not configured for this level
-        if not result:
-            return {'name': 'Tân Thủ', 'color': '#9E9E9E', 'description': 'Người mới'}
-            
-        return result
+        return dict(LEVEL_TABLES.tier_for_level(level) or DEFAULT_TIER)
     
     @staticmethod
     def log_level_change(user_id, level, xp):
@@ -99,77 +81,133 @@ class RankService:
         Returns:
             True if successful, False otherwise
         """
+        return RankService.settle_match([(user_id, rank_points_delta, xp_delta)])
+    
+    @staticmethod
+    def update_rank_batch(updates):
+        """
+        Update ranks for multiple users in a transaction.
+        
+        Args:
+            updates: List of tuples (user_id, rank_points_delta, xp_delta)
+        
+        Returns:
+            True if all updates succeed, False otherwise
+        """
+        return RankService.settle_match(updates)
+
+    @staticmethod
+    def settle_match(updates, match_row=None):
+        """
+        Apply the XP and rank point changes of a game, log level changes and
+        save the match row, all in one transaction on one connection.
+        
+        The users' rows are locked with SELECT ... FOR UPDATE (in id order,
+        so concurrent settlements cannot deadlock), new levels come from the
+        in-memory level table (loaded before locking; nothing is written if
+        it cannot be), and all users are written by a single
+        UPDATE: at most four statements whatever the user count.
+        
+        Args:
+            updates: List of tuples (user_id, rank_points_delta, xp_delta)
+            match_row: Parameters for MatchService.INSERT_MATCH (from
+                MatchService.match_row), or None to save no match
+        
+        Returns:
+            True if everything was written, False otherwise (nothing is)
+        """
+        deltas = {}
+        for user_id, rank_points_delta, xp_delta in updates:
+            delta = deltas.setdefault(user_id, [0, 0])
+            delta[0] += rank_points_delta
+            delta[1] += xp_delta
+        if not deltas and match_row is None:
+            return True
+        
+        # Levels are looked up while the rows are locked: load the table
+        # first, so that never needs a second connection or falls back to 1
+        if deltas and not LEVEL_TABLES.ready():
+            print("Error settling match: level table unavailable")
+            return False
+        
         conn = DatabaseConnection.get_connection()
         if not conn:
             return False
         
         try:
-            cursor = conn.cursor(dictionary=True)
-            
-            # 1. Get current values
-            cursor.execute("SELECT xp, level, rank_points FROM users WHERE id = %s", (user_id,))
-            user = cursor.fetchone()
-            if not user:
-                return False
-            
-            current_xp = user['xp']
-            current_level = user['level']
-            current_rank_points = user['rank_points']
-            
-            # 2. Calculate new values
-            new_xp = current_xp + xp_delta
-            new_rank_points = max(0, current_rank_points + rank_points_delta)
-            
-            # 3. Calculate new rank_id
-            from services.user_service import UserService
-            new_rank_id = UserService.calculate_rank_id(new_rank_points)
-            
-            # 4. Calculate new level from game_levels table
-            cursor.execute(
-                "SELECT level FROM game_levels WHERE required_score <= %s ORDER BY level DESC LIMIT 1", 
-                (new_xp,)
-            )
-            level_row = cursor.fetchone()
-            new_level = level_row['level'] if level_row else 1
-            
-            # 5. Update database
-            cursor.execute(
-                "UPDATE users SET xp = %s, level = %s, rank_points = %s, rank_id = %s WHERE id = %s",
-                (new_xp, new_level, new_rank_points, new_rank_id, user_id)
-            )
-            
-            # 6. If level changed -> Log history
-            if new_level != current_level:
+            cursor = conn.cursor()
+            user_ids = sorted(deltas)
+            settled = []  # (user_id, old level, new xp, new rank points, new rank_id)
+            if user_ids:
+                from services.user_service import UserService
+                placeholders = ', '.join(['%s'] * len(user_ids))
+                
+                # 1. Lock and read current values
                 cursor.execute(
-                    "INSERT INTO user_levels_history (user_id, level, xp) VALUES (%s, %s, %s)",
-                    (user_id, new_level, new_xp)
+                    f"SELECT id, xp, level, rank_points FROM users WHERE id IN ({placeholders}) "
+                    "ORDER BY id FOR UPDATE",
+                    user_ids
                 )
-                print(f"User {user_id} level changed: {current_level} -> {new_level}")
-
+                rows = cursor.fetchall()
+                if len(rows) != len(user_ids):
+                    conn.rollback()
+                    return False
+                
+                # 2. New XP, rank points, rank_id and level
+                for user_id, xp, level, rank_points in rows:
+                    rank_points_delta, xp_delta = deltas[user_id]
+                    new_rank_points = max(0, rank_points + rank_points_delta)
+                    settled.append((user_id, level, xp + xp_delta, new_rank_points,
+                                    UserService.calculate_rank_id(new_rank_points)))
+                new_levels = [LEVEL_TABLES.level_for_xp(new_xp, refresh=False) for _, _, new_xp, _, _ in settled]
+                
+                # 3. One UPDATE for every user
+                cases = {'xp': [], 'level': [], 'rank_points': [], 'rank_id': []}
+                for (user_id, _, new_xp, new_rank_points, new_rank_id), new_level in zip(settled, new_levels):
+                    cases['xp'] += [user_id, new_xp]
+                    cases['level'] += [user_id, new_level]
+                    cases['rank_points'] += [user_id, new_rank_points]
+                    cases['rank_id'] += [user_id, new_rank_id]
+                when = ' '.join(['WHEN %s THEN %s'] * len(settled))
+                cursor.execute(
+                    "UPDATE users SET "
+                    + ", ".join(f"{column} = CASE id {when} END" for column in cases)
+                    + f" WHERE id IN ({placeholders})",
+                    [value for column in cases for value in cases[column]] + user_ids
+                )
+                
+                # 4. Log level changes (executemany sends one multi-row INSERT)
+                changes = [
+                    (user_id, new_level, new_xp)
+                    for (user_id, level, new_xp, _, _), new_level in zip(settled, new_levels)
+                    if new_level != level
+                ]
+                if changes:
+                    cursor.executemany(
+                        "INSERT INTO user_levels_history (user_id, level, xp) VALUES (%s, %s, %s)",
+                        changes
+                    )
+                    for (user_id, level, _, _, _), new_level in zip(settled, new_levels):
+                        if new_level != level:
+                            print(f"User {user_id} level changed: {level} -> {new_level}")
+            
+            # 5. Save the match
+            if match_row is not None:
+                from services.match_service import MatchService
+                cursor.execute(MatchService.INSERT_MATCH, match_row)
+            
             conn.commit()
             cursor.close()
+            
+            # 6. Move the players in the leaderboard index
+            for user_id, _, _, new_rank_points, _ in settled:
+                RANKING_INDEX.update(user_id, new_rank_points)
             return True
             
         except Exception as e:
-            print(f"Error updating rank: {e}")
+            print(f"Error settling match: {e}")
             if conn:
                 conn.rollback()
             return False
         finally:
             DatabaseConnection.close_connection(conn)
-    
-    @staticmethod
-    def update_rank_batch(updates):
-        """
-        Update ranks for multiple users in a transaction.
-        
-        Args:
-            updates: List of tuples (user_id, rank_points_delta, xp_delta)
-        
-        Returns:
-            True if all updates succeed, False otherwise
-        """
-        for user_id, rank_points_delta, xp_delta in updates:
-            if not RankService.update_rank(user_id, rank_points_delta, xp_delta):
-                return False
-        return True
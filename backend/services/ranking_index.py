@@ -0,0 +1,226 @@
+"""
+In-process leaderboard ranking index.
+
+Keeps every user's rank points ordered by (rank_points DESC, id) so the
+leaderboard's top N, a user's rank and the window around a user are
+answered without sorting or counting the users table:
+
+- keys live in sorted buckets of at most 2 * LOAD entries, found by
+  bisecting the buckets' last keys;
+- a Fenwick tree over the bucket sizes turns a bucket into its first
+  position and a position into its bucket, both in O(log n).
+
+The index is built from the users table on first use and rebuilt after
+RANKING_CONFIG['index_ttl'] seconds; in between, RankService and
+UserService update it as they commit. Updates made while the rebuild's
+SELECT runs (it yields to other green threads) are also logged and
+replayed on the new contents, so a commit racing the rebuild is not lost.
+With several server processes, each one only sees its own commits until
+its next rebuild.
+"""
+import time
+from bisect import bisect_left, insort
+
+from config import RANKING_CONFIG
+from database.db import DatabaseQuery
+
+LOAD = 256
+
+
+class RankingIndex:
+    """Order-statistics index of (rank_points DESC, user id)."""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.built_at = None
+        # user_id -> rank_points (None: removed) while a rebuild is loading
+        self._replay = None
+        self._points = {}  # user_id -> rank_points
+        self._lists = []   # sorted buckets of (-rank_points, user_id)
+        self._maxes = []   # last key of each bucket
+        self._tree = []    # Fenwick tree of bucket sizes (1-based)
+
+    def __len__(self):
+        return len(self._points)
+
+    # ----- Building -----
+
+    def ready(self):
+        """
+        The index, built or rebuilt from the users table if stale; None when
+        the database is unavailable and nothing was built yet. While another
+        caller's rebuild is loading, the current contents are used.
+        """
+        stale = self.built_at is None or time.monotonic() - self.built_at > self.ttl
+        if stale and self._replay is None:
+            self._replay = {}
+            try:
+                rows = DatabaseQuery.execute_query("SELECT id, rank_points FROM users", fetch_all=True)
+                if rows is not None:
+                    self.build((row['id'], row['rank_points']) for row in rows)
+                    replay, self._replay = self._replay, None
+                    for user_id, rank_points in replay.items():
+                        if rank_points is None:
+                            self.remove(user_id)
+                        else:
+                            self.update(user_id, rank_points)
+            finally:
+                self._replay = None
+        return self if self.built_at is not None else None
+
+    def build(self, users):
+        """Replace the contents with (user_id, rank_points) pairs."""
+        self._points = dict(users)
+        keys = sorted((-points, user_id) for user_id, points in self._points.items())
+        self._lists = [keys[i:i + LOAD] for i in range(0, len(keys), LOAD)]
+        self._maxes = [bucket[-1] for bucket in self._lists]
+        self._rebuild_tree()
+        self.built_at = time.monotonic()
+
+    def invalidate(self):
+        """Rebuild from the database on the next ready()."""
+        self.built_at = None
+
+    # ----- Updates -----
+
+    def update(self, user_id, rank_points):
+        """
+        Insert a user or move it to its new rank points (call after the
+        change is committed). Ignored until the index is first built.
+        """
+        if self._replay is not None:
+            self._replay[user_id] = rank_points
+        if self.built_at is None:
+            return
+        old = self._points.get(user_id)
+        if old == rank_points:
+            return
+        if old is not None:
+            self._remove((-old, user_id))
+        self._points[user_id] = rank_points
+        self._insert((-rank_points, user_id))
+
+    def remove(self, user_id):
+        """Drop a user (no-op if absent)."""
+        if self._replay is not None:
+            self._replay[user_id] = None
+        if self.built_at is None:
+            return
+        old = self._points.pop(user_id, None)
+        if old is not None:
+            self._remove((-old, user_id))
+
+    # ----- Queries -----
+
+    def rank_of(self, user_id):
+        """
+        1-based rank as the leaderboard SQL defines it: one more than the
+        number of users with strictly more rank points (ties share a rank).
+        None for an unknown user.
+        """
+        points = self._points.get(user_id)
+        if points is None:
+            return None
+        return self._count_below((-points,)) + 1
+
+    def window(self, offset, count):
+        """User ids at positions [offset, offset + count) of the ranking."""
+        if count <= 0 or offset >= len(self._points):
+            return []
+        i, j = self._locate(max(0, offset))
+        ids = []
+        while i < len(self._lists) and len(ids) < count:
+            bucket = self._lists[i]
+            for key in bucket[j:j + count - len(ids)]:
+                ids.append(key[1])
+            i, j = i + 1, 0
+        return ids
+
+    def top(self, count):
+        """User ids of the `count` best-ranked users."""
+        return self.window(0, count)
+
+    # ----- Buckets -----
+
+    def _insert(self, key):
+        if not self._lists:
+            self._lists.append([key])
+            self._maxes.append(key)
+            self._rebuild_tree()
+            return
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            i -= 1
+            self._lists[i].append(key)
+            self._maxes[i] = key
+        else:
+            insort(self._lists[i], key)
+        bucket = self._lists[i]
+        if len(bucket) > 2 * LOAD:
+            self._lists.insert(i + 1, bucket[LOAD:])
+            del bucket[LOAD:]
+            self._maxes[i] = bucket[-1]
+            self._maxes.insert(i + 1, self._lists[i + 1][-1])
+            self._rebuild_tree()
+        else:
+            self._tree_add(i, 1)
+
+    def _remove(self, key):
+        i = bisect_left(self._maxes, key)
+        bucket = self._lists[i]
+        del bucket[bisect_left(bucket, key)]
+        if bucket:
+            self._maxes[i] = bucket[-1]
+            self._tree_add(i, -1)
+        else:
+            del self._lists[i]
+            del self._maxes[i]
+            self._rebuild_tree()
+
+    def _count_below(self, key):
+        """Number of keys smaller than `key`."""
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return len(self._points)
+        return self._prefix(i) + bisect_left(self._lists[i], key)
+
+    def _locate(self, position):
+        """(bucket, offset in bucket) of a position; past the end if too large."""
+        tree = self._tree
+        i = 0
+        step = 1 << (len(tree).bit_length() - 1) if tree else 0
+        while step:
+            nxt = i + step
+            if nxt < len(tree) and tree[nxt] <= position:
+                position -= tree[nxt]
+                i = nxt
+            step >>= 1
+        return i, position
+
+    # ----- Fenwick tree over bucket sizes -----
+
+    def _rebuild_tree(self):
+        tree = [0] * (len(self._lists) + 1)
+        for i, bucket in enumerate(self._lists, 1):
+            tree[i] += len(bucket)
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, i, delta):
+        i += 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, i):
+        """Total size of the first `i` buckets."""
+        total = 0
+        while i:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+
+RANKING_INDEX = RankingIndex(RANKING_CONFIG['index_ttl'])
@@ -2,6 +2,8 @@
 User service: Authentication, profile management, password changes.
 """
 from database.db import DatabaseQuery
+from services.level_tables import LEVEL_TABLES
+from services.ranking_index import RANKING_INDEX
 from werkzeug.security import generate_password_hash, check_password_hash
 
 
@@ -67,7 +69,8 @@ class UserService:
     @staticmethod
     def get_user_with_rank_tier(user_id):
         """
-        Get user with rank and tier information via JOINs.
+        Get user with rank information via JOIN and tier information from
+        the in-memory tier table.
         
         Args:
             user_id: User's ID
@@ -82,15 +85,12 @@ class UserService:
                 u.level as user_level, -- Alias for frontend
                 r.name as rank_name,
                 r.name as rank_level,  -- Alias for frontend compatibility
-                r.color as rank_color,
-                t.name as tier_name,
-                t.color as tier_color
+                r.color as rank_color
             FROM users u
             LEFT JOIN ranks r ON u.rank_id = r.id
-            LEFT JOIN tiers t ON u.level BETWEEN t.min_level AND t.max_level
             WHERE u.id = %s
         """
-        return DatabaseQuery.execute_query(query, (user_id,), fetch_one=True)
+        return LEVEL_TABLES.add_tier(DatabaseQuery.execute_query(query, (user_id,), fetch_one=True))
     
     @staticmethod
     def get_user_by_username(username):
@@ -132,6 +132,7 @@ class UserService:
         user_id = DatabaseQuery.execute_update(query, params)
         
         if user_id:
+            RANKING_INDEX.update(user_id, 0)
             return UserService.get_user_with_rank_tier(user_id)
         return None
         return None
@@ -207,12 +208,10 @@ class UserService:
                 u.xp, u.level, u.rank_points, 
                 u.rank_points as rank_score, -- Alias for frontend compatibility
                 u.level as user_level, -- Alias for frontend compatibility
-                u.created_at,
-                t.name as tier_name,
-                t.color as tier_color,
-                t.description as tier_description
+                u.created_at
             FROM users u
-            LEFT JOIN tiers t ON u.level BETWEEN t.min_level AND t.max_level
             WHERE u.id = %s
         """
-        return DatabaseQuery.execute_query(query, (user_id,), fetch_one=True)
+        return LEVEL_TABLES.add_tier(
+            DatabaseQuery.execute_query(query, (user_id,), fetch_one=True), description=True
+        )
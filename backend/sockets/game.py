@@ -3,8 +3,11 @@ Game socket handlers: Move processing, AI moves, game end handling.
 """
 from flask import request
 from flask_socketio import emit
+from config import SOCKET_CONFIG
 from game.engine import GameEngine
 from game.ai import AIPlayer
+from game.ai_executor import get_ai_executor, AIExecutorBusy
+from game.rules import game_family
 from services.rank_service import RankService
 from services.match_service import MatchService
 from sockets.state import get_games, SID_TO_ROOM
@@ -33,43 +36,37 @@ def register_game_handlers(socketio):
             return
         
         # Validate move
-        if game['turn'] != player:
+        if game.turn != player:
             return
         
-        if not GameEngine.is_valid_move(game['board'], r, c):
+        if not GameEngine.is_valid_move(game.board, r, c):
             return
         
         # Apply move
-        GameEngine.apply_move(game['board'], r, c, player)
+        GameEngine.apply_move(game.board, r, c, player)
         
         # Record history
-        game['history'].append({'r': r, 'c': c, 'player': player})
+        game.record_move(r, c, player)
         
         # Check winner
         winner, winning_line = GameEngine.check_winner(
-            game['board'],
-            game['type'],
+            game.board,
+            game.game_type,
             {'r': r, 'c': c}
         )
         
         # Update turn
         next_player = 2 if player == 1 else 1
-        game['turn'] = next_player
+        game.turn = next_player
         
         # Broadcast game update
-        emit('game_update', {
-            'board': game['board'],
-            'currentPlayer': next_player,
-            'winner': winner,
-            'winningLine': winning_line,
-            'lastMove': {'r': r, 'c': c}
-        }, room=room_id)
+        _send_update(emit, game, [[r, c, player]], next_player, winner, winning_line, {'r': r, 'c': c})
         
         # Handle end game
         if winner != 0:
             _handle_end_game(game, winner)
         # Handle AI move for practice mode
-        elif game['mode'] == 'practice' and next_player == 2:
+        elif game.mode == 'practice' and next_player == 2:
             _handle_ai_move(socketio, room_id, game)
     
     @socketio.on('send_chat')
@@ -129,32 +126,25 @@ def register_game_handlers(socketio):
             return
             
         # Perform Undo
-        if not game['history']:
-            return
-            
         # 1. Get last move
-        last_move = game['history'].pop()
-        r, c = last_move['r'], last_move['c']
-        prev_player = last_move['player']
+        last_move = game.pop_move()
+        if last_move is None:
+            return
+        r, c, prev_player = last_move
         
-        # 2. Undo on board
-        GameEngine.undo_move(game['board'], r, c)
+        # 2. Undo on board (a bot move still being computed is now stale)
+        _cancel_ai(room_id, game)
+        GameEngine.undo_move(game.board, r, c)
         
         # 3. Revert turn
-        game['turn'] = prev_player
+        game.turn = prev_player
         
         # 4. Update last move for UI (need the move BEFORE the one we just undid)
         # If history is empty, lastMove is None.
-        new_last_move = game['history'][-1] if game['history'] else None
+        new_last_move = game.last_move()
         
-        # 5. Broadcast update
-        emit('game_update', {
-            'board': game['board'],
-            'currentPlayer': game['turn'],
-            'winner': 0, # Assume undoing clears winner state if any
-            'winningLine': None,
-            'lastMove': new_last_move
-        }, room=room_id)
+        # 5. Broadcast update (undoing clears the winner state if any)
+        _send_update(emit, game, [[r, c, 0]], game.turn, 0, None, new_last_move)
 
     @socketio.on('claim_timeout')
     def handle_timeout(data):
@@ -169,20 +159,25 @@ def register_game_handlers(socketio):
             return
             
         # Determine winner
-        current_turn = game['turn']
+        current_turn = game.turn
         winner = 2 if current_turn == 1 else 1
         
-        # Broadcast game end
-        emit('game_update', {
-            'board': game['board'],
-            'currentPlayer': 0, # Game over
-            'winner': winner,
-            'winningLine': None,
-            'lastMove': None
-        }, room=room_id)
+        # Broadcast game end (currentPlayer 0: game over)
+        _send_update(emit, game, [], 0, winner, None, None)
         
         _handle_end_game(game, winner)
 
+    @socketio.on('request_sync')
+    def handle_sync_request(data):
+        """
+        Send the full board to a delta-protocol client that missed an update.
+        """
+        room_id = data.get('roomId')
+        game = get_games().get(room_id)
+        if not game or game.player_of(request.sid) is None:
+            return
+        emit('game_update', _snapshot(game))
+
     @socketio.on('leave_game')
     def handle_leave_game(data):
         """
@@ -214,108 +209,176 @@ def _handle_player_leave(room_id, sid):
         print(f'[_handle_player_leave] Game not found for room {room_id}')
         return
     
-    if 'winner' not in game:
-        game['winner'] = 0
-        
-    if game.get('winner', 0) != 0:
-        print(f'[_handle_player_leave] Game already over, winner={game.get("winner")}')
+    if game.winner != 0:
+        print(f'[_handle_player_leave] Game already over, winner={game.winner}')
         return
 
-    leaver_player = None
-    if 'sids' in game:
-        for p_num, p_sid in game['sids'].items():
-            if p_sid == sid:
-                leaver_player = p_num
-                break
+    leaver_player = game.player_of(sid)
     
     if leaver_player is None:
         print(f'[_handle_player_leave] Could not identify leaver')
         return
 
+    _cancel_ai(room_id, game)
+
     winner = 2 if leaver_player == 1 else 1
-    game['winner'] = winner
+    game.winner = winner
     
-    emit('game_update', {
-        'board': game['board'],
-        'currentPlayer': 0, # Game over
-        'winner': winner,
-        'winningLine': None,
-        'lastMove': None
-    }, room=room_id)
+    _send_update(emit, game, [], 0, winner, None, None)  # currentPlayer 0: game over
     
     _handle_end_game(game, winner)
 
 
+def _snapshot(game):
+    """Full game_update payload: the board and the latest update's fields."""
+    payload = dict(game.last_update)
+    payload['board'] = game.grid()
+    payload['seq'] = game.seq
+    return payload
+
+
+def _send_update(send, game, cells, current_player, winner, winning_line, last_move):
+    """
+    Send a game_update to both players in the protocol each negotiated.
+
+    Full-protocol clients get the whole board as before. Delta-protocol
+    clients get only `cells` ([r, c, player] triples; player 0 clears the
+    cell) and the update's sequence number, which grows by one per update;
+    every SOCKET_CONFIG['snapshot_interval']-th update carries the full
+    board for them too. A client that sees a gap in `seq` asks for a
+    snapshot with 'request_sync'.
+
+    Args:
+        send: flask_socketio.emit inside a handler, socketio.emit in a
+            background task
+    """
+    game.seq += 1
+    game.last_update = {
+        'currentPlayer': current_player,
+        'winner': winner,
+        'winningLine': winning_line,
+        'lastMove': last_move
+    }
+    snapshot_due = game.seq % SOCKET_CONFIG['snapshot_interval'] == 0
+    snapshot = None
+    for player in (1, 2):
+        sid = game.sids[player]
+        if sid == 'ai':
+            continue
+        if game.protocols[player] == 'delta' and not snapshot_due:
+            payload = dict(game.last_update, seq=game.seq, cells=cells)
+        else:
+            if snapshot is None:
+                snapshot = _snapshot(game)  # serialized once for every full client
+            payload = snapshot
+        send('game_update', payload, to=sid)
+
+
 def _handle_end_game(game, winner):
     """
     Handle game end: update ranks and save match history.
     """
-    if game['mode'] == 'ranked' and winner != 0:
-        match_result = 'draw' # Mặc định
+    if game.mode == 'ranked' and winner != 0:
+        p1_uid = game.players[1]
+        p2_uid = game.players[2]
+        winner_uid = None
 
-        # Update ranks and XP
+        # Rank and XP changes
         if winner == 'draw':
-            p1_uid = game['players'][1]
-            p2_uid = game['players'][2]
-            RankService.update_rank(p1_uid, 0, 25)
-            RankService.update_rank(p2_uid, 0, 25)
+            updates = [(p1_uid, 0, 25), (p2_uid, 0, 25)]
             match_result = 'draw'
         else:
-            winner_uid = game['players'][winner]
-            loser_uid = game['players'][3 - winner]
-            RankService.update_rank(winner_uid, 25, 50)
-            RankService.update_rank(loser_uid, -10, 15)
+            winner_uid = game.players[winner]
+            loser_uid = game.players[3 - winner]
+            updates = [(winner_uid, 25, 50), (loser_uid, -10, 15)]
             match_result = 'win'
         
-        # Save match history
-        winner_uid = None
-        if winner != 'draw':
-            winner_uid = game['players'][winner]
-        
-        p1_uid = game['players'][1]
-        p2_uid = game['players'][2]
-        
-        # Gọi hàm save_match với tham số match_result mới tính được
-        MatchService.save_match(
-            p1_uid, 
-            p2_uid, 
-            winner_uid, 
-            game['type'], 
-            game['mode'], 
-            match_result,  # <-- Đã thêm biến này
-            game['history']
+        # Update ranks, log level changes and save match history in one transaction
+        RankService.settle_match(
+            updates,
+            MatchService.match_row(
+                p1_uid,
+                p2_uid,
+                winner_uid,
+                game.game_type,
+                game.mode,
+                match_result,
+                game.history_json()
+            )
         )
 
 
+def _cancel_ai(room_id, game):
+    """Drop the bot's move being computed for a room and stop its pondering."""
+    get_ai_executor().cancel(room_id)
+    if game.ai_ponder is not None:
+        game.ai_ponder.stop()
+
+
 def _handle_ai_move(socketio, room_id, game):
-    """Handle AI move for practice mode with tuned delay per difficulty/game type."""
-    difficulty = game.get('difficulty', 'medium')
+    """Schedule the bot's reply for practice mode without blocking the handler."""
+    socketio.start_background_task(_run_ai_move, socketio, room_id, game)
+
+
+def _run_ai_move(socketio, room_id, game):
+    """
+    Compute and play the bot's move in a background task.
 
-    if game['type'] == 'tic-tac-toe' or difficulty == 'easy':
+    The search runs on the AI executor, so only this green thread waits.
+    The result is dropped if the room was cancelled (undo, player left) or
+    the game moved on while the bot was thinking: any game_update sent
+    meanwhile (e.g. an undo and a new human move, which make it the bot's
+    turn again) bumps `seq`. A move pondered during the human's turn is
+    played without searching again.
+    """
+    difficulty = game.difficulty
+    ponder = game.ai_ponder
+    seq = game.seq  # the position `board` was taken from
+    board = game.grid()
+    ai_move = ponder.take(board) if ponder is not None else None
+
+    if game_family(game.game_type) == 'tic-tac-toe' or difficulty == 'easy':
         socketio.sleep(0.5)
     else:
         socketio.sleep(0.1)
 
-    ai_move = AIPlayer.get_ai_move(game['board'], game['type'], difficulty)
-    
+    if ai_move is None:
+        try:
+            ai_move = get_ai_executor().compute(
+                room_id, board, game.game_type, difficulty, game.ai_context
+            )
+        except AIExecutorBusy as e:
+            # Overloaded: answer with the cheap random-neighbour move instead of queueing
+            print(f'[AI] Executor busy for room {room_id}: {e}')
+            ai_move = AIPlayer.get_ai_move(board, game.game_type, 'easy')
+
     if not ai_move:
         return
+    if get_games().get(room_id) is not game or game.seq != seq or game.turn != 2 or game.winner != 0:
+        return  # stale result
     
     ar, ac = ai_move
-    GameEngine.apply_move(game['board'], ar, ac, 2)
+    if not GameEngine.apply_move(game.board, ar, ac, 2):
+        return
     
     ai_winner, ai_line = GameEngine.check_winner(
-        game['board'],
-        game['type'],
+        game.board,
+        game.game_type,
         {'r': ar, 'c': ac}
     )
     
-    game['turn'] = 1
+    game.turn = 1
     
-    emit('game_update', {
-        'board': game['board'],
-        'currentPlayer': 1,
-        'winner': ai_winner,
-        'winningLine': ai_line,
-        'lastMove': {'r': ar, 'c': ac}
-    }, room=room_id)
+    _send_update(socketio.emit, game, [[ar, ac, 2]], 1, ai_winner, ai_line, {'r': ar, 'c': ac})
+
+    if ai_winner == 0 and ponder is not None:
+        socketio.start_background_task(_run_ponder, room_id, game)
+
+
+def _run_ponder(room_id, game):
+    """Search the bot's answers to the human's likely replies (background task)."""
+    if get_games().get(room_id) is not game or game.turn != 1:
+        return
+    game.ai_ponder.run(
+        get_ai_executor(), room_id, game.grid(), game.game_type, game.difficulty
+    )
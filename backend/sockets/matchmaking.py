@@ -3,7 +3,11 @@ Matchmaking socket handlers: Queue management and match finding.
 """
 from flask import request
 from flask_socketio import emit, join_room
-from game.engine import GameEngine
+from game.ai_executor import get_ai_executor
+from game.game_state import GameState
+from game.ponder import create_ponderer
+from game.rules import game_family
+from game.search_context import SearchContext
 from services.user_service import UserService
 from sockets.state import games, matchmaking_queue, SID_TO_ROOM
 
@@ -18,14 +22,17 @@ def register_matchmaking_handlers(socketio):
         
         Data:
             - userId: int
-            - type: 'tic-tac-toe' or 'caro'
+            - type: A GAME_CONFIG key ('tic-tac-toe', 'caro', 'gomoku', ...)
             - mode: 'ranked' or 'practice'
             - difficulty: 'easy', 'medium', 'hard' (for practice)
+            - protocol: 'delta' for move-delta game_update payloads
+              (optional; older clients get the full board every move)
         """
         user_id = data.get('userId')
         game_type = data.get('type')
         mode = data.get('mode')
         difficulty = data.get('difficulty')
+        protocol = 'delta' if data.get('protocol') == 'delta' else 'full'
         
         # Get player's display name
         user = UserService.get_user_by_id(user_id)
@@ -33,14 +40,14 @@ def register_matchmaking_handlers(socketio):
         
         # --- PRACTICE MODE ---
         if mode == 'practice':
-            _handle_practice_mode(socketio, user_id, game_type, difficulty, current_user_name)
+            _handle_practice_mode(socketio, user_id, game_type, difficulty, current_user_name, protocol)
             return
         
         # --- RANKED MODE ---
-        _handle_ranked_mode(socketio, user_id, game_type, current_user_name)
+        _handle_ranked_mode(socketio, user_id, game_type, current_user_name, protocol)
 
 
-def _handle_practice_mode(socketio, user_id, game_type, difficulty, user_name):
+def _handle_practice_mode(socketio, user_id, game_type, difficulty, user_name, protocol):
     """Handle practice mode match creation."""
     import uuid
     
@@ -48,31 +55,35 @@ def _handle_practice_mode(socketio, user_id, game_type, difficulty, user_name):
     join_room(room_id)
     SID_TO_ROOM[request.sid] = room_id
     
-    board = GameEngine.create_board(game_type)
-    games[room_id] = {
-        'board': board,
-        'turn': 1,
-        'players': {1: user_id, 2: 'AI'},
-        'sids': {1: request.sid, 2: 'ai'},
-        'type': game_type,
-        'mode': 'practice',
-        'difficulty': difficulty,
-        'history': []
-    }
+    # Transposition table etc. reused across the bot's turns in this game;
+    # only in-process executors use it (worker processes keep their own)
+    context = None
+    if game_family(game_type) == 'caro' and get_ai_executor().in_process:
+        context = SearchContext()
+    game = GameState(
+        game_type, 'practice', (user_id, 'AI'), (request.sid, 'ai'), (protocol, 'full'),
+        difficulty=difficulty,
+        ai_context=context,
+        # Searches the bot's answers while the human thinks (or None)
+        ai_ponder=create_ponderer(game_type, difficulty, context)
+    )
+    games[room_id] = game
     
     emit('match_found', {
         'roomId': room_id,
         'opponent': {'display_name': f'Bot AI ({difficulty})', 'id': 'ai'},
         'firstTurn': 1,
-        'board': board,
+        'board': game.grid(),
         'gameType': game_type,
         'mode': 'practice',
         'playerNumber': 1,
-        'difficulty': difficulty
+        'difficulty': difficulty,
+        'seq': game.seq,
+        'protocol': protocol
     })
 
 
-def _handle_ranked_mode(socketio, user_id, game_type, user_name):
+def _handle_ranked_mode(socketio, user_id, game_type, user_name, protocol):
     """Handle ranked mode matchmaking."""
     import uuid
     queue = matchmaking_queue[game_type]
@@ -82,7 +93,8 @@ def _handle_ranked_mode(socketio, user_id, game_type, user_name):
         
         # Don't match player with themselves
         if opponent['userId'] == user_id:
-            queue.append({'userId': user_id, 'sid': request.sid, 'display_name': user_name})
+            queue.append({'userId': user_id, 'sid': request.sid, 'display_name': user_name,
+                      'protocol': protocol})
             return
         
         # Create match
@@ -93,16 +105,12 @@ def _handle_ranked_mode(socketio, user_id, game_type, user_name):
         SID_TO_ROOM[request.sid] = room_id
         SID_TO_ROOM[opponent['sid']] = room_id
         
-        board = GameEngine.create_board(game_type)
-        games[room_id] = {
-            'board': board,
-            'turn': 1,
-            'players': {1: opponent['userId'], 2: user_id},
-            'sids': {1: opponent['sid'], 2: request.sid},
-            'type': game_type,
-            'mode': 'ranked',
-            'history': []
-        }
+        game = GameState(
+            game_type, 'ranked', (opponent['userId'], user_id), (opponent['sid'], request.sid),
+            (opponent['protocol'], protocol)
+        )
+        games[room_id] = game
+        board = game.grid()
         
         # Notify Player 2 (current player)
         emit('match_found', {
@@ -112,7 +120,9 @@ def _handle_ranked_mode(socketio, user_id, game_type, user_name):
             'board': board,
             'gameType': game_type,
             'mode': 'ranked',
-            'playerNumber': 2
+            'playerNumber': 2,
+            'seq': game.seq,
+            'protocol': protocol
         }, room=request.sid)
         
         # Notify Player 1 (opponent from queue)
@@ -123,8 +133,11 @@ def _handle_ranked_mode(socketio, user_id, game_type, user_name):
             'board': board,
             'gameType': game_type,
             'mode': 'ranked',
-            'playerNumber': 1
+            'playerNumber': 1,
+            'seq': game.seq,
+            'protocol': opponent['protocol']
         }, room=opponent['sid'])
     else:
         # Add to queue
-        queue.append({'userId': user_id, 'sid': request.sid, 'display_name': user_name})
+        queue.append({'userId': user_id, 'sid': request.sid, 'display_name': user_name,
+                      'protocol': protocol})
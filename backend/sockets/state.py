@@ -1,14 +1,12 @@
 """
 Shared state for socket modules to avoid circular imports.
 """
+from config import GAME_CONFIG
 
-# Global matchmaking queue
-matchmaking_queue = {
-    'tic-tac-toe': [],
-    'caro': []
-}
+# Global matchmaking queue, one per game type
+matchmaking_queue = {game_type: [] for game_type in GAME_CONFIG}
 
-# Global games state
+# Global games state: room_id -> GameState
 games = {}
 
 # Global mapping for disconnect handling
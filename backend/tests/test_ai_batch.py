@@ -0,0 +1,64 @@
+import unittest
+import subprocess
+import sys
+import os
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from game.ai import AIPlayer
+from game.ai_batch import play_games, solve_batch, swap_colors
+from game.engine import GameEngine
+
+
+def _caro_board(player=1):
+    board = GameEngine.create_board('caro')
+    for col in range(0, 4):
+        board[10][col] = player
+    return board
+
+
+class TestAIBatch(unittest.TestCase):
+    def test_batch_matches_single_moves(self):
+        ttt = [[1, 1, 0], [0, 2, 0], [0, 0, 0]]
+        requests = [(_caro_board(), 'caro', 'hard'), (ttt, 'tic-tac-toe', 'hard')]
+        results = solve_batch(requests, workers=1)
+        self.assertEqual([move for move, _ in results], [
+            AIPlayer.get_ai_move(_caro_board(), 'caro', 'hard'),
+            AIPlayer.get_ai_move(ttt, 'tic-tac-toe', 'hard'),
+        ])
+        self.assertEqual(results[0][1].game_type, 'caro')
+
+    def test_batch_for_player_one(self):
+        # Player 1 owns the open four: it completes the five
+        move, _ = solve_batch([(_caro_board(1), 'caro', 'hard', 1)], workers=1)[0]
+        self.assertEqual(move, (10, 4))
+        self.assertEqual(swap_colors([[1, 0, 2]]), [[2, 0, 1]])
+
+    def test_batch_in_worker_processes(self):
+        # A fresh interpreter: other test modules import the eventlet-patched app
+        script = (
+            "from game.ai_batch import solve_batch\n"
+            "if __name__ == '__main__':\n"
+            "    requests = [([[1, 1, 0], [0, 2, 0], [0, 0, 0]], 'tic-tac-toe', 'hard')] * 4\n"
+            "    print([move for move, _ in solve_batch(requests, workers=2)])\n"
+        )
+        backend = os.path.join(os.path.dirname(__file__), '..')
+        result = subprocess.run([sys.executable, '-c', script], cwd=backend,
+                                capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.stdout.strip(), str([(0, 2)] * 4), result.stderr)
+
+    def test_perfect_tic_tac_toe_self_play_draws(self):
+        report = play_games(4, 'tic-tac-toe', 'hard', 'hard', workers=1)
+        self.assertEqual(report['draws'], 4)
+        self.assertEqual(report['moves'], 4 * 9)
+        self.assertGreater(report['moves_per_second'], 0)
+
+    def test_hard_beats_easy(self):
+        report = play_games(6, 'tic-tac-toe', 'hard', 'easy', workers=1)
+        self.assertEqual(report['wins_b'], 0)
+        self.assertEqual(report['wins_a'] + report['draws'], 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import unittest
+import multiprocessing
+import time
+import sys
+import os
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from eventlet import patcher
+from unittest.mock import patch
+from config import AI_CONFIG
+from game.ai_executor import (
+    AIExecutorBusy, BoardSlab, InlineAIExecutor, ProcessPoolAIExecutor, _Job,
+    board_slot_size, decode_board, encode_board, worker_loop
+)
+from game.engine import GameEngine
+
+
+def _caro_board():
+    board = GameEngine.create_board('caro')
+    for col in range(0, 4):
+        board[10][col] = 1
+    return board
+
+
+class _CancellingExecutor(InlineAIExecutor):
+    """Cancels its own room while the search is running."""
+
+    def _run(self, job, room_id, board, game_type, difficulty, context):
+        self.cancel(room_id)
+        return super()._run(job, room_id, board, game_type, difficulty, context)
+
+
+class TestAIExecutor(unittest.TestCase):
+    def test_board_encoding_round_trip(self):
+        board = _caro_board()
+        data = encode_board(board)
+        self.assertEqual(len(data), 15 * 20)
+        self.assertEqual(decode_board(data, 15, 20), board)
+
+    def test_board_slab_round_trip(self):
+        slab = BoardSlab(2, board_slot_size())
+        try:
+            board = _caro_board()
+            small = [[1, 0, 2], [0, 2, 0], [1, 0, 0]]
+            slab.write(0, board)
+            slab.write(1, small)
+            other = BoardSlab(2, slab.slot_size, slab.name)  # as a worker attaches
+            try:
+                self.assertEqual(other.read(0, 15, 20), board)
+                self.assertEqual(other.read(1, 3, 3), small)
+            finally:
+                other.close()
+            self.assertFalse(slab.fits([[0] * (slab.slot_size + 1)]))
+        finally:
+            slab.unlink()
+
+    def test_inline_compute(self):
+        executor = InlineAIExecutor()
+        move = executor.compute('room', _caro_board(), 'caro', 'hard')
+        self.assertEqual(move, (10, 4))
+        self.assertEqual(executor.pending, 0)
+
+    def test_cancelled_result_is_dropped(self):
+        executor = _CancellingExecutor()
+        self.assertIsNone(executor.compute('room', _caro_board(), 'caro', 'medium'))
+
+    def test_bounded_queue(self):
+        executor = InlineAIExecutor(max_pending=0)
+        with self.assertRaises(AIExecutorBusy):
+            executor.compute('room', _caro_board(), 'caro', 'medium')
+
+    def test_process_pool_round_trip(self):
+        executor = ProcessPoolAIExecutor(workers=1)
+        try:
+            move = executor.compute('room', _caro_board(), 'caro', 'hard')
+            self.assertEqual(move, (10, 4))
+            board = GameEngine.create_board('tic-tac-toe')
+            board[0][0] = board[0][1] = 1
+            self.assertEqual(executor.compute('room-2', board, 'tic-tac-toe', 'hard'), (0, 2))
+        finally:
+            executor.shutdown()
+
+
+class TestPonderStop(unittest.TestCase):
+    def setUp(self):
+        self.slab = BoardSlab(1, board_slot_size())
+
+    def tearDown(self):
+        self.slab.unlink()
+
+    def test_cancel_sets_the_stop_byte(self):
+        executor = ProcessPoolAIExecutor(workers=1)
+        executor._slab = self.slab
+        job = _Job(ponder=True)
+        job.slot = 0  # running on the worker of slot 0
+        executor._active[('ponder', 'room')] = job
+        executor.cancel('room')  # the real move: not the ponder job
+        self.assertFalse(self.slab.stop_requested(0))
+        executor.cancel('room', ponder=True)
+        self.assertTrue(job.cancelled)
+        self.assertTrue(self.slab.stop_requested(0))
+
+    def test_cancelling_a_real_move_sets_the_stop_byte(self):
+        executor = ProcessPoolAIExecutor(workers=1)
+        executor._slab = self.slab
+        job = _Job()
+        job.slot = 0
+        executor._active['room'] = job
+        executor.cancel('room')  # undo, timeout, game over
+        self.assertTrue(self.slab.stop_requested(0))
+
+    def test_worker_abandons_stopped_searches(self):
+        board = GameEngine.create_board('caro')
+        for r, c, player in ((7, 7, 1), (7, 8, 2), (8, 8, 1), (6, 6, 2)):
+            board[r][c] = player
+        self.slab.write(0, board)
+        parent, child = multiprocessing.Pipe()
+        # Deep enough and unhurried: only the stop byte can end these searches
+        hard = {'max_depth': 60, 'time_budget_ms': 60000}
+        with patch.dict(AI_CONFIG['search'], {'hard': hard}):
+            # A native thread even once app.py has monkey-patched threading
+            worker = patcher.original('threading').Thread(
+                target=worker_loop,
+                args=(child, 4, self.slab.name, 1, self.slab.slot_size, 0)
+            )
+            worker.start()
+            try:
+                for ponder in (True, False):
+                    self.slab.set_stop(0, False)  # as the parent does per job
+                    parent.send(('room', 'caro', 'hard', 15, 15, None, ponder))
+                    time.sleep(0.3)
+                    started = time.perf_counter()
+                    self.slab.set_stop(0, True)
+                    self.assertTrue(parent.poll(10), ponder)
+                    move, _ = parent.recv()
+                    self.assertLess(time.perf_counter() - started, 5)
+                    self.assertEqual(board[move[0]][move[1]], 0)
+            finally:
+                parent.send(None)
+                worker.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
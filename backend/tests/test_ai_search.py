@@ -0,0 +1,49 @@
+import unittest
+import time
+import sys
+import os
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import config
+from game.ai import AIPlayer
+from game.engine import GameEngine
+from game.search_context import SearchContext
+
+
+def _midgame_board():
+    board = GameEngine.create_board('caro')
+    stones = [(7, 9, 1), (7, 10, 2), (8, 10, 1), (6, 8, 2), (8, 9, 1),
+              (9, 9, 2), (6, 11, 1), (8, 11, 2), (5, 10, 1), (7, 12, 2)]
+    for r, c, p in stones:
+        board[r][c] = p
+    return board
+
+
+class TestIterativeDeepening(unittest.TestCase):
+    def setUp(self):
+        self.saved = dict(config.AI_CONFIG['search']['hard'])
+
+    def tearDown(self):
+        config.AI_CONFIG['search']['hard'].update(self.saved)
+
+    def test_hard_move_respects_time_budget(self):
+        config.AI_CONFIG['search']['hard'].update({'max_depth': 20, 'time_budget_ms': 150})
+        board = _midgame_board()
+        start = time.perf_counter()
+        move = AIPlayer.get_ai_move(board, 'caro', 'hard', SearchContext())
+        elapsed = time.perf_counter() - start
+        self.assertEqual(board[move[0]][move[1]], 0)
+        # One leaf batch past the deadline is allowed, not a whole extra depth
+        self.assertLess(elapsed, 0.6)
+
+    def test_board_is_not_modified(self):
+        board = _midgame_board()
+        snapshot = [row[:] for row in board]
+        AIPlayer.get_ai_move(board, 'caro', 'hard')
+        self.assertEqual(board, snapshot)
+
+
+if __name__ == '__main__':
+    unittest.main()
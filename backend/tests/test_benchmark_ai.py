@@ -0,0 +1,47 @@
+import unittest
+import sys
+import os
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmark_ai import compare, load_positions, percentile, run_benchmark
+from config import GAME_CONFIG
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_corpus_covers_every_category(self):
+        positions = load_positions()
+        for game_type in ('caro', 'tic-tac-toe'):
+            shape = (GAME_CONFIG[game_type]['rows'], GAME_CONFIG[game_type]['cols'])
+            found = {p['category'] for p in positions if p['game_type'] == game_type}
+            self.assertEqual(found, {'opening', 'midgame', 'endgame', 'threat'})
+            for p in positions:
+                if p['game_type'] == game_type:
+                    self.assertEqual((len(p['board']), len(p['board'][0])), shape, p['name'])
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7.0], 95), 7.0)
+
+    def test_compare_flags_slowdowns(self):
+        baseline = {'caro': {'hard': {'p95_ms': 100.0, 'nodes_per_second': 10000.0}}}
+        same = {'caro': {'hard': {'p95_ms': 110.0, 'nodes_per_second': 9000.0}}}
+        slower = {'caro': {'hard': {'p95_ms': 200.0, 'nodes_per_second': 5000.0}}}
+        self.assertEqual(compare(same, baseline), [])
+        self.assertEqual(len(compare(slower, baseline)), 2)
+        self.assertEqual(compare({'caro': {'easy': same['caro']['hard']}}, baseline), [])
+
+    def test_run_reports_percentiles(self):
+        positions = [p for p in load_positions() if p['game_type'] == 'tic-tac-toe']
+        report = run_benchmark(positions, ('hard',), repeats=2)
+        metrics = report['tic-tac-toe']['hard']
+        self.assertEqual(metrics['moves'], 2 * len(positions))
+        self.assertLessEqual(metrics['p50_ms'], metrics['p95_ms'])
+        self.assertLessEqual(metrics['p95_ms'], metrics['p99_ms'])
+
+
+if __name__ == '__main__':
+    unittest.main()
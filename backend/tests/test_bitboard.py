@@ -0,0 +1,84 @@
+import unittest
+import random
+import sys
+import os
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from game.ai import AIPlayer
+from game.bitboard import BitBoard
+from game.engine import GameEngine
+
+
+def _random_caro_board(rng, stones):
+    board = GameEngine.create_board('caro')
+    cells = rng.sample([(r, c) for r in range(15) for c in range(20)], stones)
+    for i, (r, c) in enumerate(cells):
+        board[r][c] = 1 + i % 2
+    return board
+
+
+def _reference_role_score(board, player):
+    """Score every row, column and diagonal with the cell-by-cell scorer."""
+    rows, cols = len(board), len(board[0])
+    lines = [list(row) for row in board]
+    lines += [[board[r][c] for r in range(rows)] for c in range(cols)]
+    for start in range(-rows + 1, cols):
+        lines.append([board[r][r + start] for r in range(rows) if 0 <= r + start < cols])
+        lines.append([board[r][start + rows - 1 - r] for r in range(rows)
+                      if 0 <= start + rows - 1 - r < cols])
+    return sum(AIPlayer._evaluate_line(line, player) for line in lines)
+
+
+class TestBitBoard(unittest.TestCase):
+    def test_grid_round_trip(self):
+        rng = random.Random(1)
+        board = _random_caro_board(rng, 60)
+        bb = BitBoard.from_grid(board)
+        self.assertEqual(bb.to_grid(), board)
+        self.assertEqual(bb.stones, 60)
+
+    def test_rows_do_not_wrap(self):
+        bb = GameEngine.create_bitboard('caro')
+        # Three stones at the end of row 0 and two at the start of row 1
+        for c in (17, 18, 19):
+            bb.place(0, c, 1)
+        for c in (0, 1):
+            bb.place(1, c, 1)
+        self.assertFalse(bb.has_run(1, 5))
+        self.assertFalse(bb.is_win_at(0, 19, 1))
+        self.assertEqual(GameEngine.check_winner(bb, 'caro', {'r': 1, 'c': 0}), (0, None))
+
+    def test_check_winner_matches_grid(self):
+        board = GameEngine.create_board('caro')
+        for k in range(5):
+            board[2 + k][10 - k] = 2
+        bb = BitBoard.from_grid(board)
+        winner, line = GameEngine.check_winner(bb, 'caro', {'r': 4, 'c': 8})
+        grid_winner, grid_line = GameEngine.check_winner(board, 'caro', {'r': 4, 'c': 8})
+        self.assertEqual(winner, 2)
+        self.assertEqual(winner, grid_winner)
+        self.assertEqual(sorted(line), sorted(grid_line))
+
+    def test_neighbor_mask(self):
+        bb = GameEngine.create_bitboard('caro')
+        bb.place(0, 19, 1)
+        moves = set(bb.cells(bb.neighbor_mask(2)))
+        expected = {(r, c) for r in range(0, 3) for c in range(17, 20)} - {(0, 19)}
+        self.assertEqual(moves, expected)
+
+    def test_evaluation_matches_line_scorer(self):
+        rng = random.Random(7)
+        for stones in (0, 5, 25, 80, 150):
+            board = _random_caro_board(rng, stones)
+            bb = BitBoard.from_grid(board)
+            for player in (1, 2):
+                self.assertEqual(
+                    AIPlayer._evaluate_role(bb, player),
+                    _reference_role_score(board, player)
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import threading
+import time
+import sys
+import os
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from mysql.connector import Error
+from database.db import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    """Stands in for a MySQL connection: records pings, rollbacks and closes."""
+
+    def __init__(self):
+        self.alive = True
+        self.in_transaction = False
+        self.pings = 0
+        self.rollbacks = 0
+        self.closed = False
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        self.pings += 1
+        if not self.alive:
+            raise Error(msg='server has gone away')
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectionPool(unittest.TestCase):
+    def _pool(self, size=2, **kwargs):
+        self.opened = []
+
+        def connect():
+            conn = FakeConnection()
+            self.opened.append(conn)
+            return conn
+        return ConnectionPool(size, connect=connect, **kwargs)
+
+    def test_connections_are_reused(self):
+        pool = self._pool()
+        conn = pool.acquire()
+        pool.release(conn)
+        self.assertIs(pool.acquire(), conn)
+        self.assertEqual(len(self.opened), 1)
+        self.assertEqual(conn.pings, 1)  # health check on reuse only
+        stats = pool.snapshot()
+        self.assertEqual((stats['open'], stats['in_use'], stats['checkouts']), (1, 1, 2))
+
+    def test_dead_connection_is_replaced(self):
+        pool = self._pool()
+        conn = pool.acquire()
+        pool.release(conn)
+        conn.alive = False
+        fresh = pool.acquire()
+        self.assertIsNot(fresh, conn)
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.snapshot()['open'], 1)
+
+    def test_open_transaction_is_rolled_back_on_release(self):
+        pool = self._pool()
+        conn = pool.acquire()
+        conn.in_transaction = True
+        pool.release(conn)
+        self.assertEqual(conn.rollbacks, 1)
+
+    def test_idle_connections_expire(self):
+        pool = self._pool(idle_timeout=0.0)
+        conn = pool.acquire()
+        pool.release(conn)
+        time.sleep(0.01)
+        self.assertIsNot(pool.acquire(), conn)
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.snapshot()['discarded'], 1)
+
+    def test_exhausted_pool_waits_then_times_out(self):
+        pool = self._pool(size=1, checkout_timeout=1.0)
+        conn = pool.acquire()
+        threading.Timer(0.05, pool.release, (conn,)).start()
+        self.assertIs(pool.acquire(), conn)  # handed over after the wait
+        stats = pool.snapshot()
+        self.assertEqual(stats['waits'], 1)
+        self.assertGreater(stats['wait_ms_max'], 0)
+
+        pool.checkout_timeout = 0.01
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+        self.assertEqual(pool.snapshot()['timeouts'], 1)
+        self.assertEqual(len(self.opened), 1)
+
+    def test_failed_connect_frees_the_slot(self):
+        def connect():
+            raise Error(msg='refused')
+        pool = ConnectionPool(1, connect=connect, checkout_timeout=0.01)
+        for _ in range(2):
+            with self.assertRaises(Error):
+                pool.acquire()
+        self.assertEqual(pool.snapshot()['open'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
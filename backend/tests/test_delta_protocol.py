@@ -0,0 +1,69 @@
+import unittest
+import sys
+import os
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app import create_app
+from unittest.mock import patch
+
+
+def _updates(client):
+    return [e['args'][0] for e in client.get_received() if e['name'] == 'game_update']
+
+
+class TestDeltaProtocol(unittest.TestCase):
+    def setUp(self):
+        self.app, self.socketio = create_app()
+        self.delta_client = self.socketio.test_client(self.app)
+        self.full_client = self.socketio.test_client(self.app)
+        self.delta_client.emit('join_matchmaking', {'userId': 1, 'type': 'caro', 'mode': 'ranked',
+                                                    'protocol': 'delta'})
+        self.full_client.emit('join_matchmaking', {'userId': 2, 'type': 'caro', 'mode': 'ranked'})
+        match = next(e for e in self.delta_client.get_received() if e['name'] == 'match_found')['args'][0]
+        self.assertEqual(match['protocol'], 'delta')
+        self.assertEqual(match['seq'], 0)
+        self.room_id = match['roomId']
+        self.full_client.get_received()
+
+    def test_each_client_gets_its_protocol(self):
+        self.delta_client.emit('make_move', {'roomId': self.room_id, 'r': 7, 'c': 7, 'player': 1})
+        delta = _updates(self.delta_client)[-1]
+        full = _updates(self.full_client)[-1]
+        self.assertNotIn('board', delta)
+        self.assertEqual(delta['cells'], [[7, 7, 1]])
+        self.assertEqual(delta['seq'], 1)
+        self.assertEqual(delta['currentPlayer'], 2)
+        self.assertEqual(full['board'][7][7], 1)
+        self.assertEqual(full['seq'], 1)
+
+        # Undo clears the cell
+        self.full_client.emit('resolve_undo', {'roomId': self.room_id, 'accept': True})
+        delta = _updates(self.delta_client)[-1]
+        self.assertEqual(delta['cells'], [[7, 7, 0]])
+        self.assertEqual(delta['seq'], 2)
+
+    def test_resync_snapshot(self):
+        self.delta_client.emit('make_move', {'roomId': self.room_id, 'r': 3, 'c': 4, 'player': 1})
+        self.delta_client.get_received()
+        self.full_client.get_received()
+        self.delta_client.emit('request_sync', {'roomId': self.room_id})
+        snapshot = _updates(self.delta_client)[-1]
+        self.assertEqual(snapshot['board'][3][4], 1)
+        self.assertEqual(snapshot['seq'], 1)
+        self.assertEqual(snapshot['lastMove'], {'r': 3, 'c': 4})
+        self.assertEqual(_updates(self.full_client), [])  # only the requester
+
+    def test_periodic_snapshot(self):
+        with patch.dict('sockets.game.SOCKET_CONFIG', {'snapshot_interval': 2}):
+            self.delta_client.emit('make_move', {'roomId': self.room_id, 'r': 0, 'c': 0, 'player': 1})
+            self.full_client.emit('make_move', {'roomId': self.room_id, 'r': 0, 'c': 1, 'player': 2})
+        first, second = _updates(self.delta_client)
+        self.assertNotIn('board', first)
+        self.assertEqual(second['board'][0][:2], [1, 2])
+        self.assertEqual(second['seq'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
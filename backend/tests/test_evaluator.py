@@ -0,0 +1,65 @@
+import unittest
+import random
+import sys
+import os
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from game.ai import AIPlayer
+from game.bitboard import BitBoard
+from game.engine import GameEngine
+from game.bitboard import count_windows
+from game.search_board import SearchBoard
+
+
+class TestIncrementalEvaluator(unittest.TestCase):
+    def test_scores_follow_moves(self):
+        rng = random.Random(3)
+        grid = GameEngine.create_board('caro')
+        bb = SearchBoard.from_grid(grid, AIPlayer.LINE_SCORER)
+        played = []
+        cells = [(r, c) for r in range(15) for c in range(20)]
+        rng.shuffle(cells)
+
+        for step, (r, c) in enumerate(cells[:120]):
+            bb.place(r, c, 1 + step % 2)
+            played.append((r, c))
+            if step % 3 == 2:
+                # Take a random stone back to exercise removal
+                br, bc = played.pop(rng.randrange(len(played)))
+                bb.remove(br, bc)
+            reference = BitBoard.from_grid(bb.to_grid())
+            self.assertEqual(bb.evaluator.role_score(1), AIPlayer._evaluate_role(reference, 1))
+            self.assertEqual(bb.evaluator.role_score(2), AIPlayer._evaluate_role(reference, 2))
+            self.assertEqual(AIPlayer._evaluate_board(bb), AIPlayer._evaluate_board(reference))
+
+
+class TestPatternTable(unittest.TestCase):
+    def test_window_lookup(self):
+        scores = AIPlayer.SCORES
+        self.assertEqual(AIPlayer._evaluate_window([0, 2, 2, 2, 0], 0, 0, 2), scores['OPEN_3'])
+        self.assertEqual(AIPlayer._evaluate_window([2, 2, 2, 2, 0], None, 0, 2), scores['BLOCKED_4'])
+        self.assertEqual(AIPlayer._evaluate_window([1, 1, 1, 1, 1], 2, 2, 1), scores['WIN'])
+        self.assertEqual(AIPlayer._evaluate_window([1, 2, 0, 0, 0], 0, 0, 1), 0)
+        self.assertEqual(AIPlayer._evaluate_window([0, 0, 1, 0, 0], 0, None, 1), 0)
+
+    def test_line_scores_match_window_counts(self):
+        rng = random.Random(8)
+        scorer = AIPlayer.LINE_SCORER
+        for _ in range(500):
+            length = rng.randrange(5, 21)
+            cells = [rng.choice((0, 0, 1, 2)) for _ in range(length)]
+            p1 = sum(1 << i for i, cell in enumerate(cells) if cell == 1)
+            p2 = sum(1 << i for i, cell in enumerate(cells) if cell == 2)
+            full = (1 << length) - 1
+            expected = (
+                scorer.score_counts(count_windows(p1, p2, full, (1,))),
+                scorer.score_counts(count_windows(p2, p1, full, (1,))),
+            )
+            self.assertEqual(scorer.score(p1, p2, length), expected)
+            self.assertEqual(expected[0], AIPlayer._evaluate_line(cells, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import random
+import sys
+import os
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from game.ai import AIPlayer
+from game.engine import GameEngine
+from game.search_board import SearchBoard
+from game.search_context import SearchContext
+
+
+class TestCandidateFrontier(unittest.TestCase):
+    def test_candidates_follow_moves(self):
+        rng = random.Random(11)
+        bb = SearchBoard.from_grid(GameEngine.create_board('caro'), AIPlayer.LINE_SCORER)
+        played = []
+        for step in range(80):
+            if played and step % 4 == 3:
+                # Removal out of play order must still uncount correctly
+                r, c = played.pop(rng.randrange(len(played)))
+                bb.remove(r, c)
+            else:
+                r, c = rng.randrange(15), rng.randrange(20)
+                if bb.get(r, c):
+                    continue
+                bb.place(r, c, 1 + step % 2)
+                played.append((r, c))
+            for radius in (1, 2, 3):
+                self.assertEqual(bb.candidates(radius), bb.cell_list(bb.neighbor_mask(radius)))
+
+    def test_refcount(self):
+        bb = SearchBoard.from_grid(GameEngine.create_board('caro'), AIPlayer.LINE_SCORER)
+        bb.place(7, 9, 1)
+        bb.place(7, 11, 2)
+        middle = bb.index(7, 10)
+        self.assertEqual(bb.frontier.count(1, middle), 2)
+        bb.remove(7, 9)
+        self.assertEqual(bb.frontier.count(1, middle), 1)
+        self.assertEqual(bb.frontier.count(1, bb.index(7, 8)), 0)
+
+    def test_board_kept_between_turns(self):
+        context = SearchContext()
+        grid = GameEngine.create_board('caro')
+        grid[7][9] = 1
+        AIPlayer.get_ai_move(grid, 'caro', 'medium', context)
+        kept = context.board
+        self.assertIsNotNone(kept)
+
+        grid[7][10] = 2
+        grid[8][9] = 1
+        AIPlayer.get_ai_move(grid, 'caro', 'medium', context)
+        self.assertIs(context.board, kept)
+        fresh = SearchBoard.from_grid(grid, AIPlayer.LINE_SCORER)
+        self.assertEqual(kept.to_grid(), grid)
+        self.assertEqual(kept.key, fresh.key)
+        self.assertEqual(kept.evaluator.score(), fresh.evaluator.score())
+        self.assertEqual(kept.candidates(2), fresh.candidates(2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+import os
+import sys
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from game.engine import GameEngine
+from game.game_state import GameState
+
+
+class TestGameState(unittest.TestCase):
+    def test_history_round_trip(self):
+        game = GameState('gomoku', 'ranked', (1, 2), ('sid1', 'sid2'))
+        moves = [(0, 0, 1), (18, 18, 2), (9, 17, 1)]
+        for r, c, player in moves:
+            GameEngine.apply_move(game.board, r, c, player)
+            game.record_move(r, c, player)
+        self.assertEqual(game.history_json(), [{'r': r, 'c': c, 'player': p} for r, c, p in moves])
+        self.assertEqual(game.last_move(), {'r': 9, 'c': 17, 'player': 1})
+        self.assertEqual(game.pop_move(), (9, 17, 1))
+        self.assertEqual(len(game.history), 2)
+
+    def test_grid_and_players(self):
+        game = GameState('caro', 'practice', (7, 'AI'), ('sid', 'ai'), difficulty='hard')
+        GameEngine.apply_move(game.board, 3, 4, 1)
+        grid = game.grid()
+        self.assertEqual((len(grid), len(grid[0])), (15, 20))
+        self.assertEqual(grid[3][4], 1)
+        self.assertEqual(sum(map(sum, grid)), 1)
+        self.assertEqual(game.players[1], 7)
+        self.assertEqual(game.player_of('ai'), 2)
+        self.assertIsNone(game.player_of('other'))
+        self.assertIsNone(game.pop_move())
+
+    def test_slots(self):
+        game = GameState('tic-tac-toe', 'ranked', (1, 2), ('a', 'b'))
+        with self.assertRaises(AttributeError):
+            game.extra = 1
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import random
+import sys
+import os
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from config import AI_CONFIG
+from game.ai import AIPlayer
+from game.bitboard import BitBoard
+from game.search_board import SearchBoard
+from game.numpy_evaluator import get_numpy_evaluator, np
+
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class TestNumpyEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.saved = AI_CONFIG['evaluator']
+        AI_CONFIG['evaluator'] = 'numpy'
+
+    def tearDown(self):
+        AI_CONFIG['evaluator'] = self.saved
+
+    def random_grid(self, seed):
+        rng = random.Random(seed)
+        return [[rng.choice((0, 0, 0, 0, 1, 2)) for _ in range(20)] for _ in range(15)]
+
+    def test_matches_python_scores(self):
+        for seed in range(10):
+            bb = BitBoard.from_grid(self.random_grid(seed))
+            evaluator = get_numpy_evaluator(bb.geometry, AIPlayer.LINE_SCORER)
+            self.assertEqual(
+                evaluator.role_scores(bb),
+                (AIPlayer._evaluate_role(bb, 1), AIPlayer._evaluate_role(bb, 2))
+            )
+
+    def test_batch_matches_place_and_score(self):
+        grid = self.random_grid(42)
+        for board in (BitBoard.from_grid(grid), SearchBoard.from_grid(grid, AIPlayer.LINE_SCORER)):
+            evaluator = get_numpy_evaluator(board.geometry, AIPlayer.LINE_SCORER)
+            moves = board.cell_list(board.neighbor_mask(1))[:20]
+            for player in (1, 2):
+                expected = []
+                for r, c in moves:
+                    reference = BitBoard.from_grid(grid)
+                    reference.place(r, c, player)
+                    expected.append(AIPlayer._evaluate_role(reference, 2)
+                                    - AIPlayer._evaluate_role(reference, 1) * 2.0)
+                self.assertEqual(evaluator.score_moves(board, moves, player), expected)
+
+    def test_disabled_by_config(self):
+        AI_CONFIG['evaluator'] = 'python'
+        bb = BitBoard(15, 20)
+        self.assertIsNone(get_numpy_evaluator(bb.geometry, AIPlayer.LINE_SCORER))
+
+
+if __name__ == '__main__':
+    unittest.main()
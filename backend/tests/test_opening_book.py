@@ -0,0 +1,70 @@
+import unittest
+import itertools
+import math
+import os
+import sys
+import tempfile
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from game.ai import AIPlayer
+from game.engine import GameEngine
+from game.opening_book import OpeningBook
+from game.ttt_table import TTTTable, solve_ttt
+
+
+class TestOpeningBook(unittest.TestCase):
+    def test_lookup_up_to_symmetry(self):
+        book = OpeningBook(15, 20, max_stones=3)
+        board = GameEngine.create_board('caro')
+        board[5][8] = 1
+        self.assertTrue(book.add(board, (4, 9)))
+
+        # The same position turned by half a turn
+        turned = GameEngine.create_board('caro')
+        turned[14 - 5][19 - 8] = 1
+        self.assertEqual(book.lookup(turned), (14 - 4, 19 - 9))
+        self.assertEqual(book.lookup(board), (4, 9))
+
+        board[4][9] = 2
+        board[8][8] = 1
+        board[8][9] = 2
+        self.assertIsNone(book.lookup(board))  # more stones than the book holds
+
+    def test_save_and_load(self):
+        book = OpeningBook(15, 20, max_stones=3)
+        board = GameEngine.create_board('caro')
+        board[7][9] = 1
+        book.add(board, (7, 10))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'book.json')
+            book.save(path)
+            loaded = OpeningBook.load(path)
+        self.assertEqual(loaded.lookup(board), (7, 10))
+
+
+class TestTTTTable(unittest.TestCase):
+    def test_table_matches_minimax(self):
+        table = TTTTable(solve_ttt())
+        for cells in itertools.islice(itertools.product((0, 1, 2), repeat=9), 0, None, 61):
+            board = [list(cells[0:3]), list(cells[3:6]), list(cells[6:9])]
+            if AIPlayer._check_winner_simple(board):
+                self.assertIsNone(table.best_move(board))
+                continue
+            best_score, best_move = -math.inf, None
+            for r, c in [(r, c) for r in range(3) for c in range(3) if board[r][c] == 0]:
+                board[r][c] = 2
+                score = AIPlayer._minimax_ttt(board, 0, False, -math.inf, math.inf)
+                board[r][c] = 0
+                if score > best_score:
+                    best_score, best_move = score, (r, c)
+            self.assertEqual(table.best_move(board), best_move)
+
+    def test_rejects_truncated_table(self):
+        with self.assertRaises(ValueError):
+            TTTTable(b'\x00' * 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
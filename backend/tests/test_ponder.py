@@ -0,0 +1,113 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from game.ai import AIPlayer
+from app import create_app
+from game.ai_executor import InlineAIExecutor, ProcessPoolAIExecutor, set_ai_executor
+from game.engine import GameEngine
+from game.ponder import Ponderer
+from game.search_context import SearchContext
+from game.search_stats import AI_STATS
+from sockets.state import games
+
+
+def _position():
+    board = GameEngine.create_board('caro')
+    for r, c in ((7, 8), (7, 9), (8, 10)):
+        board[r][c] = 1
+    for r, c in ((6, 9), (8, 9)):
+        board[r][c] = 2
+    return board
+
+
+class TestPonder(unittest.TestCase):
+    def test_predicts_the_urgent_reply_first(self):
+        board = GameEngine.create_board('caro')
+        for c in (5, 6, 7):
+            board[7][c] = 1
+        board[6][6] = 2
+        self.assertIn(Ponderer.predict_replies(board, 3)[0], [(7, 4), (7, 8)])
+
+    def test_pondered_answer_is_reused(self):
+        board = _position()
+        ponderer = Ponderer(SearchContext(), replies=2)
+        ponderer.run(InlineAIExecutor(), 'room', board, 'caro', 'medium')
+        self.assertEqual(board, _position())  # the game's board is untouched
+        self.assertEqual(len(ponderer.results), 2)
+
+        r, c = Ponderer.predict_replies(board, 1)[0]
+        board[r][c] = 1
+        move = ponderer.take(board)
+        self.assertIsNotNone(move)
+        self.assertEqual(board[move[0]][move[1]], 0)
+        self.assertEqual(ponderer.hits, 1)
+        self.assertEqual(ponderer.results, {})
+
+    def test_unexpected_reply_misses(self):
+        board = _position()
+        ponderer = Ponderer(SearchContext(), replies=1)
+        ponderer.run(InlineAIExecutor(), 'room', board, 'caro', 'medium')
+        board[0][0] = 1
+        self.assertIsNone(ponderer.take(board))
+        self.assertEqual(ponderer.misses, 1)
+
+    def test_stop_cancels_the_executor_job(self):
+        # With the process executor only the worker can stop the search
+        executor = MagicMock(pending=0)
+        executor.compute.return_value = (0, 0)
+        ponderer = Ponderer(None, replies=1)
+        ponderer.run(executor, 'room', _position(), 'caro', 'medium')
+        ponderer.take(_position())
+        executor.cancel.assert_called_with('room', ponder=True)
+
+    def test_ponders_while_at_most_max_pending_jobs_wait(self):
+        for pending, searched in ((1, True), (2, False)):
+            executor = MagicMock(pending=pending)
+            executor.compute.return_value = (0, 0)
+            Ponderer(None, replies=1, max_pending=1).run(executor, 'room', _position(), 'caro', 'medium')
+            self.assertEqual(executor.compute.called, searched, pending)
+
+    def test_ponder_jobs_are_not_recorded(self):
+        AI_STATS.reset()
+        InlineAIExecutor().compute('room', _position(), 'caro', 'medium', ponder=True)
+        self.assertNotIn('caro', AI_STATS.snapshot())
+
+    def test_fork_shares_the_table_and_stops_alone(self):
+        context = SearchContext()
+        forked = context.fork()
+        self.assertIs(forked.tt, context.tt)
+        forked.stop()
+        self.assertFalse(context.stopped)
+        # A stopped search still answers with a legal move
+        move = AIPlayer.get_ai_move(_position(), 'caro', 'hard', forked)
+        self.assertEqual(_position()[move[0]][move[1]], 0)
+
+
+class TestPracticeRoom(unittest.TestCase):
+    def _room(self, executor):
+        previous = set_ai_executor(executor)
+        try:
+            app, socketio = create_app()
+            client = socketio.test_client(app)
+            client.emit('join_matchmaking', {'userId': 1, 'type': 'caro', 'mode': 'practice',
+                                             'difficulty': 'hard'})
+            match = next(e for e in client.get_received() if e['name'] == 'match_found')['args'][0]
+            return games.pop(match['roomId'])
+        finally:
+            set_ai_executor(previous)
+
+    def test_in_process_room_has_a_context(self):
+        self.assertIsInstance(self._room(InlineAIExecutor()).ai_context, SearchContext)
+
+    def test_process_pool_room_has_none(self):
+        # Workers keep their own contexts: a parent-side table would go unused
+        self.assertIsNone(self._room(ProcessPoolAIExecutor()).ai_context)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+import sys
+import os
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from unittest.mock import patch
+from services.match_service import MatchService
+from services.level_tables import LevelTables
+from services.rank_service import RankService
+
+
+class FakeCursor:
+    """Answers the settlement's SELECT from a users table and records every statement."""
+
+    def __init__(self, users):
+        self.users = users
+        self.statements = []
+        self._result = None
+
+    def execute(self, query, params=()):
+        self.statements.append((query, list(params)))
+        if 'FOR UPDATE' in query:
+            self._result = [(uid,) + self.users[uid] for uid in sorted(params) if uid in self.users]
+
+    def executemany(self, query, rows):
+        self.statements.append((query, list(rows)))
+
+    def fetchall(self):
+        return self._result
+
+    def fetchone(self):
+        return self._result
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.committed = False
+        self.rolled_back = False
+
+    def cursor(self, dictionary=False):
+        return self._cursor
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+
+class TestSettlement(unittest.TestCase):
+    def _settle(self, users, updates, match_row):
+        self.cursor = FakeCursor(users)
+        self.conn = FakeConnection(self.cursor)
+        with patch('services.rank_service.DatabaseConnection') as connection, \
+                patch('services.rank_service.LEVEL_TABLES') as tables:
+            connection.get_connection.return_value = self.conn
+            tables.level_for_xp.side_effect = lambda xp, refresh=True: 1 + xp // 100
+            ok = RankService.settle_match(updates, match_row)
+            connection.close_connection.assert_called_once_with(self.conn)
+        return ok
+
+    def test_ranked_game_in_one_transaction(self):
+        # user id -> (xp, level, rank_points)
+        users = {7: (90, 1, 495), 3: (10, 1, 5)}
+        row = MatchService.match_row(7, 3, 7, 'caro', 'ranked', 'win', [{'r': 0, 'c': 0, 'player': 1}])
+        self.assertTrue(self._settle(users, [(7, 25, 50), (3, -10, 15)], row))
+        self.assertTrue(self.conn.committed)
+
+        queries = [query for query, _ in self.cursor.statements]
+        self.assertEqual(len(queries), 4)
+        self.assertFalse(any('game_levels' in query for query in queries))
+        self.assertIn('FOR UPDATE', queries[0])
+        self.assertEqual(self.cursor.statements[0][1], [3, 7])  # lock order
+
+        update_params = self.cursor.statements[1][1]
+        # xp, level, rank_points, rank_id cases (user 3 first), then the ids
+        self.assertEqual(update_params, [3, 25, 7, 140,
+                                         3, 1, 7, 2,
+                                         3, 0, 7, 520,
+                                         3, 1, 7, 2,
+                                         3, 7])
+        self.assertEqual(self.cursor.statements[2][1], [(7, 2, 140)])  # only user 7 levelled up
+        self.assertEqual(self.cursor.statements[3], (MatchService.INSERT_MATCH, list(row)))
+
+    def test_missing_user_rolls_back(self):
+        self.assertFalse(self._settle({7: (0, 1, 0)}, [(7, 25, 50), (3, -10, 15)], None))
+        self.assertTrue(self.conn.rolled_back)
+        self.assertFalse(self.conn.committed)
+        self.assertEqual(len(self.cursor.statements), 1)
+
+    def test_unloadable_level_table_writes_nothing(self):
+        # Cold table and the reference query fails: no default level 1
+        tables = LevelTables(ttl=3600)
+        with patch('services.rank_service.LEVEL_TABLES', tables), \
+                patch('services.level_tables.DatabaseQuery') as query, \
+                patch('services.rank_service.DatabaseConnection') as connection:
+            query.execute_query.return_value = None
+            self.assertFalse(RankService.settle_match([(7, 25, 50)], None))
+            connection.get_connection.assert_not_called()
+
+
+class TestLevelTables(unittest.TestCase):
+    def setUp(self):
+        self.tables = LevelTables(ttl=3600)
+        # Levels need 0, 100, 100, 250 XP (level 3 shares level 2's threshold)
+        self.tables.load(
+            [{'level': 1, 'required_score': 0}, {'level': 2, 'required_score': 100},
+             {'level': 3, 'required_score': 100}, {'level': 4, 'required_score': 250}],
+            [{'name': 'A', 'color': '#1', 'description': 'a', 'min_level': 1, 'max_level': 2},
+             {'name': 'B', 'color': '#2', 'description': 'b', 'min_level': 3, 'max_level': 4}]
+        )
+
+    def test_level_lookup_matches_the_query(self):
+        # MAX(level) WHERE required_score <= xp, 1 when nothing qualifies
+        for xp, level in [(-5, 1), (0, 1), (99, 1), (100, 3), (249, 3), (250, 4), (10 ** 6, 4)]:
+            self.assertEqual(self.tables.level_for_xp(xp), level, xp)
+
+    def test_tier_enrichment(self):
+        row = self.tables.add_tier({'id': 1, 'level': 3}, description=True)
+        self.assertEqual((row['tier_name'], row['tier_color'], row['tier_description']), ('B', '#2', 'b'))
+        row = self.tables.add_tier({'id': 2, 'level': 9})
+        self.assertIsNone(row['tier_name'])
+        self.assertIsNone(self.tables.add_tier(None))
+
+    def test_invalidate_reloads(self):
+        with patch('services.level_tables.DatabaseQuery') as query:
+            query.execute_query.side_effect = [
+                [{'level': 1, 'required_score': 0}, {'level': 2, 'required_score': 10}],
+                [],
+            ]
+            self.assertEqual(self.tables.level_for_xp(150), 3)  # still the loaded copy
+            self.tables.invalidate()
+            self.assertEqual(self.tables.level_for_xp(150), 2)
+            self.assertEqual(query.execute_query.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+import random
+import sqlite3
+import sys
+import os
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from unittest.mock import MagicMock, patch
+import services.ranking_index as ranking_index
+from services.leaderboard_service import LeaderboardService
+from services.ranking_index import RankingIndex
+
+
+class TestRankingIndex(unittest.TestCase):
+    def test_ranks_share_ties_like_the_sql(self):
+        index = RankingIndex(ttl=3600)
+        index.build([(1, 100), (2, 300), (3, 100), (4, 0)])
+        self.assertEqual(index.top(10), [2, 1, 3, 4])
+        self.assertEqual([index.rank_of(u) for u in (2, 1, 3, 4)], [1, 2, 2, 4])
+        self.assertIsNone(index.rank_of(99))
+        self.assertEqual(index.window(1, 2), [1, 3])
+
+    def test_updates_match_a_sorted_list(self):
+        # Small buckets, so splits and emptied buckets are exercised
+        with patch.object(ranking_index, 'LOAD', 4):
+            rng = random.Random(5)
+            index = RankingIndex(ttl=3600)
+            points = {user: rng.randint(0, 40) for user in range(30)}
+            index.build(points.items())
+            for _ in range(500):
+                user = rng.randint(0, 60)
+                if rng.random() < 0.75:
+                    points[user] = rng.randint(0, 50)
+                    index.update(user, points[user])
+                else:
+                    points.pop(user, None)
+                    index.remove(user)
+                order = [u for _, u in sorted((-p, u) for u, p in points.items())]
+                offset = rng.randint(0, len(order))
+                self.assertEqual(index.window(offset, 7), order[offset:offset + 7])
+                if user in points:
+                    self.assertEqual(index.rank_of(user),
+                                     1 + sum(1 for p in points.values() if p > points[user]))
+
+    def test_commits_during_a_rebuild_are_replayed(self):
+        index = RankingIndex(ttl=0)
+        index.build([(1, 10), (2, 20)])
+
+        def select(query, params=None, fetch_all=False):
+            # Settlements commit while the SELECT runs, after its snapshot
+            index.update(1, 50)
+            index.update(3, 5)  # a user created meanwhile
+            return [{'id': 1, 'rank_points': 10}, {'id': 2, 'rank_points': 20}]
+        with patch('services.ranking_index.DatabaseQuery') as query:
+            query.execute_query.side_effect = select
+            self.assertIs(index.ready(), index)
+        self.assertEqual(index.top(3), [1, 2, 3])
+        self.assertEqual(index.rank_of(1), 1)
+
+    def test_updates_before_the_first_build_are_ignored(self):
+        index = RankingIndex(ttl=3600)
+        index.update(1, 10)
+        self.assertEqual(len(index), 0)
+
+    def test_leaderboard_reads_only_the_shown_rows(self):
+        index = RankingIndex(ttl=3600)
+        index.build([(1, 10), (2, 30), (3, 20)])
+        rows = {1: {'id': 1, 'rank_points': 10, 'level': 1},
+                2: {'id': 2, 'rank_points': 30, 'level': 1},
+                3: {'id': 3, 'rank_points': 20, 'level': 1}}
+        with patch('services.leaderboard_service.RANKING_INDEX', index), \
+                patch('services.leaderboard_service.DatabaseQuery') as query:
+            query.execute_query.side_effect = lambda q, ids, **kw: [dict(rows[i]) for i in ids]
+            top = LeaderboardService.get_leaderboard(2)
+            self.assertEqual([row['id'] for row in top], [2, 3])
+            self.assertEqual(query.execute_query.call_args[0][1], (2, 3))
+            self.assertEqual(LeaderboardService.get_user_rank(1), 3)
+            nearby = LeaderboardService.get_nearby_players(3, 1)
+            self.assertEqual([row['id'] for row in nearby], [2, 3, 1])
+
+
+class TestNearbyKeyset(unittest.TestCase):
+    """The SQL fallback of get_nearby_players, run against SQLite."""
+
+    def setUp(self):
+        self.db = sqlite3.connect(':memory:')
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, display_name TEXT, "
+                        "rank_points INT, level INT)")
+        self.db.execute("CREATE INDEX idx_rank_points_id ON users (rank_points DESC, id)")
+        rng = random.Random(11)
+        self.db.executemany("INSERT INTO users VALUES (?, ?, ?, 1)",
+                            [(i, 'u%d' % i, rng.randint(0, 15)) for i in range(1, 61)])
+
+    def execute_query(self, query, params=(), fetch_one=False, fetch_all=False):
+        rows = [dict(row) for row in self.db.execute(query.replace('%s', '?'), params)]
+        return rows[0] if fetch_one and rows else (rows if fetch_all else None)
+
+    def offset_window(self, user_id, range_size):
+        """The former COUNT + LIMIT/OFFSET result (ties by id)."""
+        points = self.db.execute("SELECT rank_points FROM users WHERE id = ?", (user_id,)).fetchone()[0]
+        rank = self.db.execute("SELECT COUNT(*) + 1 FROM users WHERE rank_points > ?", (points,)).fetchone()[0]
+        rows = self.db.execute("SELECT id FROM users ORDER BY rank_points DESC, id LIMIT ? OFFSET ?",
+                               (range_size * 2 + 1, max(0, rank - range_size - 1)))
+        return [row[0] for row in rows]
+
+    def test_matches_the_offset_query(self):
+        no_index = MagicMock()
+        no_index.ready.return_value = None
+        with patch('services.leaderboard_service.RANKING_INDEX', no_index), \
+                patch('services.leaderboard_service.DatabaseQuery') as query:
+            query.execute_query.side_effect = self.execute_query
+            for user_id in range(1, 61):
+                for range_size in (0, 2, 5):
+                    nearby = LeaderboardService.get_nearby_players(user_id, range_size)
+                    self.assertEqual([row['id'] for row in nearby],
+                                     self.offset_window(user_id, range_size), (user_id, range_size))
+            self.assertEqual(LeaderboardService.get_nearby_players(999), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
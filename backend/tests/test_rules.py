@@ -0,0 +1,123 @@
+import unittest
+import os
+import sys
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from config import GAME_CONFIG
+from game.ai import AIPlayer
+from game.bitboard import BitBoard
+from game.engine import GameEngine
+from game.evaluator import build_window_table, encode_window
+from game.rules import GameRules, get_rules, game_family
+
+
+def _row_of_five(board, row, start, player=1):
+    for c in range(start, start + 5):
+        board[row][c] = player
+    return {'r': row, 'c': start + 2}
+
+
+class TestGameRules(unittest.TestCase):
+    def test_every_configured_variant_has_rules(self):
+        for game_type, config in GAME_CONFIG.items():
+            rules = get_rules(game_type)
+            self.assertEqual((rules.rows, rules.cols), (config['rows'], config['cols']))
+            self.assertIn(game_family(game_type), ('tic-tac-toe', 'caro'))
+        self.assertIsNone(get_rules('chess'))
+
+    def test_caro_family_needs_five(self):
+        with self.assertRaises(ValueError):
+            GameRules('caro-6', {'rows': 15, 'cols': 15, 'win_length': 6, 'family': 'caro'})
+
+    def test_blocked_five_does_not_win(self):
+        board = GameEngine.create_board('caro-blocked')
+        last_move = _row_of_five(board, 7, 5)
+        board[7][4] = board[7][10] = 2
+        self.assertEqual(GameEngine.check_winner(board, 'caro-blocked', last_move), (0, None))
+        # The same position wins in plain Caro
+        self.assertEqual(GameEngine.check_winner(board, 'caro', last_move)[0], 1)
+        # One open end is enough
+        board[7][10] = 0
+        self.assertEqual(GameEngine.check_winner(board, 'caro-blocked', last_move)[0], 1)
+
+    def test_board_edge_does_not_block(self):
+        board = GameEngine.create_board('caro-blocked')
+        last_move = _row_of_five(board, 0, 0)
+        board[0][5] = 2
+        winner, line = GameEngine.check_winner(board, 'caro-blocked', last_move)
+        self.assertEqual(winner, 1)
+        self.assertEqual(sorted(line), [(0, c) for c in range(5)])
+
+    def test_bitboard_matches_grid(self):
+        for game_type in ('caro', 'caro-blocked', 'gomoku'):
+            board = GameEngine.create_board(game_type)
+            last_move = _row_of_five(board, 3, 2)
+            board[3][1] = board[3][7] = 2
+            bb = BitBoard.from_grid(board, get_rules(game_type))
+            self.assertEqual(GameEngine.check_winner(bb, game_type, last_move)[0],
+                             GameEngine.check_winner(board, game_type, last_move)[0])
+            self.assertEqual(bb.wins_at(3, 4, 1), game_type != 'caro-blocked')
+
+    def test_gomoku_board(self):
+        board = GameEngine.create_board('gomoku')
+        self.assertEqual((len(board), len(board[0])), (19, 19))
+        board[18][18] = 1
+        board[17][17] = 1
+        board[16][16] = 1
+        board[15][15] = 1
+        board[14][14] = 1
+        winner, line = GameEngine.check_winner(board, 'gomoku', {'r': 18, 'c': 18})
+        self.assertEqual(winner, 1)
+        self.assertEqual(len(line), 5)
+
+    def test_rays_reach_the_edges(self):
+        rules = get_rules('caro')
+        horizontal, vertical, diagonal, anti_diagonal = rules.rays[0]  # cell (0, 0)
+        self.assertEqual(horizontal, (tuple((0, c) for c in range(1, 20)), ()))
+        self.assertEqual(vertical, (tuple((r, 0) for r in range(1, 15)), ()))
+        self.assertEqual(len(diagonal[0]), 14)
+        self.assertEqual(anti_diagonal, ((), ()))
+
+    def test_move_count_draw(self):
+        board = [[1, 2, 1], [1, 2, 2], [2, 1, 1]]
+        last_move = {'r': 2, 'c': 2}
+        self.assertEqual(GameEngine.check_winner(board, 'tic-tac-toe', last_move), ('draw', None))
+        self.assertEqual(GameEngine.check_winner(board, 'tic-tac-toe', last_move, 9), ('draw', None))
+        board[0][0] = 0
+        self.assertEqual(GameEngine.check_winner(board, 'tic-tac-toe', last_move, 8), (0, None))
+
+    def test_blocked_window_table(self):
+        _, ai_table = build_window_table(AIPlayer.SCORES, blocked_ends=True)
+        _, plain_table = build_window_table(AIPlayer.SCORES)
+        code = encode_window(1, (2, 2, 2, 2, 2), 1)
+        self.assertEqual(ai_table[code], 0)
+        self.assertEqual(plain_table[code], AIPlayer.SCORES['WIN'])
+        code = encode_window(0, (2, 2, 2, 2, 2), 1)
+        self.assertEqual(ai_table[code], AIPlayer.SCORES['WIN'])
+
+
+class TestVariantAI(unittest.TestCase):
+    def test_ai_plays_legal_moves_on_every_variant(self):
+        for game_type in ('caro-blocked', 'gomoku'):
+            for difficulty in ('easy', 'medium', 'hard'):
+                board = GameEngine.create_board(game_type)
+                board[9][9] = 1
+                board[9][10] = 2
+                board[10][9] = 1
+                move = AIPlayer.get_ai_move(board, game_type, difficulty)
+                self.assertIsNotNone(move)
+                self.assertTrue(GameEngine.is_valid_move(board, move[0], move[1]), (game_type, difficulty))
+
+    def test_ai_completes_an_open_four_on_gomoku(self):
+        board = GameEngine.create_board('gomoku')
+        for c in range(14, 18):
+            board[18][c] = 2
+        board[0][0] = board[0][1] = board[5][5] = board[9][9] = 1
+        move = AIPlayer.get_ai_move(board, 'gomoku', 'hard')
+        self.assertIn(move, [(18, 13), (18, 18)])
+
+
+if __name__ == '__main__':
+    unittest.main()
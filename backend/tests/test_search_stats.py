@@ -0,0 +1,83 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app import create_app
+from game.ai import AIPlayer
+from game.ai_executor import InlineAIExecutor
+from game.engine import GameEngine
+from game.search_stats import AI_STATS, SearchStats, SearchStatsRegistry
+from game.ttt_cache import TTTCache
+
+
+def _caro_board():
+    board = GameEngine.create_board('caro')
+    for r, c, player in [(7, 9, 1), (7, 10, 2), (8, 9, 1), (6, 8, 2), (9, 9, 1)]:
+        board[r][c] = player
+    return board
+
+
+class TestSearchStats(unittest.TestCase):
+    def setUp(self):
+        AI_STATS.reset()
+
+    def test_move_stats(self):
+        move, stats = AIPlayer.get_ai_move_with_stats(_caro_board(), 'caro', 'hard')
+        self.assertIsNotNone(move)
+        self.assertGreater(stats.nodes, 0)
+        self.assertGreater(stats.evaluations, 0)
+        self.assertGreaterEqual(stats.depth, 2)
+        self.assertGreater(stats.elapsed_ms, 0)
+
+    def test_tictactoe_move_stats(self):
+        board = GameEngine.create_board('tic-tac-toe')
+        board[0][0] = 1
+        # Minimax with a cold cache: nodes, cutoffs and terminal checks
+        with patch('game.ai.get_ttt_table', return_value=None), \
+                patch.object(AIPlayer, 'TTT_CACHE', TTTCache()):
+            move, stats = AIPlayer.get_ai_move_with_stats(board, 'tic-tac-toe', 'hard')
+            self.assertEqual(board[move[0]][move[1]], 0)
+            self.assertGreater(stats.nodes, 100)
+            self.assertGreater(stats.cutoffs, 0)
+            self.assertGreater(stats.evaluations, 0)
+            self.assertEqual(stats.depth, 8)
+            # Searching again reuses the cache
+            _, again = AIPlayer.get_ai_move_with_stats(board, 'tic-tac-toe', 'hard')
+            self.assertGreater(again.tt_hits, 0)
+        # The perfect-play table answers in one lookup
+        _, stats = AIPlayer.get_ai_move_with_stats(board, 'tic-tac-toe', 'hard')
+        self.assertEqual((stats.nodes, stats.tt_hits), (1, 1))
+
+    def test_registry_aggregates_per_difficulty(self):
+        registry = SearchStatsRegistry(slow_move_ms=50)
+        seen = []
+        registry.add_hook(lambda stats, board: seen.append(stats.difficulty))
+        for nodes, elapsed in ((10, 20.0), (30, 80.0)):
+            stats = SearchStats('caro', 'hard')
+            stats.nodes = nodes
+            stats.depth = 2
+            stats.elapsed_ms = elapsed
+            registry.record(stats, _caro_board())
+
+        hard = registry.snapshot()['caro']['hard']
+        self.assertEqual(hard['moves'], 2)
+        self.assertEqual(hard['nodes'], 40)
+        self.assertEqual(hard['elapsed_ms_max'], 80.0)
+        self.assertEqual(hard['depth_avg'], 2)
+        self.assertEqual(len(registry.snapshot()['slow_moves']), 1)
+        self.assertEqual(seen, ['hard', 'hard'])
+
+    def test_executor_records_and_route_reports(self):
+        InlineAIExecutor().compute('room', _caro_board(), 'caro', 'medium')
+        app, _ = create_app()
+        response = app.test_client().get('/api/ai/stats')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['caro']['medium']['moves'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
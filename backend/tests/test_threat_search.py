@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from game.bitboard import BitBoard
+from game.engine import GameEngine
+from game.threat_search import ThreatSearch
+
+
+def make_board(ai_stones, human_stones):
+    grid = GameEngine.create_board('caro')
+    for r, c in ai_stones:
+        grid[r][c] = 2
+    for r, c in human_stones:
+        grid[r][c] = 1
+    return BitBoard.from_grid(grid)
+
+
+class TestThreatSearch(unittest.TestCase):
+    def setUp(self):
+        # (7, 8) makes two blocked fours at once: a one-move VCF
+        self.double_four = make_board(
+            [(7, 5), (7, 6), (7, 7), (4, 8), (5, 8), (6, 8)],
+            [(7, 4), (3, 8), (10, 10), (10, 11)]
+        )
+        # Two open twos sharing (7, 9): only reachable through threes
+        self.double_three = make_board(
+            [(7, 7), (7, 8), (8, 9), (9, 9)],
+            [(6, 6), (10, 5), (3, 14), (12, 2)]
+        )
+
+    def test_vcf(self):
+        threats = ThreatSearch()
+        self.assertEqual(threats.find_win(self.double_four, 2), (7, 8))
+
+    def test_vct_needs_threes(self):
+        self.assertIsNone(ThreatSearch(vct_depth=0).find_win(self.double_three, 2))
+        move = ThreatSearch(time_budget_ms=5000).find_win(self.double_three, 2)
+        self.assertIsNotNone(move)
+
+    def test_defences(self):
+        before = self.double_four.to_grid()
+        defences = ThreatSearch().find_defences(self.double_four, 1)
+        self.assertIn((7, 8), defences)
+        self.assertNotIn((10, 12), defences)
+        self.assertEqual(self.double_four.to_grid(), before)
+
+    def test_no_threat(self):
+        board = make_board([(7, 7)], [(7, 8)])
+        self.assertIsNone(ThreatSearch().find_defences(board, 2))
+
+    def test_node_limit(self):
+        self.assertIsNone(ThreatSearch(node_limit=1).find_win(self.double_three, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
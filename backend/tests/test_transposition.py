@@ -0,0 +1,86 @@
+import unittest
+import math
+import random
+import sys
+import os
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from game.ai import AIPlayer
+from game.bitboard import BitBoard
+from game.engine import GameEngine
+from game.search_context import SearchContext
+from game.transposition import TranspositionTable, EXACT, LOWER
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_zobrist_key_is_order_independent(self):
+        a = GameEngine.create_bitboard('caro')
+        b = GameEngine.create_bitboard('caro')
+        moves = [(7, 7, 1), (7, 8, 2), (8, 8, 1), (6, 6, 2)]
+        for r, c, p in moves:
+            a.place(r, c, p)
+        for r, c, p in reversed(moves):
+            b.place(r, c, p)
+        self.assertEqual(a.key, b.key)
+        self.assertEqual(a.key, BitBoard.from_grid(a.to_grid()).key)
+        for r, c, _ in moves:
+            a.remove(r, c)
+        self.assertEqual(a.key, 0)
+
+    def test_replacement_prefers_depth_within_a_search(self):
+        tt = TranspositionTable(size=4)
+        tt.new_search()
+        tt.store(1, 3, EXACT, 10, (0, 0))
+        tt.store(5, 1, LOWER, 20, (1, 1))  # same slot, shallower: ignored
+        self.assertEqual(tt.probe(1), (3, EXACT, 10, (0, 0)))
+        self.assertIsNone(tt.probe(5))
+
+        tt.new_search()
+        tt.store(5, 1, LOWER, 20, (1, 1))  # stale deep entry is replaced
+        self.assertEqual(tt.probe(5), (1, LOWER, 20, (1, 1)))
+        self.assertIsNone(tt.probe(1))
+
+    def test_win_scores_keep_their_distance_across_depths(self):
+        # The bot (to move) completes five at (7, 4): a win one ply away
+        bb = GameEngine.create_bitboard('caro')
+        for c in range(4):
+            bb.place(7, c, 2)
+        for c in range(4):
+            bb.place(9, c + 6, 1)
+        win = AIPlayer.SCORES['WIN']
+        context = SearchContext(tt_size=1 << 10)
+        context.tt.new_search()
+        self.assertEqual(AIPlayer._minimax_caro(bb, 3, True, -math.inf, math.inf, (9, 9), context), win + 2)
+        # Same position, less depth left: answered from the table, one ply
+        # away still (a raw stored score would say win + 2)
+        self.assertEqual(AIPlayer._minimax_caro(bb, 2, True, -math.inf, math.inf, (9, 9), context), win + 1)
+        fresh = AIPlayer._minimax_caro(bb, 2, True, -math.inf, math.inf, (9, 9), SearchContext(tt_size=1 << 10))
+        self.assertEqual(fresh, win + 1)
+
+    def test_tt_score_round_trip(self):
+        win = AIPlayer.SCORES['WIN']
+        for score in (win + 5, -win - 2, 1234, -100000, 0):
+            self.assertEqual(AIPlayer._from_tt_score(AIPlayer._to_tt_score(score, 6), 6), score)
+        # A loss three plies below a node with 6 plies left, probed with 4 left
+        self.assertEqual(AIPlayer._from_tt_score(AIPlayer._to_tt_score(-win - 3, 6), 4), -win - 1)
+
+    def test_context_gives_legal_moves_across_turns(self):
+        rng = random.Random(11)
+        random.seed(11)
+        board = GameEngine.create_board('caro')
+        board[7][10] = 1
+        context = SearchContext()
+        for _ in range(6):
+            move = AIPlayer.get_ai_move(board, 'caro', 'hard', context)
+            self.assertEqual(board[move[0]][move[1]], 0)
+            board[move[0]][move[1]] = 2
+            empty = [(r, c) for r in range(15) for c in range(20) if board[r][c] == 0]
+            r, c = rng.choice(empty)
+            board[r][c] = 1
+        self.assertGreater(context.tt.stores, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
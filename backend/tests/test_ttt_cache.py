@@ -0,0 +1,70 @@
+import unittest
+import math
+import os
+import sys
+
+# Add backend directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from game.ai import AIPlayer
+from game.ttt_cache import TTTCache
+
+
+def _board(cells):
+    return [list(cells[0:3]), list(cells[3:6]), list(cells[6:9])]
+
+
+class TestTTTCache(unittest.TestCase):
+    def test_symmetric_positions_share_an_entry(self):
+        corner = _board([1, 0, 0, 0, 2, 0, 0, 0, 0])
+        other_corner = _board([0, 0, 0, 0, 2, 0, 0, 0, 1])
+        self.assertEqual(TTTCache.key(corner, False), TTTCache.key(other_corner, False))
+        self.assertNotEqual(TTTCache.key(corner, False), TTTCache.key(corner, True))
+
+    def test_lru_eviction(self):
+        cache = TTTCache(capacity=2)
+        keys = [TTTCache.key(_board([0] * i + [1] + [0] * (8 - i)), False) for i in (0, 1, 4)]
+        cache.store(keys[0], 0, -math.inf, math.inf, 0)
+        cache.store(keys[1], 0, -math.inf, math.inf, 0)
+        cache.probe(keys[0], 0, -math.inf, math.inf)  # keys[0] is now most recent
+        cache.store(keys[2], 0, -math.inf, math.inf, 0)
+        self.assertEqual(len(cache), 2)
+        self.assertIn(keys[0], cache.entries)
+        self.assertNotIn(keys[1], cache.entries)
+
+    def test_bounds_only_answer_when_they_cut(self):
+        cache = TTTCache()
+        key = TTTCache.key(_board([1, 0, 0, 0, 2, 0, 0, 0, 0]), False)
+        # Failed high at beta=3: the value is at least 5
+        cache.store(key, 0, -math.inf, 3, 5)
+        self.assertEqual(cache.probe(key, 0, -math.inf, 4)[0], 5)
+        score, alpha, beta = cache.probe(key, 0, -math.inf, 8)
+        self.assertIsNone(score)
+        self.assertEqual((alpha, beta), (5, 8))
+
+    def test_scores_are_stored_relative_to_the_position(self):
+        cache = TTTCache()
+        key = TTTCache.key(_board([1, 0, 0, 0, 2, 0, 0, 0, 0]), True)
+        cache.store(key, 2, -math.inf, math.inf, 10 - 5)  # win 3 plies below depth 2
+        self.assertEqual(cache.probe(key, 4, -math.inf, math.inf)[0], 10 - 7)
+
+    def test_cached_search_matches_plain_minimax(self):
+        # A small cache forces evictions during the search
+        cache = TTTCache(capacity=64)
+        for first in range(9):
+            for second in range(9):
+                if first == second:
+                    continue
+                cells = [0] * 9
+                cells[first] = 1
+                cells[second] = 2
+                for is_maximizing in (True, False):
+                    board = _board(cells)
+                    expected = AIPlayer._minimax_ttt(board, 0, is_maximizing, -math.inf, math.inf)
+                    cached = AIPlayer._minimax_ttt(board, 0, is_maximizing, -math.inf, math.inf, cache)
+                    self.assertEqual(cached, expected, (cells, is_maximizing))
+        self.assertLessEqual(len(cache), 64)
+
+
+if __name__ == '__main__':
+    unittest.main()
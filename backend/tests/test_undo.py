@@ -8,6 +8,11 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from app import create_app
 from flask_socketio import SocketIOTestClient
+from unittest.mock import MagicMock
+from game.ai_executor import set_ai_executor
+from game.game_state import GameState
+from sockets.game import _run_ai_move
+from sockets.state import games
 
 class TestUndoFeature(unittest.TestCase):
     def setUp(self):
@@ -68,5 +73,53 @@ class TestUndoFeature(unittest.TestCase):
         self.assertEqual(undo_update_event['args'][0]['currentPlayer'], 1, "Turn should revert to Player 1")
         print("Undo successful! Board reverted and turn restored.")
 
+
+class _Socket:
+    """socketio stand-in: records emits; `during_sleep` runs while the bot waits."""
+
+    def __init__(self, during_sleep=None):
+        self.during_sleep = during_sleep
+        self.emitted = []
+
+    def sleep(self, seconds):
+        if self.during_sleep:
+            self.during_sleep()
+
+    def emit(self, *args, **kwargs):
+        self.emitted.append(args)
+
+    def start_background_task(self, *args):
+        pass
+
+
+class TestStaleBotMove(unittest.TestCase):
+    def setUp(self):
+        self.game = GameState('caro', 'practice', (1, 'AI'), ('sid', 'ai'), difficulty='medium')
+        self.game.turn = 2
+        games['stale-room'] = self.game
+        executor = MagicMock()
+        executor.compute.return_value = (0, 0)
+        self.previous = set_ai_executor(executor)
+
+    def tearDown(self):
+        set_ai_executor(self.previous)
+        games.pop('stale-room', None)
+
+    def test_move_for_the_current_position_is_played(self):
+        socket = _Socket()
+        _run_ai_move(socket, 'stale-room', self.game)
+        self.assertEqual(self.game.grid()[0][0], 2)
+        self.assertEqual(self.game.turn, 1)
+
+    def test_move_for_an_older_position_is_dropped(self):
+        def undo_and_move_again():
+            # Undo + a new human move: the bot's turn again, but another position
+            self.game.seq += 2
+        socket = _Socket(undo_and_move_again)
+        _run_ai_move(socket, 'stale-room', self.game)
+        self.assertEqual(self.game.grid()[0][0], 0)
+        self.assertEqual(socket.emitted, [])
+
+
 if __name__ == '__main__':
     unittest.main()